@@ -0,0 +1,381 @@
+"""
+In-memory columnar engine for the list endpoints.
+
+With ``COLUMNAR_ENABLED`` the list queries of tables with at most
+``COLUMNAR_MAX_ROWS`` rows are answered from a snapshot of the table held as
+NumPy arrays, instead of a count and a page query per request. Every column
+is dictionary-encoded: a row holds an integer code into the column's list of
+distinct values. Then
+
+- a contains-search compares each distinct value once and selects the rows
+  with ``matches[codes]``, so filters on several columns are OR-ed masks;
+- a sort ranks the distinct values once and orders the rows with
+  ``lexsort`` over the ranks, ``id`` breaking ties. The permutation is kept
+  per sort key combination until the next write;
+- a page is a slice of the sorted, filtered positions.
+
+Writes through ``CRUDBase`` are applied to the snapshot in place (see
+``app.db.generations``); a change made elsewhere (another worker, a bulk
+load) reloads it on the next request. Larger tables, unknown columns,
+replicas behind the snapshot and a missing NumPy fall back to SQL.
+
+Strings compare by code point, which matches SQLite and PostgreSQL databases
+with the "C" collation. Under any other database collation, sorts by a
+string column are left to SQL; filters and other sorts are still served.
+NULLs sort first ascending on SQLite and last on PostgreSQL, as in SQL.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, func, select, text
+from sqlalchemy.orm import Session
+
+from app.api.sorting import SortKeys, sort_plans
+from app.api.stats import get_numpy
+from app.core.config import settings
+from app.db.generations import Row, generations
+from app.db.models import People, Planets
+
+logger = logging.getLogger(__name__)
+
+MAX_PERMUTATIONS = 64
+# Collations that order strings by code point, like Python
+CODE_POINT_COLLATIONS = {"BINARY", "C", "POSIX", "C.UTF-8", "C.utf8"}
+
+
+def database_collation(db: Session) -> str:
+    """The collation strings are sorted by unless a column declares its own."""
+    if db.get_bind().dialect.name == "postgresql":
+        return db.execute(
+            text(
+                "SELECT datcollate FROM pg_database "
+                "WHERE datname = current_database()"
+            )
+        ).scalar()
+    return "BINARY"
+
+
+def like_pattern(value: str) -> "re.Pattern":
+    """The regular expression ``ILIKE '%value%'`` matches with."""
+    pattern = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in value
+    )
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
+class ColumnarTable:
+    """Dictionary-encoded snapshot of one table."""
+
+    def __init__(
+        self,
+        model: Any,
+        rows: List[Any],
+        generation: int,
+        nulls_first: bool,
+        collation: str = "BINARY",
+    ):
+        np = get_numpy()
+        self.model = model
+        self.generation = generation
+        self.nulls_first = nulls_first
+        self.collation = collation
+        self.code_point_order = collation in CODE_POINT_COLLATIONS
+        self.columns = [column.key for column in model.__table__.columns]
+        self.ids = np.array([row.id for row in rows], dtype=np.int64)
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.positions = {int(id_): position for position, id_ in enumerate(self.ids)}
+        self.dictionaries: Dict[str, List[Any]] = {}
+        self.codes: Dict[str, Any] = {}
+        self._lookup: Dict[str, Dict[Any, int]] = {}
+        self._ranks: Dict[str, Any] = {}
+        self._lowered: Dict[str, Any] = {}
+        self._permutations: Dict[tuple, Any] = {}
+        for name in self.columns:
+            if name == "id":
+                continue
+            lookup: Dict[Any, int] = {}
+            self.codes[name] = np.fromiter(
+                (
+                    (
+                        -1
+                        if row[name] is None
+                        else lookup.setdefault(row[name], len(lookup))
+                    )
+                    for row in (row._mapping for row in rows)
+                ),
+                dtype=np.int64,
+                count=len(rows),
+            )
+            self._lookup[name] = lookup
+            self.dictionaries[name] = list(lookup)
+        self.lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return int(self.alive.sum())
+
+    def page(
+        self,
+        skip: int,
+        limit: int,
+        keys: Tuple[Tuple[str, bool], ...],
+        filters: Dict[str, str],
+    ) -> Tuple[List[Any], int]:
+        """Rows ``skip`` to ``skip + limit`` of the filtered, sorted table."""
+        with self.lock:
+            order = self._permutation(keys)
+            mask = self.alive
+            if filters:
+                mask = mask & self._filter_mask(filters)
+            selected = order[mask[order]]
+            rows = [self._row(position) for position in selected[skip : skip + limit]]
+        return [self.model(**row) for row in rows], int(selected.size)
+
+    def apply(self, old: Row, new: Row) -> bool:
+        """Apply a local write; False if the snapshot should be reloaded instead."""
+        np = get_numpy()
+        with self.lock:
+            if new is None:
+                position = self.positions.pop(old["id"], None)
+                if position is None:
+                    return False
+                self.alive[position] = False
+            else:
+                position = self.positions.get(new["id"])
+                if position is None:
+                    position = self.ids.size
+                    self.positions[new["id"]] = position
+                    self.ids = np.append(self.ids, new["id"])
+                    self.alive = np.append(self.alive, True)
+                    for name in self.codes:
+                        self.codes[name] = np.append(self.codes[name], -1)
+                for name in self.codes:
+                    self.codes[name][position] = self._encode(name, new.get(name))
+            self._permutations.clear()
+            # Compact by reloading once most rows are deleted
+            return self.size * 2 >= self.alive.size
+
+    def _encode(self, name: str, value: Any) -> int:
+        if value is None:
+            return -1
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            self.dictionaries[name].append(value)
+            self._ranks.pop(name, None)
+            self._lowered.pop(name, None)
+        return code
+
+    def _rank(self, name: str):
+        """Sort rank of every row's value, NULLs first or last."""
+        np = get_numpy()
+        if name == "id":
+            return self.ids
+        ranks = self._ranks.get(name)
+        if ranks is None:
+            dictionary = self.dictionaries[name]
+            values = np.empty(len(dictionary), dtype=object)
+            values[:] = dictionary
+            order = np.argsort(values, kind="stable")
+            # The extra last entry is the rank of NULL (code -1)
+            ranks = np.empty(len(dictionary) + 1, dtype=np.int64)
+            ranks[order] = np.arange(len(dictionary))
+            ranks[-1] = -1 if self.nulls_first else len(dictionary)
+            self._ranks[name] = ranks
+        return ranks[self.codes[name]]
+
+    def _permutation(self, keys: Tuple[Tuple[str, bool], ...]):
+        permutation = self._permutations.get(keys)
+        if permutation is None:
+            np = get_numpy()
+            sort_keys = [self.ids]
+            for name, descending in reversed(keys):
+                rank = self._rank(name)
+                sort_keys.append(-rank if descending else rank)
+            permutation = np.lexsort(sort_keys) if keys else np.argsort(self.ids)
+            if len(self._permutations) >= MAX_PERMUTATIONS:
+                self._permutations.clear()
+            self._permutations[keys] = permutation
+        return permutation
+
+    def _filter_mask(self, filters: Dict[str, str]):
+        np = get_numpy()
+        mask = np.zeros(self.alive.size, dtype=bool)
+        for name, value in filters.items():
+            dictionary = self.dictionaries[name]
+            if "%" in value or "_" in value:
+                pattern = like_pattern(value)
+                matches = np.fromiter(
+                    (bool(pattern.search(entry)) for entry in dictionary),
+                    dtype=bool,
+                    count=len(dictionary),
+                )
+            else:
+                lowered = self._lowered.get(name)
+                if lowered is None:
+                    lowered = self._lowered[name] = np.char.lower(
+                        np.array(dictionary, dtype=str)
+                    )
+                matches = np.char.find(lowered, value.lower()) >= 0
+            # NULL (code -1) never matches
+            mask |= np.append(matches, False)[self.codes[name]]
+        return mask
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        row = {"id": int(self.ids[position])}
+        for name, codes in self.codes.items():
+            code = codes[position]
+            row[name] = None if code < 0 else self.dictionaries[name][code]
+        return row
+
+
+class ColumnarEngine:
+    """Columnar snapshots keyed by model class, following local writes."""
+
+    def __init__(self, models=(People, Planets)):
+        self.models = models
+        self.tables: Dict[Any, ColumnarTable] = {}
+        # Generation at which a table was found too large to load
+        self._oversized: Dict[Any, int] = {}
+        self.served = 0
+        self.fallbacks = 0
+        self.loads = 0
+        self._lock = threading.Lock()
+        generations.subscribe(self.apply)
+
+    def enabled(self) -> bool:
+        return settings.COLUMNAR_ENABLED and get_numpy() is not None
+
+    def query(
+        self,
+        db: Session,
+        model: Any,
+        skip: int,
+        limit: int,
+        sort: SortKeys = (),
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[List[Any], int]]:
+        """The page and total from the snapshot, or None to use SQL."""
+        if not self.enabled() or model not in self.models:
+            return None
+        keys = self._keys(model, sort)
+        filters = {
+            field: value for field, value in (search_params or {}).items() if value
+        }
+        string_columns = {
+            column.key
+            for column in model.__table__.columns
+            if isinstance(column.type, String)
+        }
+        if keys is None or any(field not in string_columns for field in filters):
+            self.fallbacks += 1
+            return None
+
+        table = self._snapshot(db, model)
+        if table is None or (
+            not table.code_point_order
+            and any(name in string_columns for name, _ in keys)
+        ):
+            # Only the database knows its collation's string order
+            self.fallbacks += 1
+            return None
+        self.served += 1
+        return table.page(skip, limit, keys, filters)
+
+    def apply(self, table_name: str, old: Row, new: Row, generation: int) -> None:
+        """Apply a local write to its snapshot (a ``generations`` listener)."""
+        for model, table in list(self.tables.items()):
+            if model.__tablename__ != table_name:
+                continue
+            if generation != table.generation + 1 or not table.apply(old, new):
+                # Missed a change made elsewhere: reload on the next request
+                self.tables.pop(model, None)
+            elif table.size > settings.COLUMNAR_MAX_ROWS:
+                self.tables.pop(model, None)
+            else:
+                table.generation = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self.tables.clear()
+            self._oversized.clear()
+            self.served = self.fallbacks = self.loads = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled(),
+            "max_rows": settings.COLUMNAR_MAX_ROWS,
+            "served": self.served,
+            "fallbacks": self.fallbacks,
+            "loads": self.loads,
+            "tables": {
+                model.__tablename__: {
+                    "rows": table.size,
+                    "generation": table.generation,
+                    "collation": table.collation,
+                    "sort_permutations": len(table._permutations),
+                }
+                for model, table in list(self.tables.items())
+            },
+        }
+
+    def _keys(
+        self, model: Any, sort: SortKeys
+    ) -> Optional[Tuple[Tuple[str, bool], ...]]:
+        """Column names and descending flags, or None for unknown fields."""
+        columns = sort_plans.get(model).columns
+        keys = []
+        for field, order in sort:
+            column = columns.get(field)
+            if column is None:
+                return None
+            keys.append((column.key, order.value == "desc"))
+        return tuple(keys)
+
+    def _snapshot(self, db: Session, model: Any) -> Optional[ColumnarTable]:
+        generation = generations.current(db, model.__tablename__)
+        table = self.tables.get(model)
+        if table is not None:
+            if table.generation == generation:
+                return table
+            if generation < table.generation:
+                # A replica that has not caught up with the snapshot
+                return None
+        if self._oversized.get(model) == generation:
+            return None
+
+        with self._lock:
+            table = self.tables.get(model)
+            if table is not None and table.generation == generation:
+                return table
+            rows = db.execute(
+                select(func.count()).select_from(model.__table__)
+            ).scalar()
+            if rows > settings.COLUMNAR_MAX_ROWS:
+                self._oversized[model] = generation
+                self.tables.pop(model, None)
+                return None
+            table = ColumnarTable(
+                model,
+                db.execute(select(model.__table__)).all(),
+                generation,
+                nulls_first=db.get_bind().dialect.name != "postgresql",
+                collation=database_collation(db),
+            )
+            # Only keep a snapshot no write could have slipped into
+            if generations.current(db, model.__tablename__) == generation:
+                self.tables[model] = table
+                self.loads += 1
+                logger.info(
+                    f"Loaded columnar snapshot of {model.__tablename__}: "
+                    f"{table.size} rows at generation {generation}"
+                )
+        return table
+
+
+columnar_engine = ColumnarEngine()
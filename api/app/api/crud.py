@@ -9,9 +9,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, func, desc, asc, or_
 
 from app.db.base import Base
-from app.api.sorting import sort_factory
+from app.api import columnar
+from app.api.sorting import SortKeys, parse_sort, sort_factory
 from app.api.schemas import SortField, SortOrder
 from app.core.monitoring import log_search_operation, log_sort_operation
+from app.core.tracing import span
+from app.db.generations import generations, row_values
 
 logger = logging.getLogger(__name__)
 ModelType = TypeVar("ModelType", bound=Base)
@@ -27,20 +30,24 @@ class CRUDBase:
 
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         """Get a single record by ID."""
-        return db.query(self.model).filter(self.model.id == id).first()
+        with span("db.query"):
+            return db.query(self.model).filter(self.model.id == id).first()
 
     def get_multi(
         self, db: Session, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         """Get multiple records with pagination."""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        with span("db.query"):
+            return db.query(self.model).offset(skip).limit(limit).all()
 
     def get_multi_paginated(
         self, db: Session, skip: int = 0, limit: int = 100
     ) -> Tuple[List[ModelType], int]:
         """Get multiple records with pagination and total count."""
-        items = db.query(self.model).offset(skip).limit(limit).all()
-        total = db.query(func.count(self.model.id)).scalar()
+        with span("db.query"):
+            items = db.query(self.model).offset(skip).limit(limit).all()
+        with span("db.count"):
+            total = db.query(func.count(self.model.id)).scalar()
         return items, total
 
     def get_multi_paginated_with_sort(
@@ -50,21 +57,17 @@ class CRUDBase:
         limit: int = 100,
         sort_by: Optional[SortField] = None,
         sort_order: SortOrder = SortOrder.ASC,
+        sort: Optional[SortKeys] = None,
     ) -> Tuple[List[ModelType], int]:
         """Get multiple records with pagination, sorting and total count using strategy pattern."""
         start_time = time.time()
 
-        query = db.query(self.model)
+        query = self._apply_sort(db.query(self.model), sort_by, sort_order, sort)
 
-        # Apply sorting using the strategy pattern
-        if sort_by:
-            query = sort_factory.apply_sort(query, self.model, sort_by, sort_order)
-        else:
-            # Default sorting by ID
-            query = query.order_by(asc(self.model.id))
-
-        items = query.offset(skip).limit(limit).all()
-        total = db.query(func.count(self.model.id)).scalar()
+        with span("db.query"):
+            items = query.offset(skip).limit(limit).all()
+        with span("db.count"):
+            total = db.query(func.count(self.model.id)).scalar()
 
         # Calculate execution time and log sort operation
         execution_time = (time.time() - start_time) * 1000
@@ -73,21 +76,17 @@ class CRUDBase:
         resource_type = self._get_resource_type()
 
         # Log the sort operation
-        if sort_by:
-            log_sort_operation(
-                resource_type=resource_type,
-                sort_field=sort_by.value if hasattr(sort_by, "value") else str(sort_by),
-                sort_order=(
-                    sort_order.value
-                    if hasattr(sort_order, "value")
-                    else str(sort_order)
-                ),
-                results_count=len(items),
-                total_count=total,
-                page=(skip // limit) + 1,
-                size=limit,
-                execution_time_ms=execution_time,
-            )
+        self._log_sort(
+            resource_type,
+            sort_by,
+            sort_order,
+            sort,
+            results_count=len(items),
+            total_count=total,
+            page=(skip // limit) + 1,
+            size=limit,
+            execution_time_ms=execution_time,
+        )
 
         return items, total
 
@@ -99,37 +98,32 @@ class CRUDBase:
         sort_by: Optional[SortField] = None,
         sort_order: SortOrder = SortOrder.ASC,
         search_params: Optional[dict] = None,
+        sort: Optional[SortKeys] = None,
     ) -> Tuple[List[ModelType], int]:
-        """Get multiple records with pagination, sorting, search and total count."""
-        start_time = time.time()
-
-        query = db.query(self.model)
+        """
+        Get multiple records with pagination, sorting, search and total count.
 
-        # Apply search filters
-        if search_params:
-            search_filters = []
-            for field_name, search_value in search_params.items():
-                if hasattr(self.model, field_name) and search_value:
-                    # Case-insensitive partial match using ILIKE
-                    field = getattr(self.model, field_name)
-                    search_filters.append(field.ilike(f"%{search_value}%"))
-
-            if search_filters:
-                query = query.filter(or_(*search_filters))
+        ``sort`` is a multi-key sort (see ``parse_sort``) and takes precedence
+        over ``sort_by``/``sort_order``.
+        """
+        start_time = time.time()
 
-        # Apply sorting using the strategy pattern
-        if sort_by:
-            query = sort_factory.apply_sort(query, self.model, sort_by, sort_order)
+        # Served in process when the table has a columnar snapshot
+        with span("columnar"):
+            result = columnar.columnar_engine.query(
+                db,
+                self.model,
+                skip,
+                limit,
+                self._sort_keys(sort_by, sort_order, sort),
+                search_params,
+            )
+        if result is not None:
+            items, total = result
         else:
-            # Default sorting by ID
-            query = query.order_by(asc(self.model.id))
-
-        # Get total count for pagination
-        total_query = query
-        total = total_query.count()
-
-        # Apply pagination
-        items = query.offset(skip).limit(limit).all()
+            items, total = self._search_sql(
+                db, skip, limit, sort_by, sort_order, search_params, sort
+            )
 
         # Calculate execution time
         execution_time = (time.time() - start_time) * 1000
@@ -150,34 +144,73 @@ class CRUDBase:
             )
 
         # Log sort operation if sorting was applied
-        if sort_by:
-            log_sort_operation(
-                resource_type=resource_type,
-                sort_field=sort_by.value if hasattr(sort_by, "value") else str(sort_by),
-                sort_order=(
-                    sort_order.value
-                    if hasattr(sort_order, "value")
-                    else str(sort_order)
-                ),
-                results_count=len(items),
-                total_count=total,
-                page=(skip // limit) + 1,
-                size=limit,
-                execution_time_ms=execution_time,
-            )
+        self._log_sort(
+            resource_type,
+            sort_by,
+            sort_order,
+            sort,
+            results_count=len(items),
+            total_count=total,
+            page=(skip // limit) + 1,
+            size=limit,
+            execution_time_ms=execution_time,
+        )
+
+        return items, total
+
+    def _search_sql(
+        self,
+        db: Session,
+        skip: int,
+        limit: int,
+        sort_by: Optional[SortField],
+        sort_order: SortOrder,
+        search_params: Optional[dict],
+        sort: Optional[SortKeys],
+    ) -> Tuple[List[ModelType], int]:
+        """Page and total count of a filtered, sorted list query in SQL."""
+        query = db.query(self.model)
+
+        # Apply search filters
+        if search_params:
+            search_filters = []
+            for field_name, search_value in search_params.items():
+                if hasattr(self.model, field_name) and search_value:
+                    # Case-insensitive partial match using ILIKE
+                    field = getattr(self.model, field_name)
+                    search_filters.append(field.ilike(f"%{search_value}%"))
 
+            if search_filters:
+                query = query.filter(or_(*search_filters))
+
+        # Get total count for pagination, without the ordering
+        with span("db.count"):
+            total = query.count()
+
+        query = self._apply_sort(query, sort_by, sort_order, sort)
+
+        # Apply pagination
+        with span("db.query"):
+            items = query.offset(skip).limit(limit).all()
         return items, total
 
     def create(self, db: Session, obj_in) -> ModelType:
         """Create a new record."""
         db_obj = self.model(**obj_in.model_dump())
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        with span("db.write"):
+            db.add(db_obj)
+            db.flush()
+            generation = generations.bump(db, self.model.__tablename__)
+            db.commit()
+            db.refresh(db_obj)
+        generations.notify(
+            self.model.__tablename__, None, row_values(db_obj), generation
+        )
         return db_obj
 
     def update(self, db: Session, db_obj: ModelType, obj_in) -> ModelType:
         """Update an existing record."""
+        old = row_values(db_obj)
         obj_data = db_obj.__dict__
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -188,18 +221,90 @@ class CRUDBase:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
 
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        with span("db.write"):
+            db.add(db_obj)
+            db.flush()
+            generation = generations.bump(db, self.model.__tablename__)
+            db.commit()
+            db.refresh(db_obj)
+        generations.notify(
+            self.model.__tablename__, old, row_values(db_obj), generation
+        )
         return db_obj
 
     def remove(self, db: Session, id: int) -> ModelType:
         """Delete a record by ID."""
-        obj = db.get(self.model, id)
-        db.delete(obj)
-        db.commit()
+        with span("db.write"):
+            obj = db.get(self.model, id)
+            old = row_values(obj)
+            db.delete(obj)
+            db.flush()
+            generation = generations.bump(db, self.model.__tablename__)
+            db.commit()
+        generations.notify(self.model.__tablename__, old, None, generation)
         return obj
 
+    def parse_sort(self, spec: str) -> SortKeys:
+        """Parse a multi-key sort and check the model can sort by every key."""
+        keys = parse_sort(spec)
+        # Builds (and caches) the clauses, raising ValueError for unknown columns
+        sort_factory.plans.get(self.model).order_by(keys)
+        return keys
+
+    def _sort_keys(
+        self,
+        sort_by: Optional[SortField],
+        sort_order: SortOrder,
+        sort: Optional[SortKeys],
+    ) -> SortKeys:
+        """The effective sort keys; a single unknown field sorts by ID, as in SQL."""
+        if sort:
+            return tuple(sort)
+        if sort_by and sort_by in sort_factory.plans.get(self.model).columns:
+            return ((sort_by, sort_order),)
+        return ()
+
+    def _apply_sort(
+        self,
+        query,
+        sort_by: Optional[SortField],
+        sort_order: SortOrder,
+        sort: Optional[SortKeys],
+    ):
+        """Order the query through the model's sort plan; ID breaks ties."""
+        with span("sort"):
+            if sort:
+                return sort_factory.apply_multi_sort(query, self.model, sort)
+            if sort_by:
+                return sort_factory.apply_sort(query, self.model, sort_by, sort_order)
+            # Default sorting by ID
+            return sort_factory.apply_multi_sort(query, self.model)
+
+    def _log_sort(
+        self,
+        resource_type: str,
+        sort_by: Optional[SortField],
+        sort_order: SortOrder,
+        sort: Optional[SortKeys],
+        **details,
+    ) -> None:
+        """Log the sort operation, if any. Multi-key sorts log the joined fields."""
+        if sort:
+            sort_field = ",".join(field.value for field, _ in sort)
+            sort_order = sort[0][1]
+        elif sort_by:
+            sort_field = sort_by.value if hasattr(sort_by, "value") else str(sort_by)
+        else:
+            return
+        log_sort_operation(
+            resource_type=resource_type,
+            sort_field=sort_field,
+            sort_order=(
+                sort_order.value if hasattr(sort_order, "value") else str(sort_order)
+            ),
+            **details,
+        )
+
     def _get_resource_type(self) -> str:
         """Determine the resource type based on the model."""
         model_name = self.model.__name__.lower()
@@ -3,18 +3,51 @@ Common dependencies for API endpoints.
 """
 
 from typing import Generator
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db import session
 
+# Methods that never write, so they do not open a read-your-writes window
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
 
-def get_db() -> Generator:
+
+def client_key(request: Request) -> str:
+    """Identify the client for read-your-writes: X-Client-ID, else its address."""
+    client_id = request.headers.get("x-client-id")
+    if client_id:
+        return client_id
+    return request.client.host if request.client else "anonymous"
+
+
+def get_db(request: Request) -> Generator:
     """
     Dependency to get database session.
+
+    Sessions are bound to the primary. Writing requests make the client's
+    reads go to the primary as well for the read-your-writes window.
     """
+    writes = request.method not in READ_METHODS
+    if writes:
+        session.replica_router.note_write(client_key(request))
     try:
-        db = SessionLocal()
+        db = session.SessionLocal()
         yield db
     finally:
         db.close()
+        if writes:
+            # Restart the window now that the write has been committed
+            session.replica_router.note_write(client_key(request))
+
+
+def get_read_db(request: Request) -> Generator:
+    """
+    Dependency to get a database session for read-only endpoints.
+
+    Served by a read replica when any are configured and healthy.
+    """
+    db = session.replica_router.read_session(client_key(request))
+    try:
+        yield db
+    finally:
+        session.replica_router.release(db)
@@ -0,0 +1,164 @@
+"""
+Facet counts for the low-cardinality filter columns.
+
+``FacetCounter`` keeps the joint counts of a model's facet columns, i.e. the
+result of ``SELECT gender, eye_color, hair_color, count(*) ... GROUP BY``,
+in memory. Writes through ``CRUDBase`` move one row between combinations, so
+the counter follows them without touching the database. When the table
+generation shows that someone else changed the table (another worker, a bulk
+load), the counter is rebuilt with one grouped query on the next request.
+
+Facets restricted by filters on facet columns are computed from the joint
+counts as well, with the list endpoints' semantics: case-insensitive
+contains-matches, combined with OR. Filters on other columns run the grouped
+query with the same filter instead.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.db.generations import Row, generations
+from app.db.models import People, Planets
+
+FACET_COLUMNS = {
+    People: ("gender", "eye_color", "hair_color"),
+    Planets: ("climate", "terrain"),
+}
+
+
+class FacetCounter:
+    """Joint value counts of one model's facet columns."""
+
+    def __init__(self, model: Any, columns: Tuple[str, ...]):
+        self.model = model
+        self.table = model.__tablename__
+        self.columns = columns
+        self.generation: Optional[int] = None
+        self.rebuilds = 0
+        self._counts: Optional[Counter] = None
+        self._lock = threading.Lock()
+
+    def facets(
+        self, db: Session, filters: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Value counts per facet column, optionally restricted by ``filters``."""
+        filters = {field: value for field, value in (filters or {}).items() if value}
+        generation = generations.current(db, self.table)
+
+        if any(field not in self.columns for field in filters):
+            counts, source = self._grouped(db, filters), "query"
+        else:
+            counts, source = self._counts_at(db, generation), "counters"
+            if filters:
+                counts = Counter(
+                    {
+                        combination: count
+                        for combination, count in counts.items()
+                        if self._matches(combination, filters)
+                    }
+                )
+
+        return {
+            "total": sum(counts.values()),
+            "generation": generation,
+            "source": source,
+            "facets": self._marginals(counts),
+        }
+
+    def apply(self, table: str, old: Row, new: Row, generation: int) -> None:
+        """Move a written row between combinations (a ``generations`` listener)."""
+        if table != self.table:
+            return
+        with self._lock:
+            if self._counts is None or generation != (self.generation or 0) + 1:
+                # Missed a change made elsewhere: rebuild on the next request
+                self._counts = None
+                return
+            if old is not None:
+                key = self._key(old)
+                self._counts[key] -= 1
+                if self._counts[key] <= 0:
+                    del self._counts[key]
+            if new is not None:
+                self._counts[self._key(new)] += 1
+            self.generation = generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._counts = None
+
+    def _counts_at(self, db: Session, generation: int) -> Counter:
+        with self._lock:
+            if self._counts is not None and self.generation == generation:
+                return Counter(self._counts)
+
+        counts = self._grouped(db)
+        # Only cache counts no write could have slipped into
+        if generations.current(db, self.table) == generation:
+            with self._lock:
+                self._counts, self.generation = Counter(counts), generation
+                self.rebuilds += 1
+        return counts
+
+    def _grouped(
+        self, db: Session, filters: Optional[Dict[str, str]] = None
+    ) -> Counter:
+        columns = [getattr(self.model, name) for name in self.columns]
+        query = db.query(*columns, func.count()).group_by(*columns)
+        if filters:
+            query = query.filter(
+                or_(
+                    *(
+                        getattr(self.model, field).ilike(f"%{value}%")
+                        for field, value in filters.items()
+                        if hasattr(self.model, field)
+                    )
+                )
+            )
+        return Counter({tuple(row[:-1]): row[-1] for row in query.all()})
+
+    def _key(self, row: Dict[str, Any]) -> tuple:
+        return tuple(row.get(name) for name in self.columns)
+
+    def _matches(self, combination: tuple, filters: Dict[str, str]) -> bool:
+        for field, value in filters.items():
+            actual = combination[self.columns.index(field)]
+            if actual is not None and value.lower() in actual.lower():
+                return True
+        return False
+
+    def _marginals(self, counts: Counter) -> Dict[str, List[Dict[str, Any]]]:
+        marginals = {name: Counter() for name in self.columns}
+        for combination, count in counts.items():
+            for name, value in zip(self.columns, combination):
+                marginals[name][value] += count
+        return {
+            name: [
+                {"value": value, "count": count}
+                for value, count in sorted(
+                    values.items(), key=lambda item: (-item[1], item[0] or "")
+                )
+            ]
+            for name, values in marginals.items()
+        }
+
+
+class FacetRegistry:
+    """Facet counters keyed by model class, following local writes."""
+
+    def __init__(self, columns: Dict[Any, Tuple[str, ...]]):
+        self.counters = {
+            model: FacetCounter(model, names) for model, names in columns.items()
+        }
+        for counter in self.counters.values():
+            generations.subscribe(counter.apply)
+
+    def get(self, model: Any) -> FacetCounter:
+        return self.counters[model]
+
+
+facet_registry = FacetRegistry(FACET_COLUMNS)
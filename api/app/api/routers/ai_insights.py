@@ -11,8 +11,11 @@ from sqlalchemy.orm import Session
 from app.api import deps, schemas, crud
 from app.db.models import People as PeopleModel, Planets as PlanetsModel
 from app.core.timezone import now
+from app.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/simulate-ai-insight", tags=["ai-insights"])
+router = APIRouter(
+    prefix="/simulate-ai-insight", tags=["ai-insights"], route_class=TracedRoute
+)
 
 # Create CRUD instances
 people_crud = crud.CRUDBase(PeopleModel)
@@ -94,7 +97,7 @@ def generate_planet_insight(planet_data: dict) -> str:
 
 @router.post("/", response_model=schemas.AIInsightResponse)
 def simulate_ai_insight(
-    request: schemas.AIInsightRequest, db: Session = Depends(deps.get_db)
+    request: schemas.AIInsightRequest, db: Session = Depends(deps.get_read_db)
 ):
     """
     Simulate AI-generated insights for people or planets.
@@ -184,7 +187,7 @@ def simulate_ai_insight(
 def simulate_ai_insight_get(
     name: str = Query(..., description="Name of the person or planet"),
     entity_type: str = Query(..., description="Type of entity: 'people' or 'planets'"),
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
 ):
     """
     Simulate AI-generated insights for people or planets (GET version).
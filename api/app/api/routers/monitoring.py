@@ -2,12 +2,22 @@
 Monitoring router for exposing metrics and monitoring data.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
 from typing import Dict, Any
 
+from app.api import columnar
+from app.api.deps import get_db
+from app.core.config import settings
+from app.core.logging import get_logging_stats
 from app.core.monitoring import monitoring_service
+from app.core.startup import startup_stats
+from app.db import explain, session
+from app.db.index_advisor import IndexAdvisor
+from app.db.instrumentation import n_plus_one_log, slow_query_log
+from app.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+router = APIRouter(prefix="/monitoring", tags=["monitoring"], route_class=TracedRoute)
 
 
 @router.get("/metrics")
@@ -46,6 +56,163 @@ def get_sort_metrics() -> Dict[str, Any]:
         )
 
 
+@router.get("/metrics/requests")
+def get_request_metrics() -> Dict[str, Any]:
+    """Get API request metrics."""
+    try:
+        return monitoring_service.get_request_metrics()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve request metrics: {str(e)}",
+        )
+
+
+@router.get("/metrics/db")
+def get_db_metrics() -> Dict[str, Any]:
+    """Get SQL query metrics, recent slow queries and N+1 patterns."""
+    try:
+        metrics = monitoring_service.get_db_metrics()
+        metrics["recent_slow_queries"] = slow_query_log.recent()
+        metrics["recent_n_plus_one"] = n_plus_one_log.recent()
+        return metrics
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve database metrics: {str(e)}",
+        )
+
+
+@router.get("/slow-plans")
+def get_slow_plans() -> Dict[str, Any]:
+    """Get the execution plans captured for slow statements and searches."""
+    try:
+        plans = explain.plan_capture.recent()
+        return {
+            "plans": plans,
+            "seq_scans": sum(1 for plan in plans if plan["seq_scans"]),
+            "capture": explain.plan_capture.stats(),
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve slow plans: {str(e)}",
+        )
+
+
+def _index_advice(db: Session):
+    advisor = IndexAdvisor(
+        db.get_bind(),
+        min_count=settings.INDEX_ADVISOR_MIN_COUNT,
+        min_latency_ms=settings.INDEX_ADVISOR_MIN_LATENCY_MS,
+    )
+    return advisor, advisor.recommend(monitoring_service.get_column_usage())
+
+
+@router.get("/index-advice")
+def get_index_advice(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Get index recommendations from sort/search usage and latency."""
+    try:
+        _, advice = _index_advice(db)
+        advice["apply_enabled"] = settings.INDEX_ADVISOR_ALLOW_APPLY
+        return advice
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve index advice: {str(e)}",
+        )
+
+
+@router.post("/index-advice/apply")
+def apply_index_advice(
+    name: str = Query(..., description="Name of the recommended index"),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """Create one recommended index."""
+    if not settings.INDEX_ADVISOR_ALLOW_APPLY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Applying index recommendations is disabled",
+        )
+    advisor, advice = _index_advice(db)
+    recommendation = next(
+        (r for r in advice["recommendations"] if r["name"] == name), None
+    )
+    if recommendation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No current recommendation named {name}",
+        )
+    try:
+        advisor.apply(recommendation)
+        return {"applied": recommendation}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to apply index recommendation: {str(e)}",
+        )
+
+
+@router.get("/replicas")
+def get_replicas() -> Dict[str, Any]:
+    """Get read-replica routing counters and the health of each replica."""
+    try:
+        return session.replica_router.status()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve replica status: {str(e)}",
+        )
+
+
+@router.get("/columnar")
+def get_columnar() -> Dict[str, Any]:
+    """Get the columnar engine's snapshots and served/fallback counters."""
+    try:
+        return columnar.columnar_engine.stats()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve columnar engine status: {str(e)}",
+        )
+
+
+@router.get("/startup")
+def get_startup() -> Dict[str, Any]:
+    """Get the startup phase timings and the time to first request."""
+    try:
+        return startup_stats.report()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve startup timings: {str(e)}",
+        )
+
+
+@router.get("/sampling")
+def get_sampling() -> Dict[str, Any]:
+    """Get the effective log sampling rates."""
+    try:
+        return monitoring_service.get_sampling_stats()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve sampling configuration: {str(e)}",
+        )
+
+
+@router.get("/logging")
+def get_logging_pipeline_stats() -> Dict[str, Any]:
+    """Get the queue counters of the background logging sinks."""
+    try:
+        return {"sinks": get_logging_stats()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve logging stats: {str(e)}",
+        )
+
+
 @router.get("/health")
 def get_monitoring_health() -> Dict[str, Any]:
     """Get monitoring service health status."""
@@ -7,9 +7,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.api import deps, schemas, crud
+from app.api.facets import facet_registry
+from app.api.stats import get_numpy, stats_registry
 from app.db.models import People as PeopleModel
+from app.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/people", tags=["people"])
+router = APIRouter(prefix="/people", tags=["people"], route_class=TracedRoute)
 
 # Create CRUD instance
 people_crud = crud.CRUDBase(PeopleModel)
@@ -25,6 +28,11 @@ def read_people(
     sort_order: schemas.SortOrder = Query(
         schemas.SortOrder.ASC, description="Sort order (asc or desc)"
     ),
+    sort: Optional[str] = Query(
+        None,
+        description="Multi-key sort, e.g. 'gender,-mass' ('-' for descending); "
+        "overrides sort_by",
+    ),
     name: Optional[str] = Query(
         None, description="Search by name (case-insensitive partial match)"
     ),
@@ -49,10 +57,14 @@ def read_people(
     gender: Optional[str] = Query(
         None, description="Search by gender (case-insensitive partial match)"
     ),
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
 ):
     """Retrieve people with pagination, sorting, and search."""
     skip = (page - 1) * size
+    try:
+        sort_keys = people_crud.parse_sort(sort) if sort else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     # Build search parameters from query parameters
     search_params = {}
@@ -80,6 +92,7 @@ def read_people(
         sort_by=sort_by,
         sort_order=sort_order,
         search_params=search_params if search_params else None,
+        sort=sort_keys,
     )
 
     pages = (total + size - 1) // size  # Calculate total pages
@@ -97,6 +110,60 @@ def read_people(
     )
 
 
+@router.get("/facets", response_model=schemas.FacetsResponse)
+def read_people_facets(
+    name: Optional[str] = Query(
+        None, description="Search by name (case-insensitive partial match)"
+    ),
+    gender: Optional[str] = Query(
+        None, description="Search by gender (case-insensitive partial match)"
+    ),
+    eye_color: Optional[str] = Query(
+        None, description="Search by eye color (case-insensitive partial match)"
+    ),
+    hair_color: Optional[str] = Query(
+        None, description="Search by hair color (case-insensitive partial match)"
+    ),
+    db: Session = Depends(deps.get_read_db),
+):
+    """Value counts of the filter columns, restricted by the given filters."""
+    try:
+        return facet_registry.get(PeopleModel).facets(
+            db,
+            {
+                "name": name,
+                "gender": gender,
+                "eye_color": eye_color,
+                "hair_color": hair_color,
+            },
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve people facets: {str(e)}",
+        )
+
+
+@router.get("/stats", response_model=schemas.StatsResponse)
+def read_people_stats(
+    bins: int = Query(10, ge=1, le=100, description="Histogram bins"),
+    db: Session = Depends(deps.get_read_db),
+):
+    """Mean, median, percentiles and histogram of height and mass per gender."""
+    if get_numpy() is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Statistics require NumPy, which is not installed",
+        )
+    try:
+        return stats_registry.get(PeopleModel).compute(db, bins)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve people stats: {str(e)}",
+        )
+
+
 @router.post("/", response_model=schemas.People, status_code=status.HTTP_201_CREATED)
 def create_people(people: schemas.PeopleCreate, db: Session = Depends(deps.get_db)):
     """Create new people."""
@@ -104,7 +171,7 @@ def create_people(people: schemas.PeopleCreate, db: Session = Depends(deps.get_d
 
 
 @router.get("/{people_id}", response_model=schemas.People)
-def read_people_by_id(people_id: int, db: Session = Depends(deps.get_db)):
+def read_people_by_id(people_id: int, db: Session = Depends(deps.get_read_db)):
     """Get a specific people by ID."""
     people = people_crud.get(db=db, id=people_id)
     if people is None:
@@ -7,9 +7,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.api import deps, schemas, crud
+from app.api.facets import facet_registry
+from app.api.stats import get_numpy, stats_registry
 from app.db.models import Planets as PlanetsModel
+from app.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/planets", tags=["planets"])
+router = APIRouter(prefix="/planets", tags=["planets"], route_class=TracedRoute)
 
 # Create CRUD instance
 planets_crud = crud.CRUDBase(PlanetsModel)
@@ -25,6 +28,11 @@ def read_planets(
     sort_order: schemas.SortOrder = Query(
         schemas.SortOrder.ASC, description="Sort order (asc or desc)"
     ),
+    sort: Optional[str] = Query(
+        None,
+        description="Multi-key sort, e.g. 'climate,-population' ('-' for descending); "
+        "overrides sort_by",
+    ),
     name: Optional[str] = Query(
         None, description="Search by name (case-insensitive partial match)"
     ),
@@ -52,10 +60,14 @@ def read_planets(
     surface_water: Optional[str] = Query(
         None, description="Search by surface water (case-insensitive partial match)"
     ),
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
 ):
     """Retrieve planets with pagination, sorting, and search."""
     skip = (page - 1) * size
+    try:
+        sort_keys = planets_crud.parse_sort(sort) if sort else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     # Build search parameters from query parameters
     search_params = {}
@@ -85,6 +97,7 @@ def read_planets(
         sort_by=sort_by,
         sort_order=sort_order,
         search_params=search_params if search_params else None,
+        sort=sort_keys,
     )
 
     pages = (total + size - 1) // size  # Calculate total pages
@@ -102,6 +115,51 @@ def read_planets(
     )
 
 
+@router.get("/facets", response_model=schemas.FacetsResponse)
+def read_planets_facets(
+    name: Optional[str] = Query(
+        None, description="Search by name (case-insensitive partial match)"
+    ),
+    climate: Optional[str] = Query(
+        None, description="Search by climate (case-insensitive partial match)"
+    ),
+    terrain: Optional[str] = Query(
+        None, description="Search by terrain (case-insensitive partial match)"
+    ),
+    db: Session = Depends(deps.get_read_db),
+):
+    """Value counts of the filter columns, restricted by the given filters."""
+    try:
+        return facet_registry.get(PlanetsModel).facets(
+            db, {"name": name, "climate": climate, "terrain": terrain}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve planets facets: {str(e)}",
+        )
+
+
+@router.get("/stats", response_model=schemas.StatsResponse)
+def read_planets_stats(
+    bins: int = Query(10, ge=1, le=100, description="Histogram bins"),
+    db: Session = Depends(deps.get_read_db),
+):
+    """Mean, median, percentiles and histogram of population and diameter per climate."""
+    if get_numpy() is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Statistics require NumPy, which is not installed",
+        )
+    try:
+        return stats_registry.get(PlanetsModel).compute(db, bins)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve planets stats: {str(e)}",
+        )
+
+
 @router.post("/", response_model=schemas.Planets, status_code=status.HTTP_201_CREATED)
 def create_planets(planets: schemas.PlanetsCreate, db: Session = Depends(deps.get_db)):
     """Create new planets."""
@@ -109,7 +167,7 @@ def create_planets(planets: schemas.PlanetsCreate, db: Session = Depends(deps.ge
 
 
 @router.get("/{planets_id}", response_model=schemas.Planets)
-def read_planets_by_id(planets_id: int, db: Session = Depends(deps.get_db)):
+def read_planets_by_id(planets_id: int, db: Session = Depends(deps.get_read_db)):
     """Get a specific planets by ID."""
     planets = planets_crud.get(db=db, id=planets_id)
     if planets is None:
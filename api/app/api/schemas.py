@@ -3,7 +3,7 @@ Pydantic schemas for API requests and responses.
 """
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List, Generic, TypeVar
+from typing import Dict, Optional, List, Generic, TypeVar
 from enum import Enum
 from datetime import datetime
 
@@ -69,6 +69,53 @@ class PaginatedResponse(BaseModel, Generic[T]):
     has_prev: bool
 
 
+class FacetValue(BaseModel):
+    """Number of records with one value of a facet column."""
+
+    value: Optional[str] = None
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    """Value counts per facet column."""
+
+    total: int
+    generation: int
+    source: str  # "counters" (in-memory) or "query" (grouped SQL query)
+    facets: Dict[str, List[FacetValue]]
+
+
+class StatsSummary(BaseModel):
+    """Distribution of one numeric column within one group."""
+
+    count: int
+    missing: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+    histogram: List[int]
+
+
+class ColumnStats(BaseModel):
+    """Distribution of one numeric column, overall and per group."""
+
+    edges: List[float]
+    all: StatsSummary
+    groups: Dict[str, StatsSummary]
+
+
+class StatsResponse(BaseModel):
+    """Distribution statistics of a table's numeric columns."""
+
+    total: int
+    generation: int
+    group_by: str
+    bins: int
+    columns: Dict[str, ColumnStats]
+
+
 class BaseSchema(BaseModel):
     """Base schema with common configuration."""
 
@@ -111,6 +158,8 @@ class People(PeopleBase):
     """Schema for people responses."""
 
     id: int
+    url: Optional[str] = None
+    edited: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -153,6 +202,8 @@ class Planets(PlanetsBase):
     """Schema for planets responses."""
 
     id: int
+    url: Optional[str] = None
+    edited: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -1,12 +1,54 @@
 """
 Sorting strategy pattern implementation following Open-Closed Principle.
+
+Strategies declare which columns each sort field maps to. ``SortPlanRegistry``
+turns a strategy into a ``SortPlan`` once per model class, and the plan caches
+the ``order_by`` clause tuple for every sort key combination it has seen.
+Every plan appends ``id`` as a final tiebreak, so pages stay stable when the
+sort columns have duplicate values.
 """
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Type
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
 from sqlalchemy.orm import Query
 from sqlalchemy import desc, asc
 from app.api.schemas import SortField, SortOrder
+from app.db.models import People, Planets
+
+# Sort keys are (field, order) pairs, most significant first
+SortKeys = Tuple[Tuple[SortField, SortOrder], ...]
+
+MAX_SORT_KEYS = 3
+
+
+def parse_sort(spec: str) -> SortKeys:
+    """
+    Parse a multi-key sort such as ``"gender,-mass"``.
+
+    A leading ``-`` sorts that key in descending order. Raises ``ValueError``
+    for unknown fields, repeated fields or too many keys.
+    """
+    keys = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        order = SortOrder.ASC
+        if part[0] in "-+":
+            order = SortOrder.DESC if part[0] == "-" else SortOrder.ASC
+            part = part[1:]
+        try:
+            field = SortField(part)
+        except ValueError:
+            raise ValueError(f"Unknown sort field: {part}") from None
+        if any(field == existing for existing, _ in keys):
+            raise ValueError(f"Sort field repeated: {part}")
+        keys.append((field, order))
+    if len(keys) > MAX_SORT_KEYS:
+        raise ValueError(f"At most {MAX_SORT_KEYS} sort keys are supported")
+    return tuple(keys)
 
 
 class SortStrategy(ABC):
@@ -24,22 +66,39 @@ class SortStrategy(ABC):
         """Apply sorting to the query."""
         pass
 
+    def field_mapping(self, model: Any) -> Dict[SortField, Any]:
+        """Map sort fields to model columns. Unmapped fields sort by ID."""
+        return {}
 
-class PeopleSortStrategy(SortStrategy):
-    """Sorting strategy for People model."""
 
-    def can_handle(self, model: Any, sort_field: SortField) -> bool:
-        """Check if this strategy can handle People model sorting."""
-        from app.db.models import People
+class ModelSortStrategy(SortStrategy):
+    """Strategy for one model class, sorting through the model's sort plan."""
 
-        return isinstance(model, type) and issubclass(model, People)
+    model: Any = None
+
+    def can_handle(self, model: Any, sort_field: SortField) -> bool:
+        """Check if this strategy handles the given model class."""
+        return isinstance(model, type) and issubclass(model, self.model)
 
     def apply_sort(
         self, query: Query, model: Any, sort_field: SortField, sort_order: SortOrder
     ) -> Query:
-        """Apply sorting to People query."""
-        # Map sort fields to model attributes
-        field_mapping = {
+        """Apply a single-key sort (plus the ID tiebreak) to the query."""
+        plan = sort_plans.get(model)
+        if sort_field not in plan.columns:
+            # Default sorting by ID if field not found
+            return query.order_by(*plan.order_by(()))
+        return query.order_by(*plan.order_by(((sort_field, sort_order),)))
+
+
+class PeopleSortStrategy(ModelSortStrategy):
+    """Sorting strategy for People model."""
+
+    model = People
+
+    def field_mapping(self, model: Any) -> Dict[SortField, Any]:
+        """Map sort fields to People columns."""
+        return {
             SortField.NAME: model.name,
             SortField.HEIGHT: model.height,
             SortField.MASS: model.mass,
@@ -52,32 +111,15 @@ class PeopleSortStrategy(SortStrategy):
             SortField.UPDATED_AT: model.updated_at,
         }
 
-        if sort_field in field_mapping:
-            sort_column = field_mapping[sort_field]
-            if sort_order == SortOrder.DESC:
-                return query.order_by(desc(sort_column))
-            else:
-                return query.order_by(asc(sort_column))
-
-        # Default sorting by ID if field not found
-        return query.order_by(asc(model.id))
-
 
-class PlanetsSortStrategy(SortStrategy):
+class PlanetsSortStrategy(ModelSortStrategy):
     """Sorting strategy for Planets model."""
 
-    def can_handle(self, model: Any, sort_field: SortField) -> bool:
-        """Check if this strategy can handle Planets model sorting."""
-        from app.db.models import Planets
-
-        return isinstance(model, type) and issubclass(model, Planets)
+    model = Planets
 
-    def apply_sort(
-        self, query: Query, model: Any, sort_field: SortField, sort_order: SortOrder
-    ) -> Query:
-        """Apply sorting to Planets query."""
-        # Map sort fields to model attributes
-        field_mapping = {
+    def field_mapping(self, model: Any) -> Dict[SortField, Any]:
+        """Map sort fields to Planets columns."""
+        return {
             SortField.NAME: model.name,
             SortField.DIAMETER: model.diameter,
             SortField.ROTATION_PERIOD: model.rotation_period,
@@ -91,16 +133,6 @@ class PlanetsSortStrategy(SortStrategy):
             SortField.UPDATED_AT: model.updated_at,
         }
 
-        if sort_field in field_mapping:
-            sort_column = field_mapping[sort_field]
-            if sort_order == SortOrder.DESC:
-                return query.order_by(desc(sort_column))
-            else:
-                return query.order_by(asc(sort_column))
-
-        # Default sorting by ID if field not found
-        return query.order_by(asc(model.id))
-
 
 # Example of extending the system with a new strategy (Open-Closed Principle)
 class CustomSortStrategy(SortStrategy):
@@ -119,11 +151,70 @@ class CustomSortStrategy(SortStrategy):
         return query.order_by(asc(model.id))
 
 
+class SortPlan:
+    """
+    Precomputed sort columns of one model.
+
+    ``order_by`` results are cached per sort key tuple, so repeated requests
+    reuse the same clause objects instead of rebuilding them.
+    """
+
+    def __init__(self, model: Any, columns: Dict[SortField, Any]):
+        self.model = model
+        self.columns = dict(columns)
+        self.tiebreak = model.id
+        self.order_by = lru_cache(maxsize=256)(self._build_order_by)
+
+    def _build_order_by(self, keys: SortKeys) -> tuple:
+        clauses = []
+        for field, order in keys:
+            column = self.columns.get(field)
+            if column is None:
+                raise ValueError(
+                    f"Cannot sort {self.model.__tablename__} by {field.value}"
+                )
+            clauses.append(desc(column) if order == SortOrder.DESC else asc(column))
+        clauses.append(asc(self.tiebreak))
+        return tuple(clauses)
+
+    def apply(self, query: Query, keys: SortKeys) -> Query:
+        """Order ``query`` by ``keys`` followed by the ID tiebreak."""
+        return query.order_by(*self.order_by(tuple(keys)))
+
+
+class SortPlanRegistry:
+    """Sort plans keyed by model class, built on first use from its strategy."""
+
+    def __init__(self, factory: "SortStrategyFactory"):
+        self.factory = factory
+        self._plans: Dict[Any, SortPlan] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: Any) -> SortPlan:
+        """Return the plan for ``model``, building it once."""
+        plan = self._plans.get(model)
+        if plan is None:
+            with self._lock:
+                plan = self._plans.get(model)
+                if plan is None:
+                    strategy = self.factory.get_strategy(model)
+                    plan = SortPlan(model, strategy.field_mapping(model))
+                    self._plans[model] = plan
+        return plan
+
+    def clear(self) -> None:
+        """Forget every plan, e.g. after registering a strategy."""
+        with self._lock:
+            self._plans.clear()
+
+
 class SortStrategyFactory:
     """Factory for creating sorting strategies."""
 
     def __init__(self):
         self._strategies: Dict[str, SortStrategy] = {}
+        self._by_model: Dict[Any, SortStrategy] = {}
+        self.plans = SortPlanRegistry(self)
         self._register_default_strategies()
 
     def _register_default_strategies(self):
@@ -134,15 +225,23 @@ class SortStrategyFactory:
     def register_strategy(self, name: str, strategy: SortStrategy):
         """Register a new sorting strategy."""
         self._strategies[name] = strategy
+        # Strategy lookups and plans may change with the new strategy
+        self._by_model.clear()
+        self.plans.clear()
 
     def get_strategy(self, model: Any) -> SortStrategy:
         """Get the appropriate strategy for the given model."""
+        strategy = self._by_model.get(model)
+        if strategy is not None:
+            return strategy
         for strategy in self._strategies.values():
             if strategy.can_handle(model, SortField.NAME):  # Use NAME as a test field
-                return strategy
-
-        # Return a default strategy that sorts by ID
-        return DefaultSortStrategy()
+                break
+        else:
+            # Return a default strategy that sorts by ID
+            strategy = DefaultSortStrategy()
+        self._by_model[model] = strategy
+        return strategy
 
     def apply_sort(
         self, query: Query, model: Any, sort_field: SortField, sort_order: SortOrder
@@ -151,6 +250,12 @@ class SortStrategyFactory:
         strategy = self.get_strategy(model)
         return strategy.apply_sort(query, model, sort_field, sort_order)
 
+    def apply_multi_sort(
+        self, query: Query, model: Any, keys: Optional[Sequence] = None
+    ) -> Query:
+        """Apply a multi-key sort through the model's sort plan."""
+        return self.plans.get(model).apply(query, tuple(keys or ()))
+
 
 class DefaultSortStrategy(SortStrategy):
     """Default sorting strategy that sorts by ID."""
@@ -171,6 +276,7 @@ class DefaultSortStrategy(SortStrategy):
 
 # Global factory instance
 sort_factory = SortStrategyFactory()
+sort_plans = sort_factory.plans
 
 
 # Example of how to extend the system (Open-Closed Principle demonstration)
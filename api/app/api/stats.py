@@ -0,0 +1,300 @@
+"""
+Distribution statistics of the numeric attributes.
+
+SWAPI stores numbers as strings ("1,358", "78.2", "unknown"). ``TableStats``
+loads a table's grouping column and numeric columns once, parses them into
+NumPy arrays and computes count, mean, median, percentiles and a histogram
+for every group in one batch: values are sorted by (group, value) with
+``lexsort``, so each group's order statistics are read off by index, and
+sums and histogram bins are counted with ``bincount``.
+
+The parsed arrays and the results are cached until the table generation
+changes (see ``app.db.generations``).
+
+NumPy is optional: it is imported on first use, and without it the stats
+endpoints answer 503.
+"""
+
+import math
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.generations import generations
+from app.db.models import People, Planets
+
+PERCENTILES = (5, 25, 75, 95)
+UNKNOWN_GROUP = "unknown"
+
+# Grouping column, numeric columns, and whether a group value is a
+# comma-separated list ("temperate, tropical" counts for both climates)
+STATS_COLUMNS = {
+    People: ("gender", ("height", "mass"), False),
+    Planets: ("climate", ("population", "diameter"), True),
+}
+
+
+@lru_cache(maxsize=None)
+def get_numpy():
+    """The ``numpy`` module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _to_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        return math.nan
+    return number if math.isfinite(number) else math.nan
+
+
+def parse_numeric(raw: Sequence[Optional[str]]):
+    """
+    Parse number strings into a float array, NaN where there is no number.
+
+    Each distinct string is parsed once and the results are spread over the
+    rows by index, so the cost grows with the number of distinct values.
+    """
+    np = get_numpy()
+    strings = np.array(["" if value is None else value for value in raw], dtype=str)
+    if strings.size == 0:
+        return np.empty(0, dtype=float)
+    distinct, inverse = np.unique(strings, return_inverse=True)
+    cleaned = np.char.replace(np.char.strip(distinct), ",", "")
+    parsed = np.array([_to_float(value) for value in cleaned], dtype=float)
+    return parsed[inverse.reshape(-1)]
+
+
+def group_codes(
+    labels: Sequence[Optional[str]], split: bool = False
+) -> Tuple[Any, Any, List[str]]:
+    """
+    Integer group codes for ``labels``.
+
+    Returns ``(rows, codes, groups)``: row ``rows[i]`` belongs to group
+    ``groups[codes[i]]``. With ``split`` a row belongs to every group of its
+    comma-separated label, so ``rows`` can repeat.
+    """
+    np = get_numpy()
+    parts = [
+        (
+            (
+                [part.strip() for part in label.split(",") if part.strip()]
+                if split
+                else [label.strip()]
+            )
+            if label and label.strip()
+            else [UNKNOWN_GROUP]
+        )
+        for label in labels
+    ]
+    counts = np.array([len(values) for values in parts], dtype=int)
+    rows = np.repeat(np.arange(len(parts)), counts)
+    flat = np.array([value for values in parts for value in values], dtype=str)
+    if flat.size == 0:
+        return rows, np.empty(0, dtype=int), []
+    groups, codes = np.unique(flat, return_inverse=True)
+    return rows, codes.reshape(-1), [str(group) for group in groups]
+
+
+def histogram_edges(values, bins: int):
+    """``bins + 1`` equal-width edges spanning the known values."""
+    np = get_numpy()
+    known = values[~np.isnan(values)]
+    low, high = (float(known.min()), float(known.max())) if known.size else (0.0, 1.0)
+    if high == low:
+        high = low + 1.0
+    return np.linspace(low, high, bins + 1)
+
+
+def grouped_summary(
+    values, codes, n_groups: int, edges, percentiles: Sequence[float] = PERCENTILES
+) -> Dict[str, Any]:
+    """
+    Count, missing, mean, min, max, quantiles and histogram per group.
+
+    Every statistic is an array with one entry per group (quantiles and
+    histograms one row per group); groups without values get NaN. Quantiles
+    interpolate linearly, like ``numpy.percentile``.
+    """
+    np = get_numpy()
+    known = ~np.isnan(values)
+    missing = np.bincount(codes[~known], minlength=n_groups)
+    order = np.lexsort((values[known], codes[known]))
+    sorted_values, sorted_codes = values[known][order], codes[known][order]
+
+    counts = np.bincount(sorted_codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    sums = np.bincount(sorted_codes, weights=sorted_values, minlength=n_groups)
+    has_values = counts > 0
+
+    quantiles = np.array([50, *percentiles], dtype=float) / 100
+    positions = (
+        starts[:, None] + quantiles[None, :] * np.maximum(counts - 1, 0)[:, None]
+    )
+    quantile_values = np.full(positions.shape, np.nan)
+    mins = np.full(n_groups, np.nan)
+    maxs = np.full(n_groups, np.nan)
+    means = np.full(n_groups, np.nan)
+    if sorted_values.size:
+        lower = np.minimum(np.floor(positions).astype(int), sorted_values.size - 1)
+        upper = np.minimum(np.ceil(positions).astype(int), sorted_values.size - 1)
+        interpolated = sorted_values[lower] + (
+            sorted_values[upper] - sorted_values[lower]
+        ) * (positions - lower)
+        quantile_values[has_values] = interpolated[has_values]
+        mins[has_values] = sorted_values[starts[has_values]]
+        maxs[has_values] = sorted_values[starts[has_values] + counts[has_values] - 1]
+        means[has_values] = sums[has_values] / counts[has_values]
+
+    bins = len(edges) - 1
+    bin_index = np.clip(
+        np.searchsorted(edges, sorted_values, side="right") - 1, 0, bins - 1
+    )
+    histograms = np.bincount(
+        sorted_codes * bins + bin_index, minlength=n_groups * bins
+    ).reshape(n_groups, bins)
+
+    return {
+        "count": counts,
+        "missing": missing,
+        "mean": means,
+        "min": mins,
+        "max": maxs,
+        "median": quantile_values[:, 0],
+        "percentiles": quantile_values[:, 1:],
+        "histogram": histograms,
+    }
+
+
+def _number(value) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _summaries(summary: Dict[str, Any], groups: List[str]) -> Dict[str, Dict]:
+    return {
+        group: {
+            "count": int(summary["count"][i]),
+            "missing": int(summary["missing"][i]),
+            "mean": _number(summary["mean"][i]),
+            "median": _number(summary["median"][i]),
+            "min": _number(summary["min"][i]),
+            "max": _number(summary["max"][i]),
+            "percentiles": {
+                f"p{p:g}": _number(summary["percentiles"][i][j])
+                for j, p in enumerate(PERCENTILES)
+            },
+            "histogram": [int(count) for count in summary["histogram"][i]],
+        }
+        for i, group in enumerate(groups)
+    }
+
+
+class TableStats:
+    """Cached distribution statistics of one table's numeric columns."""
+
+    def __init__(
+        self, model: Any, group_by: str, columns: Tuple[str, ...], split: bool = False
+    ):
+        self.model = model
+        self.table = model.__tablename__
+        self.group_by = group_by
+        self.columns = columns
+        self.split = split
+        self.generation: Optional[int] = None
+        self.loads = 0
+        self._arrays: Optional[Dict[str, Any]] = None
+        self._results: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def compute(self, db: Session, bins: int = 10) -> Dict[str, Any]:
+        """Statistics per group and overall, with ``bins`` histogram bins."""
+        generation = generations.current(db, self.table)
+        with self._lock:
+            if self.generation != generation:
+                self._arrays, self._results = None, {}
+            cached = self._results.get(bins)
+        if cached is not None:
+            return cached
+
+        arrays = self._load(db, generation)
+        result = self._aggregate(arrays, bins)
+        result["generation"] = generation
+        with self._lock:
+            if self.generation == generation:
+                self._results[bins] = result
+        return result
+
+    def _load(self, db: Session, generation: int) -> Dict[str, Any]:
+        with self._lock:
+            if self._arrays is not None and self.generation == generation:
+                return self._arrays
+
+        fields = [getattr(self.model, name) for name in (self.group_by, *self.columns)]
+        rows = db.query(*fields).all()
+        labels, *values = zip(*rows) if rows else ((),) * len(fields)
+        row_index, codes, groups = group_codes(labels, self.split)
+        arrays = {
+            "total": len(rows),
+            "rows": row_index,
+            "codes": codes,
+            "groups": groups,
+            "values": {
+                name: parse_numeric(column)
+                for name, column in zip(self.columns, values)
+            },
+        }
+        # Only cache arrays no write could have slipped into
+        if generations.current(db, self.table) == generation:
+            with self._lock:
+                self._arrays, self.generation = arrays, generation
+                self._results = {}
+                self.loads += 1
+        return arrays
+
+    def _aggregate(self, arrays: Dict[str, Any], bins: int) -> Dict[str, Any]:
+        np = get_numpy()
+        groups = arrays["groups"]
+        columns = {}
+        for name, values in arrays["values"].items():
+            edges = histogram_edges(values, bins)
+            per_group = grouped_summary(
+                values[arrays["rows"]], arrays["codes"], len(groups), edges
+            )
+            overall = grouped_summary(
+                values, np.zeros(values.size, dtype=int), 1, edges
+            )
+            columns[name] = {
+                "edges": [float(edge) for edge in edges],
+                "all": _summaries(overall, ["all"])["all"],
+                "groups": _summaries(per_group, groups),
+            }
+        return {
+            "total": arrays["total"],
+            "group_by": self.group_by,
+            "bins": bins,
+            "columns": columns,
+        }
+
+
+class StatsRegistry:
+    """Statistics keyed by model class."""
+
+    def __init__(self, columns: Dict[Any, Tuple[str, Tuple[str, ...], bool]]):
+        self.tables = {
+            model: TableStats(model, group_by, names, split)
+            for model, (group_by, names, split) in columns.items()
+        }
+
+    def get(self, model: Any) -> TableStats:
+        return self.tables[model]
+
+
+stats_registry = StatsRegistry(STATS_COLUMNS)
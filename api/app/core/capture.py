@@ -0,0 +1,125 @@
+"""
+Request capture for traffic replay.
+
+``MonitoringMiddleware`` hands every finished request (method, path, query
+string, status and duration) to ``TrafficCapture``, which appends it to an
+``EventSink``. A background thread writes the requests as compact JSON
+arrays, one per line, to a size-rotated capture file per worker process,
+``<TRAFFIC_CAPTURE_FILE>.<pid>``, so workers never rotate each other's file:
+
+    [1734567890.123456,"GET","/api/people/","name=sky&page=2",200,12.345]
+
+Fields are the arrival time (Unix seconds), method, path, raw query string,
+status code and server-side duration in milliseconds. Request bodies and
+headers are not captured. ``app/tools/replay.py`` merges the workers' files
+and replays them.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.events import EventSink, RotatingFileWriter
+
+logger = logging.getLogger(__name__)
+
+# Probe traffic says nothing about how users use the API
+EXCLUDED_PATHS = frozenset(("/health", "/livez", "/readyz"))
+
+
+def worker_capture_file(path: str, pid: Optional[int] = None) -> str:
+    """The capture file of the worker process ``pid`` (default: this one)."""
+    return f"{path}.{pid or os.getpid()}"
+
+
+class TrafficCapture:
+    """Samples finished requests into this worker's rotating capture file."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        sample_rate: float = 1.0,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.sample_rate = sample_rate
+        # Opened on the first write, in the worker process that serves requests
+        self.writer: Optional[RotatingFileWriter] = None
+        self.sink = EventSink("capture", self._write, capacity=20000, batch_size=512)
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        query_string: bytes,
+        status_code: int,
+        execution_time_ms: float,
+    ) -> None:
+        """Queue one finished request."""
+        if path in EXCLUDED_PATHS:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self.sink.emit(
+            (
+                time.time() - execution_time_ms / 1000,
+                method,
+                path,
+                query_string,
+                status_code,
+                execution_time_ms,
+            )
+        )
+
+    def _write(self, batch: List[tuple]) -> None:
+        if self.writer is None:
+            self.writer = RotatingFileWriter(
+                worker_capture_file(self.path), self.max_bytes, self.backup_count
+            )
+        self.writer.write_lines(
+            [
+                json.dumps(
+                    [
+                        round(started, 6),
+                        method,
+                        path,
+                        query_string.decode("latin-1"),
+                        status_code,
+                        round(execution_time_ms, 3),
+                    ],
+                    separators=(",", ":"),
+                )
+                for started, method, path, query_string, status_code, execution_time_ms in batch
+            ]
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return self.sink.stats()
+
+    def shutdown(self) -> None:
+        """Flush queued requests and close the capture file."""
+        self.sink.stop()
+        if self.writer is not None:
+            self.writer.close()
+
+
+def create_traffic_capture() -> Optional[TrafficCapture]:
+    """Create the capture configured by the application settings, if enabled."""
+    if not settings.TRAFFIC_CAPTURE_FILE:
+        return None
+    return TrafficCapture(
+        settings.TRAFFIC_CAPTURE_FILE,
+        max_bytes=settings.TRAFFIC_CAPTURE_MAX_BYTES,
+        backup_count=settings.TRAFFIC_CAPTURE_BACKUP_COUNT,
+        sample_rate=settings.TRAFFIC_CAPTURE_SAMPLE_RATE,
+    )
+
+
+traffic_capture = create_traffic_capture()
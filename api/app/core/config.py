@@ -3,7 +3,7 @@ Configuration settings for the application.
 """
 
 import os
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic_settings import BaseSettings
 from pydantic import field_validator, ConfigDict
 
@@ -20,6 +20,26 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./app.db"
 
+    # Skip table creation at startup when the stored schema version is current
+    DB_INIT_SKIP_KNOWN_SCHEMA: bool = True
+    # Pool connections opened, and list queries run once, before reporting ready
+    DB_WARMUP_CONNECTIONS: int = 2
+
+    # Comma-separated read replicas for read-only endpoints, e.g.
+    # DATABASE_REPLICA_URLS=postgresql://...@replica1/db,postgresql://...@replica2/db
+    DATABASE_REPLICA_URLS: str = ""
+    # "round_robin" or "least_busy" (fewest sessions in use)
+    REPLICA_STRATEGY: str = "round_robin"
+    # A client's reads go to the primary for this long after it writes
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Replicas lagging more than this are evicted until they catch up
+    REPLICA_MAX_LAG_SECONDS: float = 10.0
+
+    # Answer list queries from an in-memory columnar snapshot of each table
+    # (needs NumPy); tables with more rows than COLUMNAR_MAX_ROWS use SQL
+    COLUMNAR_ENABLED: bool = False
+    COLUMNAR_MAX_ROWS: int = 100000
+
     # PostgreSQL specific settings (for Docker)
     POSTGRES_DB: str = "quiz_db"
     POSTGRES_USER: str = "quiz_user"
@@ -38,10 +58,83 @@ class Settings(BaseSettings):
     # External API settings
     STAR_WARS_API_URL: str = "https://swapi.dev/api/"
 
+    # Health check settings
+    # Dependency checks run in a background task every HEALTH_CHECK_INTERVAL
+    # seconds (0 disables it: checks then run on demand when the cache is stale)
+    HEALTH_CHECK_INTERVAL: float = 15.0
+    HEALTH_CHECK_TIMEOUT: float = 5.0
+
     # Timezone settings
     TIMEZONE: str = "UTC"
     USE_TIMEZONE: bool = True
 
+    # Logging settings
+    # "sync" writes from the calling thread; "async" hands records to bounded
+    # queues drained by background threads that write batches (JSON lines to file)
+    LOG_MODE: str = "sync"
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str = "app.log"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 512
+
+    # Monitoring settings
+    # Directory for per-worker shared-memory metrics files. When set, metrics are
+    # aggregated across all uvicorn/gunicorn workers; clear it before each start.
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    # Bounded buffer of search/sort/request events flushed by a background thread
+    EVENT_SINK_CAPACITY: int = 10000
+    EVENT_SINK_BATCH_SIZE: int = 256
+    EVENT_SINK_FLUSH_INTERVAL: float = 0.5
+    # Write events as JSON lines to this file instead of the application log
+    EVENT_LOG_FILE: Optional[str] = None
+    # Fraction of event log lines to emit; counters are never sampled.
+    # Overrides are JSON objects, e.g. LOG_SAMPLE_ROUTE_RATES='{"/api/people": 0.1}'
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_SAMPLE_EVENT_RATES: Dict[str, float] = {}
+    LOG_SAMPLE_ROUTE_RATES: Dict[str, float] = {}
+    # Errors and slow events are always logged
+    LOG_SAMPLE_SLOW_MS: float = 1000.0
+    LOG_SAMPLE_KEEP_STATUS: int = 500
+
+    # Traffic capture for app/tools/replay.py: each request's method, path,
+    # query, status and duration as a JSON line in a size-rotated file
+    TRAFFIC_CAPTURE_FILE: Optional[str] = None
+    TRAFFIC_CAPTURE_MAX_BYTES: int = 50 * 1024 * 1024
+    TRAFFIC_CAPTURE_BACKUP_COUNT: int = 5
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 1.0
+
+    # SQL instrumentation settings
+    # Statements slower than this are written to the slow-query log
+    SLOW_QUERY_MS: float = 100.0
+    # The same statement shape repeated this often in one request is flagged as N+1
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # SELECTs slower than EXPLAIN_SLOW_MS, and ILIKE searches of any duration, are
+    # explained in the background (EXPLAIN ANALYZE on PostgreSQL executes them again)
+    EXPLAIN_ENABLED: bool = True
+    EXPLAIN_SLOW_MS: float = 100.0
+    EXPLAIN_SEARCHES: bool = True
+    EXPLAIN_ANALYZE: bool = True
+    EXPLAIN_SAMPLE_RATE: float = 1.0
+    # Explain each statement shape at most once per interval
+    EXPLAIN_INTERVAL_SECONDS: float = 60.0
+    EXPLAIN_MAX_PLANS: int = 50
+
+    # Index advisor settings
+    # Sort/search columns used at least this often, this slowly on average,
+    # get an index recommendation at /api/monitoring/index-advice
+    INDEX_ADVISOR_MIN_COUNT: int = 20
+    INDEX_ADVISOR_MIN_LATENCY_MS: float = 50.0
+    # Allow creating recommended indexes through the API (online on PostgreSQL)
+    INDEX_ADVISOR_ALLOW_APPLY: bool = False
+
+    # Tracing settings
+    # Per-request spans are reported in the Server-Timing header and can be
+    # exported as OTLP/JSON: "none", "file" or "otlp" (OTLP/HTTP collector)
+    TRACING_ENABLED: bool = True
+    TRACING_EXPORTER: str = "none"
+    TRACING_EXPORT_FILE: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v):
@@ -51,6 +144,13 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    @property
+    def replica_urls(self) -> List[str]:
+        """Database URLs of the read replicas."""
+        return [
+            url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()
+        ]
+
     @property
     def database_url(self) -> str:
         """Get the database URL, constructing it from components if needed."""
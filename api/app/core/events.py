@@ -0,0 +1,206 @@
+"""
+Asynchronous, batched event sink.
+
+Request threads only append a compact tuple to a bounded ring buffer. A
+background thread drains the buffer in batches and hands each batch to a
+writer, which does the expensive serialization and I/O off the hot path.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BatchWriter = Callable[[List[tuple]], None]
+
+
+class EventSink:
+    """
+    Bounded ring buffer drained by a background worker thread.
+
+    When the buffer is full new events are dropped (drop-newest) and counted,
+    so a slow writer can never block or grow memory on the request path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        writer: BatchWriter,
+        capacity: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        on_drop: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.writer = writer
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_drop = on_drop
+
+        self._buffer: List[Optional[tuple]] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+
+        self._emitted = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+        self._write_errors = 0
+
+    def emit(self, event: tuple) -> bool:
+        """Enqueue an event. Returns ``False`` if it was dropped."""
+        if self._thread is None:
+            self.start()
+
+        with self._lock:
+            if self._size >= self.capacity:
+                self._dropped += 1
+                dropped = True
+            else:
+                self._buffer[(self._head + self._size) % self.capacity] = event
+                self._size += 1
+                self._emitted += 1
+                dropped = False
+            wake = self._size >= self.batch_size
+
+        if dropped:
+            if self.on_drop:
+                self.on_drop()
+            return False
+        if wake:
+            self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """Start the background worker if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name=f"event-sink-{self.name}", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker after flushing every buffered event."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout)
+        self._thread = None
+        # Anything emitted while the worker was exiting
+        self.flush()
+
+    def flush(self) -> None:
+        """Synchronously write out every buffered event."""
+        while self._drain_once():
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters describing the sink."""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "queued": self._size,
+                "emitted": self._emitted,
+                "written": self._written,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "write_errors": self._write_errors,
+                "running": self._thread is not None and self._thread.is_alive(),
+            }
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
+
+    def _drain_once(self) -> bool:
+        """Write one batch. Returns ``False`` when the buffer was empty."""
+        with self._lock:
+            count = min(self._size, self.batch_size)
+            if not count:
+                return False
+            batch = []
+            for _ in range(count):
+                batch.append(self._buffer[self._head])
+                self._buffer[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._size -= count
+
+        try:
+            self.writer(batch)
+            with self._lock:
+                self._written += count
+                self._batches += 1
+        except Exception as e:
+            with self._lock:
+                self._write_errors += 1
+            logger.error(f"Event sink '{self.name}' failed to write a batch: {e}")
+        return True
+
+
+class RotatingFileWriter:
+    """
+    Append batches of lines to a file, rotating it by size.
+
+    Meant to be used as (part of) an ``EventSink`` writer: each batch is a
+    single ``write`` call, and rotation renames ``path`` to ``path.1`` and
+    shifts older files up to ``backup_count``. Sizes are counted in bytes.
+
+    Rotation assumes one writer per file: processes sharing ``path`` would
+    rename each other's live file.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0, backup_count: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+
+    def write_lines(self, lines: List[str]) -> None:
+        """Write ``lines`` (without trailing newlines) as one chunk."""
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        position = self._file.tell()
+        if self.max_bytes and position and position + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
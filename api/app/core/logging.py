@@ -2,17 +2,36 @@
 Logging configuration for the application.
 """
 
+import json
 import logging
 import sys
-from typing import List
+import traceback
+from typing import Any, Callable, Dict, List, Tuple
 from loguru import logger
 from app.core.config import settings
+from app.core.events import EventSink, RotatingFileWriter
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_LOG_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+# Extra key carrying the location of a stdlib record into loguru
+_STDLIB_LOCATION = "_stdlib_location"
+
+_SIZE_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+# Background sinks installed by the current logging setup
+_batched_sinks: List["BatchedSink"] = []
 
 
 class InterceptHandler(logging.Handler):
     """
-    Default handler from examples of loguru documentation.
-    See https://loguru.readthedocs.io/en/stable/overview.html#entirely-compatible-with-standard-logging
+    Handler routing standard logging records to loguru.
+    Based on https://loguru.readthedocs.io/en/stable/overview.html#entirely-compatible-with-standard-logging
+    but, instead of walking the stack to find the caller, it copies the
+    location from the LogRecord, and it keeps the structured ``extra`` fields
+    (such as the monitoring ``event_data``).
     """
 
     def emit(self, record: logging.LogRecord) -> None:
@@ -22,17 +41,148 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = record.levelno
 
-        # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
+        extra = {
+            key: value
+            for key, value in record.__dict__.items()
+            if key not in _LOG_RECORD_ATTRIBUTES
+        }
+        extra[_STDLIB_LOCATION] = (record.name, record.funcName, record.lineno)
 
-        logger.opt(depth=depth, exception=record.exc_info).log(
+        logger.opt(exception=record.exc_info).bind(**extra).log(
             level, record.getMessage()
         )
 
 
+def _apply_stdlib_location(record: Dict[str, Any]) -> None:
+    """Loguru patcher restoring the caller location of intercepted records."""
+    location = record["extra"].pop(_STDLIB_LOCATION, None)
+    if location is not None:
+        record["name"], record["function"], record["line"] = location
+
+
+class _StreamWriter:
+    """Write batches of lines to a stream such as stdout."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_lines(self, lines: List[str]) -> None:
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+def format_text(entry: tuple) -> str:
+    """Render a captured record as a plain text line."""
+    time, level, name, function, line, message, extra, exception = entry
+    text = (
+        f"{level: <8} {time:%Y-%m-%d %H:%M:%S}.{time.microsecond // 1000:03d} - "
+        f"{name}:{function}:{line} - {message}"
+    )
+    if exception is not None:
+        text += "\n" + _format_exception(exception).rstrip("\n")
+    return text
+
+
+def format_json(entry: tuple) -> str:
+    """Render a captured record as a JSON line, including its ``extra`` fields."""
+    time, level, name, function, line, message, extra, exception = entry
+    data = {
+        "time": time.isoformat(),
+        "level": level,
+        "name": name,
+        "function": function,
+        "line": line,
+        "message": message,
+    }
+    if extra:
+        data.update(extra)
+    if exception is not None:
+        data["exception"] = _format_exception(exception)
+    return json.dumps(data, default=str)
+
+
+def _format_exception(exception) -> str:
+    return "".join(
+        traceback.format_exception(exception.type, exception.value, exception.traceback)
+    )
+
+
+class BatchedSink:
+    """
+    Loguru sink that moves formatting and I/O to a background thread.
+
+    The logging thread only appends a compact tuple of the record fields to a
+    bounded buffer (dropping records when it is full). The background thread
+    renders each batch once per output, with that output's formatter, and
+    writes it in a single call.
+    """
+
+    def __init__(
+        self,
+        outputs: List[Tuple[Any, Callable[[tuple], str]]],
+        queue_size: int = 10000,
+        batch_size: int = 512,
+        name: str = "logging",
+    ):
+        self.outputs = outputs
+        self._sink = EventSink(
+            name,
+            self._write_batch,
+            capacity=queue_size,
+            batch_size=batch_size,
+            flush_interval=0.2,
+        )
+
+    def write(self, message) -> None:
+        """Called by loguru for every record that passes the level filter."""
+        record = message.record
+        self._sink.emit(
+            (
+                record["time"],
+                record["level"].name,
+                record["name"],
+                record["function"],
+                record["line"],
+                record["message"],
+                record["extra"],
+                record["exception"],
+            )
+        )
+
+    def stop(self) -> None:
+        """Flush buffered records and close the outputs."""
+        self._sink.stop()
+        for writer, _ in self.outputs:
+            writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._sink.stats()
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        for writer, formatter in self.outputs:
+            writer.write_lines([formatter(entry) for entry in batch])
+
+
+def _parse_size(size: str) -> int:
+    """Parse a loguru style size such as ``"20 MB"`` into bytes."""
+    number, _, unit = size.strip().partition(" ")
+    return int(float(number) * _SIZE_UNITS.get(unit.strip().upper() or "B", 1))
+
+
+def get_logging_stats() -> List[Dict[str, Any]]:
+    """Get the counters of the background logging sinks, if any."""
+    return [sink.stats() for sink in _batched_sinks]
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the background logging sinks."""
+    while _batched_sinks:
+        _batched_sinks.pop().stop()
+
+
 def setup_logging(
     *,
     log_file: str = "app.log",
@@ -47,46 +197,77 @@ def setup_logging(
     serialize: bool = False,
     compression: str = None,
     delay: bool = False,
+    mode: str = "sync",
+    queue_size: int = 10000,
+    batch_size: int = 512,
+    backup_count: int = 5,
     **kwargs: dict,
 ) -> None:
     """
     Setup logging configuration.
+
+    ``mode="sync"`` writes every record from the calling thread through
+    loguru's own sinks. ``mode="async"`` is the high-throughput mode: records
+    go through a bounded in-memory queue to a background thread, which writes
+    plain text to stdout and a size-rotated JSON-lines file (keeping the
+    structured ``extra`` fields) in batches.
     """
     # Remove all existing handlers
+    shutdown_logging()
     logger.remove()
+    logger.configure(patcher=_apply_stdlib_location)
 
-    # Add stdout handler
-    logger.add(
-        sys.stdout,
-        format=format,
-        level=level,
-        backtrace=backtrace,
-        diagnose=diagnose,
-        enqueue=enqueue,
-        catch=catch,
-        serialize=serialize,
-        **kwargs,
-    )
+    if mode == "async":
+        sink = BatchedSink(
+            [
+                (_StreamWriter(sys.stdout), format_text),
+                (
+                    RotatingFileWriter(log_file, _parse_size(rotation), backup_count),
+                    format_json,
+                ),
+            ],
+            queue_size=queue_size,
+            batch_size=batch_size,
+        )
+        _batched_sinks.append(sink)
+        # The sink renders records itself; "{message}" keeps loguru's own
+        # formatting on the calling thread as cheap as possible
+        logger.add(sink, format="{message}", level=level, catch=catch, **kwargs)
+    else:
+        # Add stdout handler
+        logger.add(
+            sys.stdout,
+            format=format,
+            level=level,
+            backtrace=backtrace,
+            diagnose=diagnose,
+            enqueue=enqueue,
+            catch=catch,
+            serialize=serialize,
+            **kwargs,
+        )
 
-    # Add file handler
-    logger.add(
-        log_file,
-        rotation=rotation,
-        retention=retention,
-        format=format,
-        level=level,
-        backtrace=backtrace,
-        diagnose=diagnose,
-        enqueue=enqueue,
-        catch=catch,
-        serialize=serialize,
-        compression=compression,
-        delay=delay,
-        **kwargs,
-    )
+        # Add file handler
+        logger.add(
+            log_file,
+            rotation=rotation,
+            retention=retention,
+            format=format,
+            level=level,
+            backtrace=backtrace,
+            diagnose=diagnose,
+            enqueue=enqueue,
+            catch=catch,
+            serialize=serialize,
+            compression=compression,
+            delay=delay,
+            **kwargs,
+        )
 
-    # Intercept standard logging
-    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+    # Intercept standard logging. The root level makes stdlib loggers drop
+    # records below the threshold before a LogRecord is even created.
+    level_no = logger.level(level).no
+    logging.basicConfig(handlers=[InterceptHandler()], level=level_no, force=True)
 
     # Intercept uvicorn logging
     for _log in ["uvicorn", "uvicorn.error", "fastapi"]:
@@ -0,0 +1,282 @@
+"""
+Storage backends for monitoring counters and histograms.
+
+The in-memory backend keeps counters in a plain dict and is only correct for a
+single process. The shared-memory backend gives every worker its own
+memory-mapped file, so workers never contend on a lock when they update, and
+any worker can aggregate the whole fleet by summing all files on read.
+"""
+
+import fcntl
+import glob
+import logging
+import mmap
+import os
+import struct
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+KEY_SEPARATOR = "|"
+
+
+def bucket_label(upper_bound: float) -> str:
+    """Return the label used for a histogram bucket upper bound."""
+    return "+Inf" if upper_bound == float("inf") else f"{upper_bound:g}"
+
+
+class MetricsBackend(ABC):
+    """Abstract store of monotonically increasing float counters."""
+
+    name = "abstract"
+
+    @abstractmethod
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        """Increment the counter stored under ``key``."""
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> Dict[str, float]:
+        """Return the aggregated value of every counter."""
+        pass
+
+    def observe(self, name: str, value: float) -> None:
+        """Record ``value`` in the histogram called ``name``."""
+        for upper_bound in LATENCY_BUCKETS_MS:
+            if value <= upper_bound:
+                self.inc(
+                    f"{name}{KEY_SEPARATOR}bucket{KEY_SEPARATOR}{bucket_label(upper_bound)}"
+                )
+                break
+        self.inc(f"{name}{KEY_SEPARATOR}sum", value)
+        self.inc(f"{name}{KEY_SEPARATOR}count")
+
+    def describe(self) -> Dict[str, object]:
+        """Describe the backend for the monitoring endpoints."""
+        return {"backend": self.name}
+
+
+class InMemoryMetricsBackend(MetricsBackend):
+    """Process-local backend, suitable for a single worker."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+def _padded_length(key_length: int) -> int:
+    """Length of an encoded key padded so that the following double is 8-byte aligned."""
+    return key_length + (8 - (key_length + 4) % 8) % 8
+
+
+def _iter_entries(data, used: int) -> Iterator[Tuple[str, float, int]]:
+    """Yield ``(key, value, value_offset)`` for every entry in a metrics file."""
+    pos = 8
+    while pos < used:
+        key_length = struct.unpack_from("i", data, pos)[0]
+        pos += 4
+        key = bytes(data[pos : pos + key_length]).decode("utf-8")
+        pos += _padded_length(key_length)
+        value = struct.unpack_from("d", data, pos)[0]
+        yield key, value, pos
+        pos += 8
+
+
+def read_metrics_file(path: str) -> Dict[str, float]:
+    """Read every counter from a metrics file without locking it."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < 8:
+        return {}
+    used = struct.unpack_from("i", data, 0)[0]
+    return {key: value for key, value, _ in _iter_entries(data, used)}
+
+
+class MmapedValues:
+    """
+    Append-only ``key -> float64`` store backed by a memory-mapped file.
+
+    Layout: an 8-byte header holding the number of used bytes, followed by
+    entries of ``int32 key length, key bytes (padded), float64 value``.
+    The header is only advanced after an entry is fully written, so readers
+    in other processes always see complete entries.
+    """
+
+    INITIAL_SIZE = 1 << 16
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(self.INITIAL_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions: Dict[str, int] = {}
+
+        self._used = struct.unpack_from("i", self._map, 0)[0]
+        if self._used == 0:
+            self._used = 8
+            struct.pack_into("i", self._map, 0, self._used)
+        else:
+            for key, _, pos in _iter_entries(self._map, self._used):
+                self._positions[key] = pos
+
+    def inc(self, key: str, amount: float) -> None:
+        pos = self._positions.get(key)
+        if pos is None:
+            pos = self._append(key)
+        value = struct.unpack_from("d", self._map, pos)[0]
+        struct.pack_into("d", self._map, pos, value + amount)
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        for key, value, _ in _iter_entries(self._map, self._used):
+            yield key, value
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        padded = encoded.ljust(_padded_length(len(encoded)), b" ")
+        entry = struct.pack(f"i{len(padded)}sd", len(encoded), padded, 0.0)
+
+        while self._used + len(entry) > self._capacity:
+            self._capacity *= 2
+            self._map.close()
+            self._file.truncate(self._capacity)
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+
+        self._map[self._used : self._used + len(entry)] = entry
+        self._used += len(entry)
+        struct.pack_into("i", self._map, 0, self._used)
+
+        pos = self._used - 8
+        self._positions[key] = pos
+        return pos
+
+
+def _pid_is_alive(pid: int) -> bool:
+    """Check whether a process with ``pid`` still exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedMemoryMetricsBackend(MetricsBackend):
+    """
+    Multi-process backend built on one memory-mapped file per worker.
+
+    Each worker only ever writes its own ``metrics_<pid>.db`` file, so updates
+    need no cross-process lock. Reads sum every file in the directory. Files
+    of workers that are gone are folded into ``metrics_archive.db`` and
+    removed, so their counts survive worker restarts.
+    """
+
+    name = "shared_memory"
+    ARCHIVE_FILE = "metrics_archive.db"
+    LOCK_FILE = "metrics.lock"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._values = None
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._own_values().inc(key, amount)
+
+    def snapshot(self) -> Dict[str, float]:
+        self.cleanup_dead_workers()
+        totals: Dict[str, float] = {}
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.db")):
+            try:
+                values = read_metrics_file(path)
+            except (FileNotFoundError, struct.error, UnicodeDecodeError):
+                # The file was archived or is still being created by its worker
+                continue
+            for key, value in values.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def cleanup_dead_workers(self) -> int:
+        """Fold the files of dead workers into the archive and delete them."""
+        dead = [
+            (pid, path)
+            for pid, path in self._worker_files()
+            if pid != os.getpid() and not _pid_is_alive(pid)
+        ]
+        if not dead:
+            return 0
+
+        removed = 0
+        with open(os.path.join(self.directory, self.LOCK_FILE), "a") as lock_file:
+            # Archiving is rare and off the hot path, so a file lock is fine here
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                archive = MmapedValues(os.path.join(self.directory, self.ARCHIVE_FILE))
+                try:
+                    for pid, path in dead:
+                        if not os.path.exists(path):
+                            continue
+                        for key, value in read_metrics_file(path).items():
+                            archive.inc(key, value)
+                        os.remove(path)
+                        removed += 1
+                        logger.info(f"Archived metrics of dead worker {pid}")
+                finally:
+                    archive.close()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return removed
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            "backend": self.name,
+            "directory": self.directory,
+            "workers": sorted(pid for pid, _ in self._worker_files()),
+        }
+
+    def _own_values(self) -> MmapedValues:
+        pid = os.getpid()
+        if self._pid != pid:
+            # First use, or we are running in a freshly forked worker
+            self._pid = pid
+            self._values = MmapedValues(
+                os.path.join(self.directory, f"metrics_{pid}.db")
+            )
+        return self._values
+
+    def _worker_files(self):
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.db")):
+            suffix = os.path.basename(path)[len("metrics_") : -len(".db")]
+            if suffix.isdigit():
+                yield int(suffix), path
+
+
+def create_metrics_backend(multiproc_dir: str = None) -> MetricsBackend:
+    """Create the backend matching the deployment configuration."""
+    if multiproc_dir:
+        return SharedMemoryMetricsBackend(multiproc_dir)
+    return InMemoryMetricsBackend()
@@ -1,122 +1,228 @@
 """
 Middleware for request monitoring and logging.
+
+Both middlewares are plain ASGI callables rather than ``BaseHTTPMiddleware``
+subclasses: they wrap ``send`` to observe the response instead of running the
+app in a separate task, so they add almost no per-request overhead and
+stream responses through unbuffered.
 """
 
-import time
+import itertools
 import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+import os
+import time
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import capture
+from app.core.config import settings
 from app.core.monitoring import monitoring_service
+from app.core.startup import startup_stats
+from app.core.tracing import current_trace, tracer
+from app.db.instrumentation import (
+    current_request_stats,
+    finish_request_stats,
+    start_request_stats,
+)
 
 logger = logging.getLogger(__name__)
 
+MAX_REQUEST_ID_LENGTH = 128
+
+_MONITORED_HEADERS = frozenset(
+    (b"x-request-id", b"user-agent", b"x-forwarded-for", b"x-real-ip", b"traceparent")
+)
+
 
-class MonitoringMiddleware(BaseHTTPMiddleware):
+def _header_values(scope: Scope) -> dict:
+    """Collect the request headers monitoring needs in a single pass."""
+    wanted = {}
+    for name, value in scope.get("headers", ()):
+        if name in _MONITORED_HEADERS:
+            wanted[name] = value.decode("latin-1")
+    return wanted
+
+
+class MonitoringMiddleware:
     """Middleware for monitoring API requests and responses."""
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.logger = logging.getLogger(__name__)
+        # Request IDs are a per-instance random prefix plus a counter, which is
+        # much cheaper than a uuid4 per request and still unique across workers
+        self._request_id_prefix = f"{os.getpid():x}-{os.urandom(4).hex()}-"
+        self._request_counter = itertools.count(1)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and log monitoring information."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
 
         # Extract client information
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("user-agent", "")
+        headers = _header_values(scope)
+        client_ip = self._get_client_ip(scope, headers)
+        user_agent = headers.get(b"user-agent", "")
+        request_id = self._get_request_id(headers)
+        status_code = 500
+
+        trace_token = tracer.start_trace(
+            f"{scope['method']} {scope['path']}", headers.get(b"traceparent")
+        )
+        trace = current_trace()
+        stats_token = start_request_stats(
+            {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "request_id": request_id,
+            }
+        )
+        query_stats = current_request_stats()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                execution_time = (time.perf_counter_ns() - start_time) / 1e6
+
+                # Add custom headers for monitoring
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("X-Execution-Time", f"{execution_time:.2f}ms")
+                response_headers.append("X-Request-ID", request_id)
+                if trace is not None:
+                    response_headers.append("Server-Timing", trace.server_timing())
+                if settings.DEBUG:
+                    response_headers.append("X-DB-Query-Count", str(query_stats.count))
+                    response_headers.append(
+                        "X-DB-Time", f"{query_stats.total_ms:.2f}ms"
+                    )
+                    response_headers.append(
+                        "X-DB-Slowest-Query", f"{query_stats.slowest_ms:.2f}ms"
+                    )
+            await send(message)
 
         try:
             # Process the request
-            response = await call_next(request)
-
-            # Calculate execution time
-            execution_time = (
-                time.time() - start_time
-            ) * 1000  # Convert to milliseconds
-
-            # Log the API request
-            monitoring_service.log_api_request(
-                method=request.method,
-                path=str(request.url.path),
-                status_code=response.status_code,
-                execution_time_ms=execution_time,
-                user_agent=user_agent,
-                client_ip=client_ip,
-            )
-
-            # Add custom headers for monitoring
-            response.headers["X-Execution-Time"] = f"{execution_time:.2f}ms"
-            response.headers["X-Request-ID"] = self._generate_request_id()
-
-            return response
-
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Calculate execution time for failed requests
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter_ns() - start_time) / 1e6
 
             # Log the error
             monitoring_service.log_error(
                 error=e,
                 context={
-                    "method": request.method,
-                    "path": str(request.url.path),
+                    "method": scope["method"],
+                    "path": scope["path"],
                     "client_ip": client_ip,
                     "user_agent": user_agent,
                     "execution_time_ms": execution_time,
+                    "request_id": request_id,
                 },
             )
 
             # Re-raise the exception
             raise
+        finally:
+            if trace is not None:
+                trace.attributes.update(
+                    {
+                        "http.method": scope["method"],
+                        "http.target": scope["path"],
+                        "http.status_code": status_code,
+                        "http.request_id": request_id,
+                    }
+                )
+            tracer.end_trace(trace_token)
+            finish_request_stats(stats_token, scope["method"], scope["path"])
+
+        # Log the API request once the whole body has been sent
+        monitoring_service.log_api_request(
+            method=scope["method"],
+            path=scope["path"],
+            status_code=status_code,
+            execution_time_ms=(time.perf_counter_ns() - start_time) / 1e6,
+            user_agent=user_agent,
+            client_ip=client_ip,
+        )
+        if capture.traffic_capture is not None:
+            capture.traffic_capture.record(
+                scope["method"],
+                scope["path"],
+                scope.get("query_string", b""),
+                status_code,
+                (time.perf_counter_ns() - start_time) / 1e6,
+            )
+        if not startup_stats.served and scope["path"] not in capture.EXCLUDED_PATHS:
+            startup_stats.record_first_request(scope["method"], scope["path"])
 
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope, headers: dict) -> str:
         """Extract the real client IP address."""
         # Check for forwarded headers (common in proxy setups)
-        forwarded_for = request.headers.get("x-forwarded-for")
+        forwarded_for = headers.get(b"x-forwarded-for")
         if forwarded_for:
             return forwarded_for.split(",")[0].strip()
 
-        real_ip = request.headers.get("x-real-ip")
+        real_ip = headers.get(b"x-real-ip")
         if real_ip:
             return real_ip
 
         # Fallback to the direct client IP
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _get_request_id(self, headers: dict) -> str:
+        """Propagate a well-formed inbound request ID or generate a new one."""
+        inbound = headers.get(b"x-request-id")
+        if (
+            inbound
+            and len(inbound) <= MAX_REQUEST_ID_LENGTH
+            and inbound.isascii()
+            and inbound.isprintable()
+        ):
+            return inbound
+        return self._generate_request_id()
 
     def _generate_request_id(self) -> str:
         """Generate a unique request ID."""
-        import uuid
+        return f"{self._request_id_prefix}{next(self._request_counter):x}"
 
-        return str(uuid.uuid4())
 
-
-class RequestTimingMiddleware(BaseHTTPMiddleware):
+class RequestTimingMiddleware:
     """Simple middleware for timing requests."""
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.logger = logging.getLogger(__name__)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add timing information to requests."""
-        start_time = time.time()
-
-        response = await call_next(request)
-
-        execution_time = (time.time() - start_time) * 1000
-
-        # Log slow requests (over 1 second)
-        if execution_time > 1000:
-            self.logger.warning(
-                f"Slow request detected: {request.method} {request.url.path} "
-                f"took {execution_time:.2f}ms"
-            )
-
-        # Add timing header
-        response.headers["X-Request-Time"] = f"{execution_time:.2f}ms"
-
-        return response
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                execution_time = (time.perf_counter_ns() - start_time) / 1e6
+
+                # Log slow requests (over 1 second)
+                if execution_time > 1000:
+                    self.logger.warning(
+                        f"Slow request detected: {scope['method']} {scope['path']} "
+                        f"took {execution_time:.2f}ms"
+                    )
+
+                # Add timing header
+                MutableHeaders(scope=message).append(
+                    "X-Request-Time", f"{execution_time:.2f}ms"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -2,13 +2,23 @@
 Monitoring and logging utilities for tracking search and sort events.
 """
 
+import json
 import logging
 import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
-from .timezone import now
+from .config import settings
+from .events import EventSink
+from .sampling import LogSampler
+from .metrics_store import (
+    LATENCY_BUCKETS_MS,
+    MetricsBackend,
+    bucket_label,
+    create_metrics_backend,
+)
+from .timezone import get_current_timezone, now
 
 logger = logging.getLogger(__name__)
 
@@ -67,103 +77,246 @@ class SortEvent:
             self.timestamp = now().isoformat()
 
 
+# Field order of the compact event tuples, after ``(event_type, timestamp)``
+EVENT_FIELDS = {
+    EventType.SEARCH.value: (
+        "endpoint",
+        "resource_type",
+        "search_params",
+        "results_count",
+        "total_count",
+        "page",
+        "size",
+        "execution_time_ms",
+        "user_agent",
+        "client_ip",
+    ),
+    EventType.SORT.value: (
+        "endpoint",
+        "resource_type",
+        "sort_field",
+        "sort_order",
+        "results_count",
+        "total_count",
+        "page",
+        "size",
+        "execution_time_ms",
+        "user_agent",
+        "client_ip",
+    ),
+    EventType.API_REQUEST.value: (
+        "method",
+        "path",
+        "status_code",
+        "execution_time_ms",
+        "user_agent",
+        "client_ip",
+    ),
+}
+
+EVENT_MESSAGES = {
+    EventType.SEARCH.value: "Search event",
+    EventType.SORT.value: "Sort event",
+    EventType.API_REQUEST.value: "API request",
+}
+
+
+def serialize_event(event: tuple) -> Dict[str, Any]:
+    """Expand a compact event tuple into its structured log payload."""
+    event_type, timestamp = event[0], event[1]
+    if isinstance(timestamp, float):
+        timestamp = datetime.fromtimestamp(
+            timestamp, get_current_timezone()
+        ).isoformat()
+    data = {"event_type": event_type, "timestamp": timestamp}
+    data.update(zip(EVENT_FIELDS[event_type], event[2:]))
+    return data
+
+
 class MonitoringService:
     """Service for monitoring and logging application events."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[MetricsBackend] = None,
+        event_log_file: Optional[str] = None,
+        sampler: Optional[LogSampler] = None,
+    ):
         self.logger = logging.getLogger(__name__)
-        self._search_metrics = {
-            "total_searches": 0,
-            "searches_by_resource": {"people": 0, "planets": 0},
-            "popular_search_terms": {},
-            "average_execution_time": 0.0,
-        }
-        self._sort_metrics = {
-            "total_sorts": 0,
-            "sorts_by_resource": {"people": 0, "planets": 0},
-            "popular_sort_fields": {},
-            "sort_order_distribution": {"asc": 0, "desc": 0},
-            "average_execution_time": 0.0,
-        }
-
-    def log_search_event(self, event: SearchEvent):
-        """Log a search event with structured data."""
+        self.backend = backend or create_metrics_backend(settings.METRICS_MULTIPROC_DIR)
+        self.event_log_file = event_log_file
+        self.sampler = sampler or LogSampler()
+        self.event_sink = EventSink(
+            "monitoring",
+            self._write_events,
+            capacity=settings.EVENT_SINK_CAPACITY,
+            batch_size=settings.EVENT_SINK_BATCH_SIZE,
+            flush_interval=settings.EVENT_SINK_FLUSH_INTERVAL,
+            on_drop=lambda: self.backend.inc("events|dropped"),
+        )
+
+    def record_search(
+        self,
+        resource_type: str,
+        search_params: Dict[str, str],
+        results_count: int = None,
+        total_count: int = None,
+        page: int = None,
+        size: int = None,
+        execution_time_ms: float = None,
+        endpoint: str = None,
+        user_agent: str = None,
+        client_ip: str = None,
+        timestamp: Any = None,
+    ):
+        """Update search metrics and enqueue the event for logging."""
         try:
             # Update metrics
-            self._search_metrics["total_searches"] += 1
-            if event.resource_type:
-                self._search_metrics["searches_by_resource"][event.resource_type] += 1
+            self.backend.inc("search|total")
+            if resource_type:
+                self.backend.inc(f"search|by_resource|{resource_type}")
 
             # Track popular search terms
-            if event.search_params:
-                for field, value in event.search_params.items():
-                    term_key = f"{field}:{value.lower()}"
-                    self._search_metrics["popular_search_terms"][term_key] = (
-                        self._search_metrics["popular_search_terms"].get(term_key, 0)
-                        + 1
-                    )
-
-            # Update average execution time
-            if event.execution_time_ms:
-                current_avg = self._search_metrics["average_execution_time"]
-                total_searches = self._search_metrics["total_searches"]
-                self._search_metrics["average_execution_time"] = (
-                    current_avg * (total_searches - 1) + event.execution_time_ms
-                ) / total_searches
-
-            # Log the event
-            self.logger.info(
-                "Search event",
-                extra={
-                    "event_type": "search",
-                    "event_data": asdict(event),
-                    "metrics": self._search_metrics,
-                },
+            if search_params:
+                for field, value in search_params.items():
+                    self.backend.inc(f"search|term|{field}:{value.lower()}")
+                    # Per-column usage and latency, read by the index advisor
+                    if resource_type:
+                        column = f"{resource_type}:{field}"
+                        self.backend.inc(f"search|column|{column}")
+                        self.backend.inc(
+                            f"search|column_ms|{column}", execution_time_ms or 0.0
+                        )
+
+            # Track execution time
+            if execution_time_ms:
+                self.backend.observe("search|latency_ms", execution_time_ms)
+
+            if not self._sampled(
+                EventType.SEARCH.value, endpoint, execution_time_ms=execution_time_ms
+            ):
+                return
+
+            # Hand the event to the background sink
+            self.event_sink.emit(
+                (
+                    EventType.SEARCH.value,
+                    timestamp or time.time(),
+                    endpoint,
+                    resource_type,
+                    search_params,
+                    results_count,
+                    total_count,
+                    page,
+                    size,
+                    execution_time_ms,
+                    user_agent,
+                    client_ip,
+                )
             )
 
         except Exception as e:
             self.logger.error(f"Error logging search event: {e}")
 
-    def log_sort_event(self, event: SortEvent):
-        """Log a sort event with structured data."""
+    def record_sort(
+        self,
+        resource_type: str,
+        sort_field: str,
+        sort_order: str,
+        results_count: int = None,
+        total_count: int = None,
+        page: int = None,
+        size: int = None,
+        execution_time_ms: float = None,
+        endpoint: str = None,
+        user_agent: str = None,
+        client_ip: str = None,
+        timestamp: Any = None,
+    ):
+        """Update sort metrics and enqueue the event for logging."""
         try:
             # Update metrics
-            self._sort_metrics["total_sorts"] += 1
-            if event.resource_type:
-                self._sort_metrics["sorts_by_resource"][event.resource_type] += 1
+            self.backend.inc("sort|total")
+            if resource_type:
+                self.backend.inc(f"sort|by_resource|{resource_type}")
 
             # Track popular sort fields
-            if event.sort_field:
-                self._sort_metrics["popular_sort_fields"][event.sort_field] = (
-                    self._sort_metrics["popular_sort_fields"].get(event.sort_field, 0)
-                    + 1
-                )
+            if sort_field:
+                self.backend.inc(f"sort|field|{sort_field}")
+                # Per-key usage and latency, read by the index advisor
+                if resource_type:
+                    key = f"{resource_type}:{sort_field}"
+                    self.backend.inc(f"sort|column|{key}")
+                    self.backend.inc(f"sort|column_ms|{key}", execution_time_ms or 0.0)
 
             # Track sort order distribution
-            if event.sort_order:
-                self._sort_metrics["sort_order_distribution"][event.sort_order] += 1
-
-            # Update average execution time
-            if event.execution_time_ms:
-                current_avg = self._sort_metrics["average_execution_time"]
-                total_sorts = self._sort_metrics["total_sorts"]
-                self._sort_metrics["average_execution_time"] = (
-                    current_avg * (total_sorts - 1) + event.execution_time_ms
-                ) / total_sorts
-
-            # Log the event
-            self.logger.info(
-                "Sort event",
-                extra={
-                    "event_type": "sort",
-                    "event_data": asdict(event),
-                    "metrics": self._sort_metrics,
-                },
+            if sort_order:
+                self.backend.inc(f"sort|order|{sort_order}")
+
+            # Track execution time
+            if execution_time_ms:
+                self.backend.observe("sort|latency_ms", execution_time_ms)
+
+            if not self._sampled(
+                EventType.SORT.value, endpoint, execution_time_ms=execution_time_ms
+            ):
+                return
+
+            # Hand the event to the background sink
+            self.event_sink.emit(
+                (
+                    EventType.SORT.value,
+                    timestamp or time.time(),
+                    endpoint,
+                    resource_type,
+                    sort_field,
+                    sort_order,
+                    results_count,
+                    total_count,
+                    page,
+                    size,
+                    execution_time_ms,
+                    user_agent,
+                    client_ip,
+                )
             )
 
         except Exception as e:
             self.logger.error(f"Error logging sort event: {e}")
 
+    def log_search_event(self, event: SearchEvent):
+        """Log a search event with structured data."""
+        self.record_search(
+            resource_type=event.resource_type,
+            search_params=event.search_params,
+            results_count=event.results_count,
+            total_count=event.total_count,
+            page=event.page,
+            size=event.size,
+            execution_time_ms=event.execution_time_ms,
+            endpoint=event.endpoint,
+            user_agent=event.user_agent,
+            client_ip=event.client_ip,
+            timestamp=event.timestamp,
+        )
+
+    def log_sort_event(self, event: SortEvent):
+        """Log a sort event with structured data."""
+        self.record_sort(
+            resource_type=event.resource_type,
+            sort_field=event.sort_field,
+            sort_order=event.sort_order,
+            results_count=event.results_count,
+            total_count=event.total_count,
+            page=event.page,
+            size=event.size,
+            execution_time_ms=event.execution_time_ms,
+            endpoint=event.endpoint,
+            user_agent=event.user_agent,
+            client_ip=event.client_ip,
+            timestamp=event.timestamp,
+        )
+
     def log_api_request(
         self,
         method: str,
@@ -175,28 +328,46 @@ class MonitoringService:
     ):
         """Log API request events."""
         try:
-            event_data = {
-                "event_type": EventType.API_REQUEST.value,
-                "timestamp": now().isoformat(),
-                "method": method,
-                "path": path,
-                "status_code": status_code,
-                "execution_time_ms": execution_time_ms,
-                "user_agent": user_agent,
-                "client_ip": client_ip,
-            }
-
-            self.logger.info(
-                "API request",
-                extra={"event_type": "api_request", "event_data": event_data},
+            self.backend.inc("request|total")
+            self.backend.inc(f"request|status|{status_code // 100}xx")
+            self.backend.observe("request|latency_ms", execution_time_ms)
+
+            if not self._sampled(
+                EventType.API_REQUEST.value, path, status_code, execution_time_ms
+            ):
+                return
+
+            self.event_sink.emit(
+                (
+                    EventType.API_REQUEST.value,
+                    time.time(),
+                    method,
+                    path,
+                    status_code,
+                    execution_time_ms,
+                    user_agent,
+                    client_ip,
+                )
             )
 
         except Exception as e:
             self.logger.error(f"Error logging API request: {e}")
 
+    def record_db_request(self, query_count: int, db_time_ms: float):
+        """Update the per-request SQL query metrics."""
+        try:
+            self.backend.inc("db|requests")
+            self.backend.inc("db|queries", query_count)
+            self.backend.observe("db|time_ms", db_time_ms)
+        except Exception as e:
+            self.logger.error(f"Error recording query metrics: {e}")
+
     def log_error(self, error: Exception, context: Dict[str, Any] = None):
         """Log error events."""
         try:
+            self.backend.inc("error|total")
+            self.backend.inc(f"error|type|{type(error).__name__}")
+
             event_data = {
                 "event_type": EventType.ERROR.value,
                 "timestamp": now().isoformat(),
@@ -214,25 +385,218 @@ class MonitoringService:
         except Exception as e:
             self.logger.error(f"Error logging error event: {e}")
 
+    def start(self):
+        """Start the background event sink."""
+        self.event_sink.start()
+
+    def shutdown(self):
+        """Flush buffered events and stop the background event sink."""
+        self.event_sink.stop()
+
     def get_search_metrics(self) -> Dict[str, Any]:
         """Get current search metrics."""
-        return self._search_metrics.copy()
+        return self._build_search_metrics(self.backend.snapshot())
 
     def get_sort_metrics(self) -> Dict[str, Any]:
         """Get current sort metrics."""
-        return self._sort_metrics.copy()
+        return self._build_sort_metrics(self.backend.snapshot())
+
+    def get_request_metrics(self) -> Dict[str, Any]:
+        """Get current API request metrics."""
+        return self._build_request_metrics(self.backend.snapshot())
+
+    def get_db_metrics(self) -> Dict[str, Any]:
+        """Get current SQL query metrics."""
+        return self._build_db_metrics(self.backend.snapshot())
 
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all monitoring metrics."""
+        values = self.backend.snapshot()
         return {
-            "search_metrics": self.get_search_metrics(),
-            "sort_metrics": self.get_sort_metrics(),
+            "search_metrics": self._build_search_metrics(values),
+            "sort_metrics": self._build_sort_metrics(values),
+            "request_metrics": self._build_request_metrics(values),
+            "db_metrics": self._build_db_metrics(values),
+            "backend": self.backend.describe(),
+            "event_sink": self.get_event_sink_stats(values),
+            "sampling": self.get_sampling_stats(values),
             "timestamp": now().isoformat(),
         }
 
+    def get_column_usage(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Sort and search usage per ``resource:column`` with average latency.
+
+        Multi-key sorts are reported under their joined columns, e.g.
+        ``people:gender,mass``.
+        """
+        values = self.backend.snapshot()
+        usage = {}
+        for kind in ("sort", "search"):
+            counts = _group(values, f"{kind}|column|")
+            durations = _group_float(values, f"{kind}|column_ms|")
+            usage[kind] = {
+                key: {
+                    "count": count,
+                    "avg_ms": round(durations.get(key, 0.0) / count, 3),
+                }
+                for key, count in counts.items()
+                if count
+            }
+        return usage
+
+    def get_sampling_stats(self, values: Dict[str, float] = None) -> Dict[str, Any]:
+        """Get the effective log sampling rates and skipped line counts."""
+        if values is None:
+            values = self.backend.snapshot()
+        stats = self.sampler.describe()
+        stats["effective_rates"] = {
+            event_type: self.sampler.rate_for(event_type) for event_type in EVENT_FIELDS
+        }
+        stats["skipped"] = _group(values, "sampling|skipped|")
+        return stats
+
+    def get_event_sink_stats(self, values: Dict[str, float] = None) -> Dict[str, Any]:
+        """Get event sink counters, with drops summed across workers."""
+        if values is None:
+            values = self.backend.snapshot()
+        stats = self.event_sink.stats()
+        stats["dropped_all_workers"] = int(values.get("events|dropped", 0))
+        return stats
+
+    def _sampled(
+        self,
+        event_type: str,
+        path: Optional[str] = None,
+        status_code: Optional[int] = None,
+        execution_time_ms: Optional[float] = None,
+    ) -> bool:
+        """Apply log sampling, counting the lines that are skipped."""
+        if self.sampler.should_log(event_type, path, status_code, execution_time_ms):
+            return True
+        self.backend.inc(f"sampling|skipped|{event_type}")
+        return False
+
+    def _write_events(self, batch: List[tuple]):
+        """Serialize a batch of events and write it out (runs in the sink thread)."""
+        if self.event_log_file:
+            lines = [json.dumps(serialize_event(event), default=str) for event in batch]
+            with open(self.event_log_file, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            return
+
+        for event in batch:
+            self.logger.info(
+                EVENT_MESSAGES[event[0]],
+                extra={"event_type": event[0], "event_data": serialize_event(event)},
+            )
+
+    def _build_search_metrics(self, values: Dict[str, float]) -> Dict[str, Any]:
+        """Assemble search metrics from raw counter values."""
+        total = int(values.get("search|total", 0))
+        return {
+            "total_searches": total,
+            "searches_by_resource": {
+                "people": 0,
+                "planets": 0,
+                **_group(values, "search|by_resource|"),
+            },
+            "popular_search_terms": _group(values, "search|term|"),
+            "average_execution_time": _average(values, "search|latency_ms", total),
+            "latency_buckets_ms": _histogram(values, "search|latency_ms"),
+        }
+
+    def _build_sort_metrics(self, values: Dict[str, float]) -> Dict[str, Any]:
+        """Assemble sort metrics from raw counter values."""
+        total = int(values.get("sort|total", 0))
+        return {
+            "total_sorts": total,
+            "sorts_by_resource": {
+                "people": 0,
+                "planets": 0,
+                **_group(values, "sort|by_resource|"),
+            },
+            "popular_sort_fields": _group(values, "sort|field|"),
+            "sort_order_distribution": {
+                "asc": 0,
+                "desc": 0,
+                **_group(values, "sort|order|"),
+            },
+            "average_execution_time": _average(values, "sort|latency_ms", total),
+            "latency_buckets_ms": _histogram(values, "sort|latency_ms"),
+        }
+
+    def _build_request_metrics(self, values: Dict[str, float]) -> Dict[str, Any]:
+        """Assemble API request metrics from raw counter values."""
+        total = int(values.get("request|total", 0))
+        return {
+            "total_requests": total,
+            "requests_by_status": _group(values, "request|status|"),
+            "total_errors": int(values.get("error|total", 0)),
+            "average_execution_time": _average(values, "request|latency_ms", total),
+            "latency_buckets_ms": _histogram(values, "request|latency_ms"),
+        }
+
+    def _build_db_metrics(self, values: Dict[str, float]) -> Dict[str, Any]:
+        """Assemble SQL query metrics from raw counter values."""
+        requests = int(values.get("db|requests", 0))
+        queries = int(values.get("db|queries", 0))
+        return {
+            "total_requests": requests,
+            "total_queries": queries,
+            "average_queries_per_request": queries / requests if requests else 0.0,
+            "average_db_time_ms": _average(values, "db|time_ms", requests),
+            "db_time_buckets_ms": _histogram(values, "db|time_ms"),
+            "slow_queries": int(values.get("db|slow_queries", 0)),
+            "n_plus_one_detections": int(values.get("db|n_plus_one", 0)),
+        }
+
+
+def _group(values: Dict[str, float], prefix: str) -> Dict[str, int]:
+    """Collect the counters under ``prefix`` keyed by the rest of their name."""
+    return {
+        key[len(prefix) :]: int(value)
+        for key, value in values.items()
+        if key.startswith(prefix)
+    }
+
+
+def _group_float(values: Dict[str, float], prefix: str) -> Dict[str, float]:
+    """Like ``_group`` but keeps fractional values such as latency sums."""
+    return {
+        key[len(prefix) :]: value
+        for key, value in values.items()
+        if key.startswith(prefix)
+    }
+
+
+def _average(values: Dict[str, float], histogram: str, total: int) -> float:
+    """Average of a latency histogram over ``total`` events."""
+    if not total:
+        return 0.0
+    return values.get(f"{histogram}|sum", 0.0) / total
+
+
+def _histogram(values: Dict[str, float], histogram: str) -> Dict[str, int]:
+    """Per-bucket counts of a latency histogram, in bucket order."""
+    buckets = _group(values, f"{histogram}|bucket|")
+    return {
+        bucket_label(bound): buckets.get(bucket_label(bound), 0)
+        for bound in LATENCY_BUCKETS_MS
+    }
+
 
 # Global monitoring service instance
-monitoring_service = MonitoringService()
+monitoring_service = MonitoringService(
+    event_log_file=settings.EVENT_LOG_FILE,
+    sampler=LogSampler(
+        default_rate=settings.LOG_SAMPLE_RATE,
+        event_rates=settings.LOG_SAMPLE_EVENT_RATES,
+        route_rates=settings.LOG_SAMPLE_ROUTE_RATES,
+        slow_threshold_ms=settings.LOG_SAMPLE_SLOW_MS,
+        keep_status=settings.LOG_SAMPLE_KEEP_STATUS,
+    ),
+)
 
 
 def log_search_operation(
@@ -248,8 +612,7 @@ def log_search_operation(
     client_ip: str = None,
 ):
     """Convenience function to log search operations."""
-    event = SearchEvent(
-        endpoint=endpoint,
+    monitoring_service.record_search(
         resource_type=resource_type,
         search_params=search_params,
         results_count=results_count,
@@ -257,10 +620,10 @@ def log_search_operation(
         page=page,
         size=size,
         execution_time_ms=execution_time_ms,
+        endpoint=endpoint,
         user_agent=user_agent,
         client_ip=client_ip,
     )
-    monitoring_service.log_search_event(event)
 
 
 def log_sort_operation(
@@ -277,8 +640,7 @@ def log_sort_operation(
     client_ip: str = None,
 ):
     """Convenience function to log sort operations."""
-    event = SortEvent(
-        endpoint=endpoint,
+    monitoring_service.record_sort(
         resource_type=resource_type,
         sort_field=sort_field,
         sort_order=sort_order,
@@ -287,7 +649,7 @@ def log_sort_operation(
         page=page,
         size=size,
         execution_time_ms=execution_time_ms,
+        endpoint=endpoint,
         user_agent=user_agent,
         client_ip=client_ip,
     )
-    monitoring_service.log_sort_event(event)
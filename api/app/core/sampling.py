@@ -0,0 +1,85 @@
+"""
+Sampling of per-event monitoring log lines.
+
+Only the emitted log lines are sampled; metric counters are always updated
+before the sampling decision, so aggregates stay exact.
+"""
+
+import random
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+class LogSampler:
+    """Decides which monitoring events are written to the log."""
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        event_rates: Optional[Dict[str, float]] = None,
+        route_rates: Optional[Dict[str, float]] = None,
+        slow_threshold_ms: float = 1000.0,
+        keep_status: int = 500,
+    ):
+        self.default_rate = _clamp(default_rate)
+        self.event_rates = {k: _clamp(v) for k, v in (event_rates or {}).items()}
+        self.route_rates = {k: _clamp(v) for k, v in (route_rates or {}).items()}
+        self.slow_threshold_ms = slow_threshold_ms
+        self.keep_status = keep_status
+        # Longest prefix first, so the most specific route override wins
+        self._route_prefixes = sorted(self.route_rates, key=len, reverse=True)
+        self._route_rate = lru_cache(maxsize=1024)(self._match_route)
+
+    def rate_for(self, event_type: str, path: Optional[str] = None) -> float:
+        """Effective sampling rate for an event type on a route."""
+        if path:
+            route_rate = self._route_rate(path)
+            if route_rate is not None:
+                return route_rate
+        return self.event_rates.get(event_type, self.default_rate)
+
+    def should_log(
+        self,
+        event_type: str,
+        path: Optional[str] = None,
+        status_code: Optional[int] = None,
+        execution_time_ms: Optional[float] = None,
+    ) -> bool:
+        """Return whether this event's log line should be emitted."""
+        # Errors and slow operations are always kept
+        if status_code is not None and status_code >= self.keep_status:
+            return True
+        if (
+            execution_time_ms is not None
+            and execution_time_ms >= self.slow_threshold_ms
+        ):
+            return True
+
+        rate = self.rate_for(event_type, path)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        return random.random() < rate
+
+    def describe(self) -> Dict[str, Any]:
+        """Describe the effective sampling configuration."""
+        return {
+            "default_rate": self.default_rate,
+            "event_rates": dict(self.event_rates),
+            "route_rates": dict(self.route_rates),
+            "always_keep": {
+                "status_code_gte": self.keep_status,
+                "execution_time_ms_gte": self.slow_threshold_ms,
+            },
+        }
+
+    def _match_route(self, path: str) -> Optional[float]:
+        for prefix in self._route_prefixes:
+            if path.startswith(prefix):
+                return self.route_rates[prefix]
+        return None
+
+
+def _clamp(rate: float) -> float:
+    return min(max(float(rate), 0.0), 1.0)
@@ -1,15 +1,23 @@
 """
 Security utilities for authentication and authorization.
+
+``jose`` and ``passlib`` are imported on first use, so importing this module
+costs nothing on the request path that does not need them.
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Union, Optional
-from jose import jwt
-from passlib.context import CryptContext
 from app.core.config import settings
 from app.core.timezone import now
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """The bcrypt password context, created on first use."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_access_token(
@@ -23,6 +31,8 @@ def create_access_token(
     else:
         expire = now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"exp": expire, "sub": str(subject)}
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
 
@@ -31,11 +41,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password.
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
@@ -0,0 +1,145 @@
+"""
+Startup timing and warm-up.
+
+``startup_stats`` times the startup phases of a worker: importing the
+application, database initialization and warm-up, and the time until the
+first request has been served. Times are measured from the start of the
+process where ``/proc`` tells it, else from the import of ``app.main``.
+They are logged and served at ``/api/monitoring/startup``.
+
+``warm_up`` opens pool connections and runs the list queries and response
+schemas once before the worker reports ready, so the first user request does
+not pay for connection setup, statement compilation and validator warm-up.
+
+This module only uses the standard library at import time: ``app.main``
+imports it first so the import phase covers the rest of the application.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process started, if the platform reports it."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name, which may contain spaces
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupStats:
+    """Durations of the startup phases, in milliseconds."""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        age = process_age()
+        if age is not None:
+            # Move the origin back to the start of the process
+            self._origin -= age
+        self.process_start_known = age is not None
+        self._mark = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_ms: Optional[float] = None
+        self.first_request_ms: Optional[float] = None
+        self.first_request: Optional[str] = None
+        self.served = False
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        """Time since the start of the process."""
+        return (time.perf_counter() - self._origin) * 1000
+
+    def mark(self, phase: str) -> float:
+        """Record the time since the previous mark as ``phase``."""
+        current = time.perf_counter()
+        duration = (current - self._mark) * 1000
+        self._mark = current
+        self.phases[phase] = round(duration, 3)
+        return duration
+
+    def record_ready(self) -> None:
+        """Record that startup finished and the worker accepts requests."""
+        self.ready_ms = round(self.elapsed_ms(), 3)
+        logger.info(f"Ready {self.ready_ms:.1f}ms after start, phases: {self.phases}")
+
+    def record_first_request(self, method: str, path: str) -> None:
+        """Record the time to first request once, when it has been served."""
+        with self._lock:
+            if self.served:
+                return
+            self.served = True
+            self.first_request_ms = round(self.elapsed_ms(), 3)
+            self.first_request = f"{method} {path}"
+        logger.info(
+            f"Time to first request: {self.first_request_ms:.1f}ms ({self.first_request})"
+        )
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "measured_from": "process" if self.process_start_known else "import",
+            "phases_ms": dict(self.phases),
+            "ready_ms": self.ready_ms,
+            "time_to_first_request_ms": self.first_request_ms,
+            "first_request": self.first_request,
+        }
+
+
+startup_stats = StartupStats()
+
+
+def warm_pool(engine, connections: int) -> int:
+    """Open ``connections`` pool connections at once and return them to the pool."""
+    from sqlalchemy import text
+
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def warm_up(session_factory, connections: int = 2) -> Dict[str, Any]:
+    """
+    Warm the pool, the list queries and the response schemas.
+
+    Runs the unfiltered list query of each resource and validates and
+    serializes the result through its response schema.
+    """
+    from app.api import crud, schemas
+    from app.db.models import People, Planets
+
+    resources = (
+        (People, schemas.PaginatedResponse[schemas.People], schemas.People),
+        (Planets, schemas.PaginatedResponse[schemas.Planets], schemas.Planets),
+    )
+    with session_factory() as db:
+        pooled = warm_pool(db.get_bind(), connections) if connections else 0
+        for model, page_schema, item_schema in resources:
+            items, total = crud.CRUDBase(model).get_multi_paginated_with_search(
+                db, skip=0, limit=1
+            )
+            page_schema(
+                items=[item_schema.model_validate(item) for item in items],
+                total=total,
+                page=1,
+                size=1,
+                pages=1,
+                has_next=total > 1,
+                has_prev=False,
+            ).model_dump_json()
+    return {"connections": pooled}
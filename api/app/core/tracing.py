@@ -0,0 +1,312 @@
+"""
+Lightweight request tracing.
+
+Spans are recorded into a per-request ``Trace`` held in a context variable,
+so code anywhere below the middleware can time a phase with ``span(name)``.
+Finished traces are summarised in a ``Server-Timing`` response header and can
+be exported in the OpenTelemetry OTLP/JSON format to a file or a collector.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.events import EventSink
+
+logger = logging.getLogger(__name__)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar(
+    "current_trace", default=None
+)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+
+class Trace:
+    """Spans recorded while serving a single request."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "parent_span_id",
+        "start_ns",
+        "wall_start_ns",
+        "spans",
+        "attributes",
+        "endpoint_end_ns",
+        "_stack",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: Optional[str] = None,
+        parent_span_id: Optional[str] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent_span_id = parent_span_id
+        self.start_ns = time.perf_counter_ns()
+        self.wall_start_ns = time.time_ns()
+        # Each span is [name, start_ns, end_ns, parent_index]
+        self.spans: List[list] = [[name, self.start_ns, None, None]]
+        self.attributes: Dict[str, Any] = {}
+        self.endpoint_end_ns: Optional[int] = None
+        self._stack = [0]
+
+    def start_span(self, name: str) -> int:
+        """Open a child span of the innermost open span, returning its index."""
+        self.spans.append([name, time.perf_counter_ns(), None, self._stack[-1]])
+        index = len(self.spans) - 1
+        self._stack.append(index)
+        return index
+
+    def end_span(self, index: int) -> None:
+        """Close the span opened as ``index``."""
+        self.spans[index][2] = time.perf_counter_ns()
+        if self._stack[-1] == index:
+            self._stack.pop()
+
+    def add_span(self, name: str, start_ns: int, end_ns: int) -> None:
+        """Record an already measured span under the innermost open span."""
+        self.spans.append([name, start_ns, end_ns, self._stack[-1]])
+
+    def finish(self) -> None:
+        """Close the root span."""
+        self.spans[0][2] = time.perf_counter_ns()
+
+    def server_timing(self) -> str:
+        """Render the spans as a ``Server-Timing`` header value."""
+        now = time.perf_counter_ns()
+        totals: Dict[str, float] = {}
+        for name, start, end, parent in self.spans[1:]:
+            totals[name] = totals.get(name, 0) + ((end or now) - start)
+        metrics = [f"total;dur={(now - self.start_ns) / 1e6:.2f}"]
+        metrics.extend(
+            f"{name};dur={total / 1e6:.2f}" for name, total in totals.items()
+        )
+        return ", ".join(metrics)
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the request being served, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block as a span of the current request trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    index = trace.start_span(name)
+    try:
+        yield
+    finally:
+        trace.end_span(index)
+
+
+def _parse_traceparent(value: Optional[str]):
+    """Extract trace and parent span IDs from a W3C ``traceparent`` header."""
+    if not value:
+        return None, None
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    return parts[1], parts[2]
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(traces: List[Trace], service_name: str) -> Dict[str, Any]:
+    """Convert finished traces to an OTLP/JSON ``ExportTraceServiceRequest``."""
+    otlp_spans = []
+    for trace in traces:
+        trace_id = trace.trace_id or os.urandom(16).hex()
+        span_ids = [os.urandom(8).hex() for _ in trace.spans]
+        for index, (name, start, end, parent) in enumerate(trace.spans):
+            otlp_span = {
+                "traceId": trace_id,
+                "spanId": span_ids[index],
+                "name": name,
+                "kind": SPAN_KIND_SERVER if index == 0 else SPAN_KIND_INTERNAL,
+                "startTimeUnixNano": str(trace.wall_start_ns + start - trace.start_ns),
+                "endTimeUnixNano": str(
+                    trace.wall_start_ns + (end or start) - trace.start_ns
+                ),
+            }
+            if parent is not None:
+                otlp_span["parentSpanId"] = span_ids[parent]
+            elif trace.parent_span_id:
+                otlp_span["parentSpanId"] = trace.parent_span_id
+            if index == 0 and trace.attributes:
+                otlp_span["attributes"] = [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in trace.attributes.items()
+                ]
+            otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """Append each batch as one OTLP/JSON line (readable by the otlpjsonfile receiver)."""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+
+    def __call__(self, batch: List[tuple]) -> None:
+        payload = to_otlp([trace for (trace,) in batch], self.service_name)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload) + "\n")
+
+
+class OTLPHttpSpanExporter:
+    """POST each batch to an OTLP/HTTP collector endpoint as JSON."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        import httpx
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.client = httpx.Client(timeout=timeout)
+
+    def __call__(self, batch: List[tuple]) -> None:
+        payload = to_otlp([trace for (trace,) in batch], self.service_name)
+        response = self.client.post(self.endpoint, json=payload)
+        response.raise_for_status()
+
+
+class Tracer:
+    """Creates per-request traces and hands finished ones to an exporter."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        exporter: Optional[Callable[[List[tuple]], None]] = None,
+    ):
+        self.enabled = enabled
+        self.sink = EventSink("traces", exporter, capacity=2048) if exporter else None
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None):
+        """Start a trace for the current context. Returns a reset token."""
+        if not self.enabled:
+            return None
+        trace_id, parent_span_id = _parse_traceparent(traceparent)
+        return _current_trace.set(Trace(name, trace_id, parent_span_id))
+
+    def end_trace(self, token) -> None:
+        """Finish the current trace, export it and restore the previous context."""
+        if token is None:
+            return
+        trace = _current_trace.get()
+        _current_trace.reset(token)
+        trace.finish()
+        if self.sink is not None:
+            self.sink.emit((trace,))
+
+    def shutdown(self) -> None:
+        """Flush traces that are waiting to be exported."""
+        if self.sink is not None:
+            self.sink.stop()
+
+
+def create_tracer() -> Tracer:
+    """Create the tracer configured by the application settings."""
+    exporter = None
+    if settings.TRACING_EXPORTER == "file":
+        exporter = FileSpanExporter(settings.TRACING_EXPORT_FILE, settings.PROJECT_NAME)
+    elif settings.TRACING_EXPORTER == "otlp":
+        exporter = OTLPHttpSpanExporter(
+            settings.TRACING_OTLP_ENDPOINT, settings.PROJECT_NAME
+        )
+    return Tracer(enabled=settings.TRACING_ENABLED, exporter=exporter)
+
+
+class TracedRoute(APIRoute):
+    """
+    Route class that records ``endpoint`` and ``serialize`` spans.
+
+    ``endpoint`` covers the path operation function; ``serialize`` covers
+    what FastAPI does after it returns: response model validation and JSON
+    encoding.
+    """
+
+    def get_route_handler(self) -> Callable:
+        call = getattr(self.dependant.call, "__wrapped_endpoint__", self.dependant.call)
+
+        if asyncio.iscoroutinefunction(call):
+
+            @functools.wraps(call)
+            async def traced_call(*args, **kwargs):
+                trace = _current_trace.get()
+                index = trace.start_span("endpoint") if trace is not None else None
+                try:
+                    return await call(*args, **kwargs)
+                finally:
+                    if trace is not None:
+                        trace.end_span(index)
+                        trace.endpoint_end_ns = trace.spans[index][2]
+
+        else:
+
+            @functools.wraps(call)
+            def traced_call(*args, **kwargs):
+                trace = _current_trace.get()
+                index = trace.start_span("endpoint") if trace is not None else None
+                try:
+                    return call(*args, **kwargs)
+                finally:
+                    if trace is not None:
+                        trace.end_span(index)
+                        trace.endpoint_end_ns = trace.spans[index][2]
+
+        traced_call.__wrapped_endpoint__ = call
+        self.dependant.call = traced_call
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            response = await handler(request)
+            trace = _current_trace.get()
+            if trace is not None and trace.endpoint_end_ns is not None:
+                trace.add_span(
+                    "serialize", trace.endpoint_end_ns, time.perf_counter_ns()
+                )
+            return response
+
+        return traced_handler
+
+
+tracer = create_tracer()
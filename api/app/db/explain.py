@@ -0,0 +1,189 @@
+"""
+Execution plan capture for slow statements.
+
+The SQL instrumentation hands slow SELECT statements, and contains-searches
+(``ILIKE`` / ``lower(...) LIKE``) regardless of their duration, to
+``PlanCapture``. A background worker runs ``EXPLAIN (ANALYZE, BUFFERS)`` on
+PostgreSQL or ``EXPLAIN QUERY PLAN`` on SQLite with the original parameters
+and keeps the most recent plans with the normalized statement and the request
+that issued it. Plans that scan a whole table are flagged with ``seq_scans``.
+
+Each statement shape is explained at most once per ``EXPLAIN_INTERVAL_SECONDS``
+so a hot slow query does not double its own load. ``EXPLAIN ANALYZE`` executes
+the statement again; it runs in a transaction that is rolled back.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
+
+from app.core.config import settings
+from app.core.events import EventSink
+from app.core.timezone import now
+
+logger = logging.getLogger(__name__)
+
+_CONTAINS_SEARCH = re.compile(r"\bILIKE\b|\bLIKE\s+lower\(", re.IGNORECASE)
+_PG_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+# SQLite reports "SCAN people" for full scans and "SEARCH people USING ..." otherwise
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?!.*\bUSING\b.*\bINDEX\b)")
+
+# Bound the per-shape rate limiting state
+_MAX_TRACKED_SHAPES = 4096
+
+
+@lru_cache(maxsize=2048)
+def is_contains_search(shape: str) -> bool:
+    """Whether a normalized statement filters with a ``'%term%'`` style match."""
+    return shape.lstrip().upper().startswith("SELECT") and bool(
+        _CONTAINS_SEARCH.search(shape)
+    )
+
+
+def sequential_scans(dialect: str, plan: List[str]) -> List[str]:
+    """Tables the plan reads in full."""
+    tables = []
+    for line in plan:
+        if dialect == "postgresql":
+            match = _PG_SEQ_SCAN.search(line)
+        else:
+            match = _SQLITE_SCAN.match(line.strip())
+        if match and match.group(1) not in tables:
+            tables.append(match.group(1))
+    return tables
+
+
+class PlanCapture:
+    """Explains statements on a background thread and keeps the recent plans."""
+
+    def __init__(
+        self,
+        max_plans: int = 50,
+        sample_rate: float = 1.0,
+        interval: float = 60.0,
+        analyze: bool = True,
+    ):
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.analyze = analyze
+        self._plans = deque(maxlen=max_plans)
+        self._last_explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.sink = EventSink(
+            "explain", self._explain_batch, capacity=100, batch_size=8
+        )
+
+    def submit(
+        self,
+        engine: Engine,
+        statement: str,
+        parameters: Any,
+        shape: str,
+        duration_ms: float,
+        request: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Queue ``statement`` to be explained. Returns ``False`` if it was skipped."""
+        if not shape.upper().startswith("SELECT"):
+            return False
+        # A single shared connection (in-memory SQLite) cannot be borrowed safely
+        if isinstance(engine.pool, (StaticPool, SingletonThreadPool)):
+            return False
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+
+        current = time.monotonic()
+        with self._lock:
+            last = self._last_explained.get(shape)
+            if last is not None and current - last < self.interval:
+                return False
+            if len(self._last_explained) >= _MAX_TRACKED_SHAPES:
+                self._last_explained.clear()
+            self._last_explained[shape] = current
+
+        return self.sink.emit(
+            (engine, statement, parameters, shape, duration_ms, request)
+        )
+
+    def explain(self, engine: Engine, statement: str, parameters: Any) -> List[str]:
+        """Return the plan of ``statement`` as text lines."""
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if self.analyze else "EXPLAIN "
+        elif dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            prefix = "EXPLAIN "
+
+        # A raw DBAPI cursor bypasses the instrumentation, so EXPLAIN statements
+        # are not timed or explained themselves
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(prefix + statement, parameters or ())
+            rows = cursor.fetchall()
+            cursor.close()
+            connection.rollback()
+        finally:
+            connection.close()
+
+        if dialect == "sqlite":
+            # (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        return [" | ".join(str(value) for value in row) for row in rows]
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Captured plans, most recent first."""
+        with self._lock:
+            return list(reversed(self._plans))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self._last_explained.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.sink.stats()
+
+    def shutdown(self) -> None:
+        self.sink.stop()
+
+    def _explain_batch(self, batch: List[tuple]) -> None:
+        for engine, statement, parameters, shape, duration_ms, request in batch:
+            dialect = engine.dialect.name
+            try:
+                plan = self.explain(engine, statement, parameters)
+            except Exception as e:
+                logger.warning(f"Could not explain statement ({e}): {shape}")
+                continue
+            entry = {
+                "timestamp": now().isoformat(),
+                "dialect": dialect,
+                "duration_ms": round(duration_ms, 3),
+                "statement": shape,
+                "request": request,
+                "plan": plan,
+                "seq_scans": sequential_scans(dialect, plan),
+            }
+            with self._lock:
+                self._plans.append(entry)
+
+
+def create_plan_capture() -> PlanCapture:
+    """Create the plan capture configured by the application settings."""
+    return PlanCapture(
+        max_plans=settings.EXPLAIN_MAX_PLANS,
+        sample_rate=settings.EXPLAIN_SAMPLE_RATE,
+        interval=settings.EXPLAIN_INTERVAL_SECONDS,
+        analyze=settings.EXPLAIN_ANALYZE,
+    )
+
+
+plan_capture = create_plan_capture()
@@ -0,0 +1,107 @@
+"""
+Table generations.
+
+Every write through ``CRUDBase`` and every bulk load bumps the table's row in
+``table_generations`` in the same transaction as the change. In-process caches
+derived from a table (facet counters, statistics) remember the generation
+they were built at and compare it with ``current`` - a primary key lookup -
+instead of rescanning the table.
+
+Writes made by this process are also handed to the subscribed listeners with
+the row before and after the change and the new generation. A listener whose
+cache was at ``generation - 1`` can apply the change incrementally; any other
+gap means another process or a bulk load changed the table, and the cache
+must be rebuilt.
+
+A table's first generation is the current time in milliseconds, so a table
+that is dropped and recreated never repeats a generation a cache has seen.
+The row is created with ``INSERT ... ON CONFLICT DO NOTHING``, so concurrent
+first writes to a table do not collide on its key.
+
+Bumping locks the table's generation row until the transaction commits, which
+serializes writes to the same table. ``CRUDBase`` flushes its change first and
+bumps right before ``commit()`` to keep that window short.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.models import TableGeneration
+
+logger = logging.getLogger(__name__)
+
+Row = Optional[Dict[str, Any]]
+WriteListener = Callable[[str, Row, Row, int], None]
+
+_generations = TableGeneration.__table__
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def row_values(obj: Any) -> Dict[str, Any]:
+    """Column values of a mapped object."""
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+
+
+class GenerationTracker:
+    """Reads and bumps table generations and fans out local writes."""
+
+    def __init__(self):
+        self._listeners: List[WriteListener] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: WriteListener) -> None:
+        """Call ``listener(table, old, new, generation)`` after every local write."""
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def current(self, db, table: str) -> int:
+        """The table's generation (0 before its first write)."""
+        generation = db.execute(
+            select(_generations.c.generation).where(_generations.c.table_name == table)
+        ).scalar()
+        return generation or 0
+
+    def bump(self, db, table: str) -> int:
+        """
+        Increment the table's generation in the caller's transaction.
+
+        ``db`` is a session or connection; the caller commits.
+        """
+        increment = (
+            update(_generations)
+            .where(_generations.c.table_name == table)
+            .values(generation=_generations.c.generation + 1)
+        )
+        if db.execute(increment).rowcount == 0:
+            self._create(db, table)
+            db.execute(increment)
+        return self.current(db, table)
+
+    def _create(self, db, table: str) -> None:
+        """Insert the table's row unless a concurrent transaction already did."""
+        bind = db.get_bind() if hasattr(db, "get_bind") else db
+        values = {"table_name": table, "generation": int(time.time() * 1000)}
+        upsert = _UPSERT_INSERTS.get(bind.dialect.name)
+        if upsert is None:
+            db.execute(insert(_generations).values(**values))
+        else:
+            db.execute(upsert(_generations).values(**values).on_conflict_do_nothing())
+
+    def notify(self, table: str, old: Row, new: Row, generation: int) -> None:
+        """Hand a committed local write to the listeners."""
+        for listener in list(self._listeners):
+            try:
+                listener(table, old, new, generation)
+            except Exception as e:
+                logger.error(f"Generation listener failed for {table}: {e}")
+
+
+generations = GenerationTracker()
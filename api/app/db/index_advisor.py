@@ -0,0 +1,194 @@
+"""
+Index advisor.
+
+Combines the per-column sort and search usage recorded by
+``MonitoringService`` with the observed latencies of those operations and
+recommends indexes the tables do not have yet:
+
+- B-tree indexes for frequently used, slow sorts. Multi-key sorts get a
+  composite index in key order.
+- Trigram (``pg_trgm`` GIN) indexes for slow ``ILIKE '%term%'`` searches on
+  PostgreSQL.
+
+Contains-searches cannot use any other index (a B-tree or ``lower()`` index
+serves neither ``ILIKE`` nor a leading ``%``), so without ``pg_trgm``, and on
+SQLite, those columns are reported as skipped. Recommendations can be applied online: ``CREATE INDEX
+CONCURRENTLY`` on PostgreSQL, so writes are not blocked while it builds.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.db.models import People, Planets
+
+logger = logging.getLogger(__name__)
+
+MODELS = {"people": People, "planets": Planets}
+
+
+class IndexAdvisor:
+    """Turns sort/search usage statistics into index recommendations."""
+
+    def __init__(
+        self,
+        bind: Engine,
+        min_count: int = 20,
+        min_latency_ms: float = 50.0,
+        models: Optional[Dict[str, Any]] = None,
+    ):
+        self.bind = bind
+        self.min_count = min_count
+        self.min_latency_ms = min_latency_ms
+        self.models = models or MODELS
+
+    @property
+    def dialect(self) -> str:
+        return self.bind.dialect.name
+
+    def recommend(
+        self, usage: Dict[str, Dict[str, Dict[str, float]]]
+    ) -> Dict[str, Any]:
+        """
+        Recommendations for ``usage`` (``MonitoringService.get_column_usage``).
+
+        Each recommendation carries its ``CREATE INDEX`` statement and a score,
+        the total time the operations took (count x average latency), that
+        orders the list.
+        """
+        existing = self._existing_indexes()
+        trigram = self.dialect == "postgresql" and self._trigram_available()
+        recommendations, skipped = [], []
+
+        for kind, columns in usage.items():
+            for key, stats in columns.items():
+                resource, _, fields = key.partition(":")
+                model = self.models.get(resource)
+                if model is None or not self._hot(stats):
+                    continue
+                table = model.__table__
+                names = [name for name in fields.split(",") if name]
+                if not names or any(name not in table.columns for name in names):
+                    continue
+
+                if kind == "sort":
+                    recommendation = self._btree(table.name, names, existing)
+                elif trigram:
+                    recommendation = self._search_index(table.name, names[0], existing)
+                else:
+                    reason = (
+                        "'%term%' searches need a trigram index: install pg_trgm"
+                        if self.dialect == "postgresql"
+                        else f"'%term%' searches cannot use an index on {self.dialect}"
+                    )
+                    skipped.append(
+                        {"table": table.name, "columns": names, "reason": reason}
+                    )
+                    continue
+                if recommendation is None:
+                    continue
+                recommendation.update(
+                    {
+                        "reason": kind,
+                        "count": stats["count"],
+                        "avg_ms": stats["avg_ms"],
+                        "score": round(stats["count"] * stats["avg_ms"], 1),
+                    }
+                )
+                recommendations.append(recommendation)
+
+        recommendations.sort(key=lambda r: r["score"], reverse=True)
+        return {
+            "dialect": self.dialect,
+            "thresholds": {
+                "min_count": self.min_count,
+                "min_latency_ms": self.min_latency_ms,
+            },
+            "recommendations": recommendations,
+            "skipped": skipped,
+        }
+
+    def apply(self, recommendation: Dict[str, Any]) -> None:
+        """Create the recommended index without blocking writes where possible."""
+        statement = recommendation["statement"]
+        with self.bind.connect() as connection:
+            if self.dialect == "postgresql":
+                # CONCURRENTLY cannot run inside a transaction block
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                statement = statement.replace(
+                    "CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1
+                )
+            logger.info(f"Applying index recommendation: {statement}")
+            connection.execute(text(statement))
+            if self.dialect != "postgresql":
+                connection.commit()
+
+    def _hot(self, stats: Dict[str, float]) -> bool:
+        return (
+            stats["count"] >= self.min_count and stats["avg_ms"] >= self.min_latency_ms
+        )
+
+    def _btree(self, table: str, columns: List[str], existing) -> Optional[Dict]:
+        # An index whose leading columns are the sort keys already serves the sort
+        if any(index[: len(columns)] == columns for index in existing.get(table, [])):
+            return None
+        name = f"ix_{table}_{'_'.join(columns)}"
+        statement = (
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+        return {
+            "name": name,
+            "table": table,
+            "columns": columns,
+            "kind": "btree",
+            "statement": statement,
+        }
+
+    def _search_index(self, table: str, column: str, existing) -> Optional[Dict]:
+        name = f"ix_{table}_{column}_trgm"
+        if name in existing.get("_names", set()):
+            return None
+        statement = (
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+        return {
+            "name": name,
+            "table": table,
+            "columns": [column],
+            "kind": "trigram",
+            "statement": statement,
+        }
+
+    def _existing_indexes(self) -> Dict[str, Any]:
+        """Column lists of every index per table, plus all index names."""
+        inspector = inspect(self.bind)
+        existing: Dict[str, Any] = {"_names": set()}
+        for model in self.models.values():
+            table = model.__tablename__
+            reflected = inspector.get_indexes(table)
+            existing["_names"].update(index["name"] for index in reflected)
+            # Expression indexes report None for their expression columns
+            indexes = [
+                [name for name in index["column_names"] if name] for index in reflected
+            ]
+            primary_key = inspector.get_pk_constraint(table).get("constrained_columns")
+            if primary_key:
+                indexes.append(primary_key)
+            existing[table] = indexes
+        return existing
+
+    def _trigram_available(self) -> bool:
+        """Whether pg_trgm is installed in the database (not merely installable)."""
+        try:
+            with self.bind.connect() as connection:
+                return bool(
+                    connection.execute(
+                        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                    ).scalar()
+                )
+        except Exception as e:
+            logger.warning(f"Could not check for pg_trgm: {e}")
+            return False
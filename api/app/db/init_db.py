@@ -1,23 +1,110 @@
 """
 Database initialization script.
+
+``init_db`` creates missing tables and columns, then stores a fingerprint of
+the schema in ``schema_version``. When a worker starts against a database
+that already has the current fingerprint, the table and column inspection is
+skipped entirely.
 """
 
+import hashlib
 import logging
+from typing import Optional
+from sqlalchemy import inspect, select, text
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
+from app.core.config import settings
 from app.db.base import Base
+from app.db.models import SchemaVersion
 from app.db.session import engine
 
 logger = logging.getLogger(__name__)
 
 
-def init_db() -> None:
-    """Initialize database tables."""
+def add_missing_columns(bind=engine) -> None:
+    """
+    Add nullable columns (and their indexes) missing from existing tables.
+
+    Added columns start out NULL; the SWAPI loader's sync mode backfills
+    ``url`` of older rows by name before matching records on it.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [c for c in table.columns if c.name not in present and c.nullable]
+            for column in missing:
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                logger.info(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                if any(column.name in index.columns for column in missing):
+                    index.create(connection, checkfirst=True)
+
+
+def schema_fingerprint(metadata=Base.metadata) -> str:
+    """Hash of every table, column and index the models declare."""
+    parts = []
+    for table in metadata.sorted_tables:
+        parts.append(f"table {table.name}")
+        for column in table.columns:
+            parts.append(
+                f"column {column.name} {column.type} nullable={column.nullable} "
+                f"pk={column.primary_key} unique={column.unique} index={column.index}"
+            )
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"index {index.name} {columns} unique={index.unique}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def stored_schema_version(bind=engine) -> Optional[str]:
+    """The fingerprint recorded by the last ``init_db``, if any."""
     try:
+        with bind.connect() as connection:
+            return connection.execute(
+                select(SchemaVersion.version).where(SchemaVersion.id == 1)
+            ).scalar()
+    except SQLAlchemyError:
+        # No schema_version table yet
+        return None
+
+
+def _store_schema_version(bind, version: str) -> None:
+    with Session(bind) as db:
+        db.merge(SchemaVersion(id=1, version=version))
+        db.commit()
+
+
+def init_db(bind=engine) -> bool:
+    """
+    Initialize database tables.
+
+    Returns ``False`` when the database already had the current schema
+    version and nothing had to be checked.
+    """
+    try:
+        version = schema_fingerprint()
+        if (
+            settings.DB_INIT_SKIP_KNOWN_SCHEMA
+            and stored_schema_version(bind) == version
+        ):
+            logger.info("Database schema is current, skipping table creation")
+            return False
+
         # Create all tables
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=bind)
+        add_missing_columns(bind)
+        _store_schema_version(bind, version)
         logger.info("Database tables created successfully!")
+        return True
     except OperationalError as e:
         logger.error(f"Database connection failed: {e}")
         logger.info(
@@ -0,0 +1,201 @@
+"""
+SQL query instrumentation.
+
+Hooks SQLAlchemy's cursor execution events to count the statements each
+request issues, the time spent in the database and the slowest statement.
+Statements over a threshold go to a slow-query log, and a statement shape that
+repeats many times within one request is reported as an N+1 pattern. Slow
+SELECTs and contains-searches are handed to ``app.db.explain`` for a plan.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.monitoring import monitoring_service
+from app.core.timezone import now
+from app.db import explain
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_NAMED_PARAM = re.compile(r"%\(\w+\)s|(?<!:):\w+|\$\d+|%s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape: literals and parameters become ``?``."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NAMED_PARAM.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements executed while serving a single request."""
+
+    __slots__ = (
+        "count",
+        "total_ns",
+        "slowest_ns",
+        "slowest_statement",
+        "shapes",
+        "request",
+    )
+
+    def __init__(self, request: Optional[Dict[str, Any]] = None):
+        # Method, path and query string of the request, reported with its plans
+        self.request = request
+        self.count = 0
+        self.total_ns = 0
+        self.slowest_ns = 0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Dict[str, int] = {}
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_ns / 1e6
+
+    @property
+    def slowest_ms(self) -> float:
+        return self.slowest_ns / 1e6
+
+    def record(self, statement: str, duration_ns: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.slowest_ns:
+            self.slowest_ns = duration_ns
+            self.slowest_statement = statement
+        shape = normalize_statement(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """Statement shapes executed at least ``threshold`` times."""
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+class QueryLog:
+    """Bounded, thread-safe list of the most recent noteworthy queries."""
+
+    def __init__(self, maxlen: int = 100):
+        self._entries = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def recent(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(reversed(self._entries))
+
+
+slow_query_log = QueryLog()
+n_plus_one_log = QueryLog()
+
+
+def start_request_stats(request: Optional[Dict[str, Any]] = None):
+    """Start collecting query stats for the current request. Returns a reset token."""
+    return _current_stats.set(QueryStats(request))
+
+
+def current_request_stats() -> Optional[QueryStats]:
+    """Return the query stats of the request being served, if any."""
+    return _current_stats.get()
+
+
+def finish_request_stats(token, method: str, path: str) -> Optional[QueryStats]:
+    """Stop collecting, report the request's query stats and detect N+1 patterns."""
+    stats = _current_stats.get()
+    _current_stats.reset(token)
+    if stats is None:
+        return None
+
+    monitoring_service.record_db_request(stats.count, stats.total_ms)
+    if settings.DEBUG and stats.count:
+        logger.debug(
+            f"{method} {path}: {stats.count} queries in {stats.total_ms:.2f}ms, "
+            f"slowest {stats.slowest_ms:.2f}ms: {stats.slowest_statement}"
+        )
+
+    for shape, repeats in stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD).items():
+        monitoring_service.backend.inc("db|n_plus_one")
+        n_plus_one_log.add(
+            {
+                "timestamp": now().isoformat(),
+                "method": method,
+                "path": path,
+                "statement": shape,
+                "repeats": repeats,
+            }
+        )
+        logger.warning(
+            f"Possible N+1 query pattern: {method} {path} ran the same "
+            f"statement {repeats} times: {shape}"
+        )
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_ns", []).append(time.perf_counter_ns())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_ns")
+    if not starts:
+        return
+    duration_ns = time.perf_counter_ns() - starts.pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ns)
+
+    duration_ms = duration_ns / 1e6
+    if duration_ms >= settings.SLOW_QUERY_MS:
+        monitoring_service.backend.inc("db|slow_queries")
+        slow_query_log.add(
+            {
+                "timestamp": now().isoformat(),
+                "duration_ms": round(duration_ms, 3),
+                "statement": normalize_statement(statement),
+            }
+        )
+        logger.warning(f"Slow query ({duration_ms:.2f}ms): {statement}")
+
+    if settings.EXPLAIN_ENABLED and not executemany:
+        shape = normalize_statement(statement)
+        if duration_ms >= settings.EXPLAIN_SLOW_MS or (
+            settings.EXPLAIN_SEARCHES and explain.is_contains_search(shape)
+        ):
+            explain.plan_capture.submit(
+                conn.engine,
+                statement,
+                parameters,
+                shape,
+                duration_ms,
+                stats.request if stats is not None else None,
+            )
+
+
+def install_query_instrumentation(target=Engine) -> None:
+    """Attach the cursor execution listeners to ``target`` (all engines by default)."""
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
@@ -2,7 +2,7 @@
 Database models.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -18,6 +18,8 @@ class People(Base):
     eye_color = Column(String, nullable=True)
     birth_year = Column(String, nullable=True)
     gender = Column(String, nullable=True)
+    url = Column(String, nullable=True, unique=True, index=True)
+    edited = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -34,5 +36,25 @@ class Planets(Base):
     climate = Column(String, nullable=True)
     terrain = Column(String, nullable=True)
     surface_water = Column(String, nullable=True)
+    url = Column(String, nullable=True, unique=True, index=True)
+    edited = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class SchemaVersion(Base):
+    """Fingerprint of the schema the database was last initialized with."""
+
+    __tablename__ = "schema_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(String(64), nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TableGeneration(Base):
+    """Change counter of a table, bumped by every write through the API and bulk loads."""
+
+    __tablename__ = "table_generations"
+    table_name = Column(String, primary_key=True)
+    generation = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
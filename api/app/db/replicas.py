@@ -0,0 +1,191 @@
+"""
+Read-replica routing.
+
+Read-only endpoints take their session from ``ReplicaRouter.read_session``,
+which picks a healthy replica round-robin or by fewest sessions in use
+("least_busy"). Writes always go to the primary. A client that wrote within
+the last ``read_your_writes`` seconds reads from the primary too, so it sees
+its own changes even when the replicas are behind.
+
+``check_health`` measures each replica's lag (replay delay on PostgreSQL;
+other databases are only checked for connectivity) and evicts replicas that
+are unreachable or lag more than ``max_lag`` seconds until they catch up.
+With no healthy replica left, reads fall back to the primary.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+LagProbe = Callable[[Engine], float]
+
+ROUND_ROBIN = "round_robin"
+LEAST_BUSY = "least_busy"
+
+# Purge expired read-your-writes entries once this many clients are tracked
+_MAX_TRACKED_WRITERS = 10000
+
+
+def database_lag(engine: Engine) -> float:
+    """Replication delay of ``engine`` in seconds (0 when it is not a standby)."""
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            lag = connection.execute(
+                text(
+                    "SELECT CASE WHEN pg_is_in_recovery() THEN COALESCE("
+                    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0"
+                    ") ELSE 0 END"
+                )
+            ).scalar()
+            return float(lag or 0.0)
+        connection.execute(text("SELECT 1"))
+        return 0.0
+
+
+class Replica:
+    """One replica engine with its session factory and routing state."""
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=engine
+        )
+        self.healthy = True
+        self.in_use = 0
+        self.reads = 0
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "in_use": self.in_use,
+            "reads": self.reads,
+            "lag_seconds": None if self.lag is None else round(self.lag, 3),
+            "error": self.error,
+        }
+
+
+class ReplicaRouter:
+    """Routes read-only sessions to replicas and everything else to the primary."""
+
+    def __init__(
+        self,
+        primary: Callable[[], Session],
+        replicas: Optional[List[Engine]] = None,
+        strategy: str = ROUND_ROBIN,
+        read_your_writes: float = 5.0,
+        max_lag: float = 10.0,
+        lag_probe: LagProbe = database_lag,
+    ):
+        if strategy not in (ROUND_ROBIN, LEAST_BUSY):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.primary = primary
+        self.replicas = [
+            Replica(f"replica-{i}", engine) for i, engine in enumerate(replicas or [])
+        ]
+        self.strategy = strategy
+        self.read_your_writes = read_your_writes
+        self.max_lag = max_lag
+        self.lag_probe = lag_probe
+        self.primary_reads = 0
+        self._next = itertools.count()
+        self._recent_writers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def note_write(self, client: str) -> None:
+        """Send ``client``'s reads to the primary for the read-your-writes window."""
+        if not self.replicas or self.read_your_writes <= 0:
+            return
+        current = time.monotonic()
+        with self._lock:
+            if len(self._recent_writers) >= _MAX_TRACKED_WRITERS:
+                self._recent_writers = {
+                    key: until
+                    for key, until in self._recent_writers.items()
+                    if until > current
+                }
+            self._recent_writers[client] = current + self.read_your_writes
+
+    def read_session(self, client: Optional[str] = None) -> Session:
+        """A session for a read-only request by ``client``."""
+        replica = self._choose(client)
+        if replica is None:
+            with self._lock:
+                self.primary_reads += 1
+            return self.primary()
+
+        session = replica.session_factory()
+        session.info["replica"] = replica
+        return session
+
+    def release(self, session: Session) -> None:
+        """Close a session from ``read_session``."""
+        replica = session.info.pop("replica", None)
+        session.close()
+        if replica is not None:
+            with self._lock:
+                replica.in_use -= 1
+
+    def check_health(self) -> List[Dict[str, Any]]:
+        """Measure every replica's lag, evicting or readmitting it."""
+        for replica in self.replicas:
+            try:
+                lag = self.lag_probe(replica.engine)
+                error = None
+                if lag > self.max_lag:
+                    error = f"Lagging {lag:.1f}s behind the primary"
+            except Exception as e:
+                lag, error = None, str(e)
+
+            healthy = error is None
+            if healthy != replica.healthy:
+                if healthy:
+                    logger.info(f"Replica {replica.name} is healthy again")
+                else:
+                    logger.warning(f"Evicting replica {replica.name}: {error}")
+            replica.lag, replica.error, replica.healthy = lag, error, healthy
+        return self.status()["replicas"]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "read_your_writes_seconds": self.read_your_writes,
+                "max_lag_seconds": self.max_lag,
+                "primary_reads": self.primary_reads,
+                "replicas": [replica.status() for replica in self.replicas],
+            }
+
+    def _choose(self, client: Optional[str]) -> Optional[Replica]:
+        with self._lock:
+            if client is not None:
+                until = self._recent_writers.get(client)
+                if until is not None:
+                    if until > time.monotonic():
+                        return None
+                    del self._recent_writers[client]
+
+            candidates = [replica for replica in self.replicas if replica.healthy]
+            if not candidates:
+                return None
+            # Rotate the start, so least-busy ties are also spread round-robin
+            offset = next(self._next) % len(candidates)
+            candidates = candidates[offset:] + candidates[:offset]
+            if self.strategy == LEAST_BUSY:
+                replica = min(candidates, key=lambda r: r.in_use)
+            else:
+                replica = candidates[0]
+            replica.in_use += 1
+            replica.reads += 1
+            return replica
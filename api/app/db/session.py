@@ -6,6 +6,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import install_query_instrumentation
+from app.db.replicas import ReplicaRouter
 
 engine = create_engine(
     settings.database_url,
@@ -13,4 +15,19 @@ engine = create_engine(
     echo=False,  # Set to True for SQL query logging
 )
 
+# Count and time the SQL statements of every request, on every engine
+install_query_instrumentation()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-only endpoints read from the replicas, if any are configured
+replica_engines = [
+    create_engine(url, pool_pre_ping=True) for url in settings.replica_urls
+]
+replica_router = ReplicaRouter(
+    SessionLocal,
+    replica_engines,
+    strategy=settings.REPLICA_STRATEGY,
+    read_your_writes=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+)
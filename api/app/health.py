@@ -1,61 +1,252 @@
-import httpx
-from typing import Dict, Any
+"""
+Health checks.
+
+``/livez`` only tells whether the process is serving requests. Dependency
+checks run concurrently in a background task that refreshes a cached status
+every ``HEALTH_CHECK_INTERVAL`` seconds, so ``/readyz`` and ``/health`` never
+touch the database or the network themselves. The database check runs in the
+threadpool so it cannot stall the event loop, and the Star Wars API check
+reuses one pooled HTTP client. ``httpx`` is imported with that client, not at
+application import time.
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, Optional
+
 from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.timezone import now
+from app.db import session
 from app.db.session import SessionLocal
 
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+HealthCheck = Callable[[], Awaitable[Dict[str, Any]]]
+
 
 async def check_basic_health() -> Dict[str, Any]:
     """Basic health check without external dependencies"""
     return {"status": "healthy", "message": "Application is running"}
 
 
+def _ping_database() -> None:
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1")).fetchone()
+
+
 async def check_postgresql_health() -> Dict[str, Any]:
     """Check PostgreSQL database connection health"""
     try:
-        db = SessionLocal()
-        # Execute a simple query to test the connection
-        result = db.execute(text("SELECT 1"))
-        result.fetchone()
-        db.close()
+        # Blocking driver call, keep it off the event loop
+        await run_in_threadpool(_ping_database)
         return {"status": "connected"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
-async def check_star_wars_api_health(api_url: str) -> Dict[str, Any]:
+async def check_replicas_health() -> Dict[str, Any]:
+    """Measure replica lag, evicting lagging or unreachable replicas from reads"""
+    replicas = await run_in_threadpool(session.replica_router.check_health)
+    evicted = [replica["name"] for replica in replicas if not replica["healthy"]]
+    if evicted:
+        return {
+            "status": "error",
+            "message": f"Evicted from reads: {', '.join(evicted)}",
+            "replicas": replicas,
+        }
+    return {"status": "connected", "replicas": replicas}
+
+
+async def check_star_wars_api_health(
+    api_url: str, client: Optional["httpx.AsyncClient"] = None
+) -> Dict[str, Any]:
     """Check Star Wars API health by making a request to the specified endpoint"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{api_url}people/?page=3&nrp=2", timeout=10.0)
-            if response.status_code == 200:
-                return {"status": "connected"}
-            else:
-                return {"status": "error", "message": f"HTTP {response.status_code}"}
+        if client is None:
+            import httpx
+
+            async with httpx.AsyncClient() as client:
+                response = await client.get(
+                    f"{api_url}people/?page=3&nrp=2", timeout=10.0
+                )
+        else:
+            response = await client.get(f"{api_url}people/?page=3&nrp=2")
+        if response.status_code == 200:
+            return {"status": "connected"}
+        else:
+            return {"status": "error", "message": f"HTTP {response.status_code}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
+async def _run_check(check: HealthCheck, timeout: float) -> Dict[str, Any]:
+    """Run one check with a deadline and report how long it took."""
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(check(), timeout)
+    except asyncio.TimeoutError:
+        result = {"status": "error", "message": f"Timed out after {timeout}s"}
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+async def run_checks(
+    checks: Dict[str, HealthCheck], timeout: float
+) -> Dict[str, Dict[str, Any]]:
+    """Run all checks concurrently."""
+    results = await asyncio.gather(
+        *(_run_check(check, timeout) for check in checks.values())
+    )
+    return dict(zip(checks, results))
+
+
 async def get_health_status(
     app_name: str, app_version: str, star_wars_api_url: str
 ) -> Dict[str, Any]:
     """Get comprehensive health status for all services"""
-    health_status = {
-        "status": "healthy",
+    services = await run_checks(
+        {
+            "postgresql": check_postgresql_health,
+            "star_wars_api": lambda: check_star_wars_api_health(star_wars_api_url),
+        },
+        timeout=10.0,
+    )
+    healthy = all(service["status"] == "connected" for service in services.values())
+    return {
+        "status": "healthy" if healthy else "unhealthy",
         "app_name": app_name,
         "version": app_version,
-        "services": {},
+        "services": services,
     }
 
-    # Check PostgreSQL database connection
-    postgresql_health = await check_postgresql_health()
-    health_status["services"]["postgresql"] = postgresql_health
-    if postgresql_health["status"] != "connected":
-        health_status["status"] = "unhealthy"
 
-    # Check Star Wars API
-    star_wars_health = await check_star_wars_api_health(star_wars_api_url)
-    health_status["services"]["star_wars_api"] = star_wars_health
-    if star_wars_health["status"] != "connected":
-        health_status["status"] = "unhealthy"
+class HealthMonitor:
+    """
+    Keeps a cached health status refreshed by a background task.
+
+    Only failures of ``critical`` services make the application not ready;
+    the others are reported but do not take the instance out of rotation.
+    A status older than ``max_age`` seconds is treated as not ready, since it
+    means the refresh task is stuck or dead.
+    """
+
+    def __init__(
+        self,
+        app_name: str,
+        app_version: str,
+        star_wars_api_url: str,
+        interval: float = 15.0,
+        timeout: float = 5.0,
+        checks: Optional[Dict[str, HealthCheck]] = None,
+        critical: Iterable[str] = ("postgresql",),
+    ):
+        self.app_name = app_name
+        self.app_version = app_version
+        self.star_wars_api_url = star_wars_api_url
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max(3 * interval, timeout * 2)
+        self.critical = frozenset(critical)
+        self._checks = checks
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._status: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+
+    @property
+    def checks(self) -> Dict[str, HealthCheck]:
+        if self._checks is None:
+            self._checks = {
+                "postgresql": check_postgresql_health,
+                "star_wars_api": lambda: check_star_wars_api_health(
+                    self.star_wars_api_url, self._http_client()
+                ),
+            }
+            if session.replica_router.replicas:
+                # Also keeps replica eviction up to date every refresh
+                self._checks["replicas"] = check_replicas_health
+        return self._checks
+
+    def _http_client(self) -> "httpx.AsyncClient":
+        """Pooled client shared by every refresh."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        return self._client
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Run all checks concurrently and cache the result."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            services = await run_checks(self.checks, self.timeout)
+            healthy = all(s["status"] == "connected" for s in services.values())
+            ready = all(
+                services[name]["status"] == "connected"
+                for name in self.critical
+                if name in services
+            )
+            self._status = {
+                "status": "healthy" if healthy else "unhealthy",
+                "ready": ready,
+                "app_name": self.app_name,
+                "version": self.app_version,
+                "checked_at": now().isoformat(),
+                "services": services,
+            }
+            self._checked_at = time.monotonic()
+            return self._status
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Return the cached status (refreshed on demand without a background task)."""
+        age = time.monotonic() - self._checked_at
+        if self._status is None or (self._task is None and age > self.max_age):
+            await self.refresh()
+            age = 0.0
+        status = dict(self._status)
+        status["age_seconds"] = round(age, 3)
+        if age > self.max_age:
+            status["ready"] = False
+            status["message"] = "Health status is stale"
+        return status
+
+    async def start(self) -> None:
+        """Start the background refresh task."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        """Stop the refresh task and close the HTTP client."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        # The lock is bound to the loop that is going away
+        self._lock = None
 
-    return health_status
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health check refresh failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -2,40 +2,81 @@
 Main FastAPI application entry point.
 """
 
+# First, so the startup import phase covers everything below
+from app.core.startup import startup_stats, warm_up
+
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import capture
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, shutdown_logging
 from app.core.middleware import MonitoringMiddleware
+from app.core.monitoring import monitoring_service
+from app.core.tracing import tracer
 from app.api.routers import people, planets, ai_insights, monitoring
-from app.health import get_health_status
+from app.health import HealthMonitor
+from app.db import explain, session
 from app.db.init_db import init_db
 
 # Setup logging
-setup_logging()
+setup_logging(
+    log_file=settings.LOG_FILE,
+    level=settings.LOG_LEVEL,
+    mode=settings.LOG_MODE,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    batch_size=settings.LOG_BATCH_SIZE,
+)
 logger = logging.getLogger(__name__)
 
+health_monitor = HealthMonitor(
+    settings.PROJECT_NAME,
+    settings.APP_VERSION,
+    settings.STAR_WARS_API_URL,
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for FastAPI application."""
     # Startup
+    startup_stats.mark("server_start")
+    monitoring_service.start()
+    database_ready = False
     try:
         logger.info(f"Connecting to database: {settings.database_url}")
         init_db()
+        database_ready = True
         logger.info("Database initialization completed successfully!")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         logger.error("Application will start without database functionality.")
         # Don't raise the exception to allow the app to start
+    startup_stats.mark("init_db")
+    if database_ready:
+        try:
+            warm_up(session.SessionLocal, settings.DB_WARMUP_CONNECTIONS)
+        except Exception as e:
+            logger.warning(f"Warm-up failed: {e}")
+        startup_stats.mark("warmup")
+    await health_monitor.start()
+    startup_stats.record_ready()
 
     yield
 
     # Shutdown
     logger.info("Application shutting down...")
+    await health_monitor.stop()
+    monitoring_service.shutdown()
+    if capture.traffic_capture is not None:
+        capture.traffic_capture.shutdown()
+    explain.plan_capture.shutdown()
+    tracer.shutdown()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -76,9 +117,21 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Get health status for all services."""
-    health_status = await get_health_status(
-        settings.PROJECT_NAME, settings.APP_VERSION, settings.STAR_WARS_API_URL
-    )
+    return await health_monitor.get_status()
+
+
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness_check(response: Response):
+    """Readiness probe served from the cached health status."""
+    health_status = await health_monitor.get_status()
+    if not health_status["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return health_status
 
 
@@ -88,6 +141,8 @@ app.include_router(planets.router, prefix=settings.API_V1_STR)
 app.include_router(ai_insights.router, prefix=settings.API_V1_STR)
 app.include_router(monitoring.router, prefix=settings.API_V1_STR)
 
+startup_stats.mark("import")
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -8,10 +8,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+import app.main as main
 from app.main import app
 from app.db.base import Base
-from app.api.deps import get_db
-
+from app.api.deps import get_db, get_read_db
+from app.health import HealthMonitor
 
 # Create in-memory database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -45,10 +46,39 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+async def _connected():
+    return {"status": "connected"}
+
+
+def stub_health_monitor() -> HealthMonitor:
+    """Health monitor without a background task or network access."""
+    return HealthMonitor(
+        "Test API",
+        "1.0.0",
+        "http://swapi.test/",
+        interval=0,
+        checks={"postgresql": _connected, "star_wars_api": _connected},
+    )
+
+
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, monkeypatch):
     """Create a test client with database override."""
+    # The application's monitor would call the real Star Wars API
+    monkeypatch.setattr(main, "health_monitor", stub_health_monitor())
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def synthetic_data(db_session):
+    """Populate the test database with a seeded synthetic dataset."""
+    from app.tools.synthetic_data import populate
+
+    def _populate(people: int = 0, planets: int = 0, seed: int = 0):
+        return populate(engine, people=people, planets=planets, seed=seed)
+
+    return _populate
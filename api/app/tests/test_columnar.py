@@ -0,0 +1,128 @@
+"""
+Tests for the in-memory columnar engine of the list endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import columnar
+from app.api.crud import CRUDBase
+from app.api.schemas import SortField, SortOrder
+from app.api.sorting import parse_sort
+from app.core.config import settings
+from app.db.models import People, Planets
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """The columnar engine, enabled and empty."""
+    monkeypatch.setattr(settings, "COLUMNAR_ENABLED", True)
+    columnar.columnar_engine.clear()
+    yield columnar.columnar_engine
+    columnar.columnar_engine.clear()
+
+
+def _ids(crud, db, **kwargs):
+    items, total = crud.get_multi_paginated_with_search(db, **kwargs)
+    return [item.id for item in items], total
+
+
+QUERIES = [
+    {},
+    {"skip": 20, "limit": 15},
+    {"sort": parse_sort("gender,-mass")},
+    {"sort": parse_sort("-eye_color,name,height"), "skip": 7, "limit": 30},
+    {"sort_by": SortField.HEIGHT, "sort_order": SortOrder.DESC},
+    {"sort_by": SortField.UPDATED_AT},
+    {"sort_by": SortField.POPULATION},
+    {"search_params": {"name": "a", "gender": None}},
+    {"search_params": {"eye_color": "BLU", "hair_color": "brown"}, "limit": 500},
+    {"search_params": {"name": "a_e"}, "sort": parse_sort("-name")},
+    {"search_params": {"birth_year": "BBY%9"}},
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_matches_sql(db_session, synthetic_data, engine, query):
+    """Test that pages and totals equal the SQL results."""
+    synthetic_data(people=400, seed=3)
+    crud = CRUDBase(People)
+    settings.COLUMNAR_ENABLED = False
+    expected = _ids(crud, db_session, **query)
+    settings.COLUMNAR_ENABLED = True
+    assert _ids(crud, db_session, **query) == expected
+    assert engine.served == 1
+
+
+def test_follows_writes(client: TestClient, db_session, engine):
+    """Test that local writes update the snapshot without reloading it."""
+    for name in ("Leia", "Han", "Luke"):
+        client.post("/api/people/", json={"name": name, "eye_color": "brown"})
+    client.get("/api/people/?sort=name")
+    assert engine.loads == 1
+
+    luke = client.get("/api/people/?name=luke").json()["items"][0]["id"]
+    client.put(f"/api/people/{luke}", json={"name": "Anakin", "eye_color": "blue"})
+    client.post("/api/people/", json={"name": "Rey", "eye_color": "hazel"})
+    data = client.get("/api/people/?sort=name").json()
+    assert [item["name"] for item in data["items"]] == ["Anakin", "Han", "Leia", "Rey"]
+
+    client.delete(f"/api/people/{luke}")
+    data = client.get("/api/people/?eye_color=BROWN&sort=-name").json()
+    assert [item["name"] for item in data["items"]] == ["Leia", "Han"]
+    assert data["total"] == 2
+    assert engine.loads == 1
+
+
+def test_reloads_after_bulk_load(db_session, synthetic_data, engine):
+    """Test that a write made elsewhere reloads the snapshot."""
+    synthetic_data(planets=30)
+    crud = CRUDBase(Planets)
+    assert crud.get_multi_paginated_with_search(db_session)[1] == 30
+    synthetic_data(planets=20)
+    assert crud.get_multi_paginated_with_search(db_session)[1] == 50
+    assert engine.loads == 2
+
+
+def test_falls_back_above_max_rows(db_session, synthetic_data, engine, monkeypatch):
+    """Test that tables larger than COLUMNAR_MAX_ROWS are queried in SQL."""
+    monkeypatch.setattr(settings, "COLUMNAR_MAX_ROWS", 10)
+    synthetic_data(people=11)
+    items, total = CRUDBase(People).get_multi_paginated_with_search(db_session)
+    assert total == 11
+    assert engine.served == 0 and engine.fallbacks == 1
+    assert engine.stats()["tables"] == {}
+
+
+def test_string_sorts_use_sql_under_other_collations(db_session, engine, monkeypatch):
+    """Test that name sorts match SQL when the database collation is not C."""
+    crud = CRUDBase(People)
+    for name in ("beta", "Alpha", "alpha", "Éclair", "Zulu", "charlie"):
+        db_session.add(People(name=name))
+    db_session.commit()
+    monkeypatch.setattr(columnar, "database_collation", lambda db: "en_US.UTF-8")
+
+    for query in (
+        {"sort": parse_sort("-name")},
+        {"sort": parse_sort("created_at,name")},
+        {"sort_by": SortField.CREATED_AT, "search_params": {"name": "A"}},
+    ):
+        settings.COLUMNAR_ENABLED = False
+        expected = _ids(crud, db_session, **query)
+        settings.COLUMNAR_ENABLED = True
+        assert _ids(crud, db_session, **query) == expected
+
+    # String sorts went to SQL; the created_at sort with a filter was served
+    assert engine.fallbacks == 2 and engine.served == 1
+    assert engine.stats()["tables"]["people"]["collation"] == "en_US.UTF-8"
+
+
+def test_columnar_endpoint(client: TestClient, engine):
+    """Test that snapshot sizes and counters are served."""
+    client.post("/api/planets/", json={"name": "Hoth"})
+    client.get("/api/planets/")
+    data = client.get("/api/monitoring/columnar").json()
+    assert data["enabled"] is True and data["served"] == 1
+    assert data["tables"]["planets"]["rows"] == 1
@@ -0,0 +1,108 @@
+"""
+Tests for execution plan capture.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import explain
+from app.db.base import Base
+from app.db.explain import PlanCapture, is_contains_search, sequential_scans
+from app.db.instrumentation import finish_request_stats, start_request_stats
+from app.db.models import People
+
+
+@pytest.fixture
+def capture(monkeypatch):
+    """A fresh plan capture wired into the instrumentation."""
+    capture = PlanCapture(interval=60.0)
+    monkeypatch.setattr(explain, "plan_capture", capture)
+    yield capture
+    capture.shutdown()
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """A file-backed SQLite engine; plans are not captured on shared connections."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def test_contains_search_detection():
+    """Test that ILIKE searches are recognized on both dialects."""
+    assert is_contains_search(
+        "SELECT * FROM people WHERE lower(people.name) LIKE lower(?)"
+    )
+    assert is_contains_search("SELECT * FROM people WHERE people.name ILIKE ?")
+    assert not is_contains_search("SELECT * FROM people WHERE people.name = ?")
+    assert not is_contains_search("UPDATE people SET name = ? WHERE name ILIKE ?")
+
+
+def test_sequential_scans():
+    """Test seq scan detection in PostgreSQL and SQLite plans."""
+    assert sequential_scans(
+        "postgresql",
+        ["Limit  (cost=0.00..1.10 rows=10)", "  ->  Seq Scan on people  (cost=...)"],
+    ) == ["people"]
+    assert sequential_scans("sqlite", ["SCAN people"]) == ["people"]
+    assert (
+        sequential_scans(
+            "sqlite", ["SEARCH people USING INDEX ix_people_name (name=?)"]
+        )
+        == []
+    )
+
+
+def test_search_plan_is_captured(capture, file_engine):
+    """Test that an ILIKE search is explained with its request immediately."""
+    token = start_request_stats(
+        {"method": "GET", "path": "/api/people/", "query": "name=sky"}
+    )
+    with Session(file_engine) as session:
+        session.add(People(name="Luke Skywalker"))
+        session.commit()
+        for _ in range(3):
+            session.query(People).filter(People.name.ilike("%sky%")).all()
+    finish_request_stats(token, "GET", "/api/people/")
+    capture.sink.stop()
+
+    plans = capture.recent()
+    # The same shape is explained once per interval
+    assert len(plans) == 1
+    assert plans[0]["dialect"] == "sqlite"
+    assert "LIKE lower(?)" in plans[0]["statement"]
+    assert plans[0]["request"]["query"] == "name=sky"
+    assert plans[0]["seq_scans"] == ["people"]
+
+
+def test_fast_statements_are_not_explained(capture, file_engine, monkeypatch):
+    """Test that only statements over the threshold are explained."""
+    with Session(file_engine) as session:
+        session.query(People).filter(People.id == 1).all()
+        monkeypatch.setattr(settings, "EXPLAIN_SLOW_MS", 0.0)
+        session.query(People).filter(People.name == "Leia").all()
+    capture.sink.stop()
+
+    plans = capture.recent()
+    assert [plan["statement"].split("WHERE ")[1] for plan in plans] == [
+        "people.name = ?"
+    ]
+    assert plans[0]["request"] is None
+
+
+def test_slow_plans_endpoint(client: TestClient, capture, file_engine):
+    """Test that captured plans are served by the monitoring API."""
+    with Session(file_engine) as session:
+        session.query(People).filter(People.name.ilike("%leia%")).all()
+    capture.sink.stop()
+
+    response = client.get("/api/monitoring/slow-plans")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seq_scans"] == 1
+    assert data["plans"][0]["plan"] == ["SCAN people"]
@@ -0,0 +1,94 @@
+"""
+Tests for facet counts and table generations.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.api.facets import facet_registry
+from app.db.generations import generations
+from app.db.models import People
+
+
+def _counts(data, column):
+    return {facet["value"]: facet["count"] for facet in data["facets"][column]}
+
+
+def _create(client: TestClient, **fields):
+    response = client.post("/api/people/", json={"name": "Someone", **fields})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_facets_follow_writes(client: TestClient):
+    """Test that counters follow creates, updates and deletes without a rebuild."""
+    luke = _create(client, gender="male", eye_color="blue")
+    _create(client, gender="female", eye_color="brown")
+
+    data = client.get("/api/people/facets").json()
+    assert data["source"] == "counters"
+    assert data["total"] == 2
+    assert _counts(data, "gender") == {"male": 1, "female": 1}
+    rebuilds = facet_registry.get(People).rebuilds
+
+    _create(client, gender="male", eye_color="brown")
+    client.put(f"/api/people/{luke}", json={"eye_color": "green"})
+    data = client.get("/api/people/facets").json()
+    assert _counts(data, "gender") == {"male": 2, "female": 1}
+    assert _counts(data, "eye_color") == {"brown": 2, "green": 1}
+
+    client.delete(f"/api/people/{luke}")
+    data = client.get("/api/people/facets").json()
+    assert data["total"] == 2
+    assert _counts(data, "eye_color") == {"brown": 2}
+    assert facet_registry.get(People).rebuilds == rebuilds
+
+
+def test_facets_with_filters(client: TestClient):
+    """Test that filters are OR-combined contains-matches, as on the list."""
+    _create(client, name="Luke", gender="male", hair_color="blond")
+    _create(client, name="Leia", gender="female", hair_color="brown")
+    _create(client, name="Han", gender="male", hair_color="brown")
+
+    data = client.get("/api/people/facets?gender=FEM&hair_color=blo").json()
+    assert data["source"] == "counters"
+    assert data["total"] == 2
+    assert _counts(data, "hair_color") == {"blond": 1, "brown": 1}
+
+    data = client.get("/api/people/facets?name=lu").json()
+    assert data["source"] == "query"
+    assert _counts(data, "gender") == {"male": 1}
+
+
+def test_planet_facets(client: TestClient):
+    """Test the planet facets."""
+    client.post("/api/planets/", json={"name": "Hoth", "climate": "frozen"})
+    client.post("/api/planets/", json={"name": "Tatooine", "climate": "arid"})
+
+    data = client.get("/api/planets/facets?climate=arid").json()
+    assert data["total"] == 1
+    assert _counts(data, "climate") == {"arid": 1}
+    assert set(data["facets"]) == {"climate", "terrain"}
+
+
+def test_concurrent_first_bumps(db_session):
+    """Test that a table row created by a concurrent first write is reused."""
+    generations._create(db_session, "people")
+    first = generations.current(db_session, "people")
+    # The other transaction's row is already there when this one inserts
+    generations._create(db_session, "people")
+    assert generations.bump(db_session, "people") == first + 1
+
+
+def test_facets_rebuild_after_bulk_load(client: TestClient, db_session, synthetic_data):
+    """Test that a bulk load bumps the generation and the counters are rebuilt."""
+    _create(client, gender="male")
+    before = client.get("/api/people/facets").json()
+    assert before["total"] == 1
+
+    synthetic_data(people=50)
+    assert generations.current(db_session, "people") > before["generation"]
+
+    after = client.get("/api/people/facets").json()
+    assert after["total"] == 51
+    assert after["generation"] > before["generation"]
+    assert sum(_counts(after, "gender").values()) == 51
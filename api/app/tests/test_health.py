@@ -0,0 +1,126 @@
+"""
+Tests for the health, liveness and readiness endpoints.
+"""
+
+import asyncio
+
+import pytest
+
+import app.main as main
+from app.health import HealthMonitor
+
+
+def _monitor(checks, **kwargs):
+    return HealthMonitor(
+        "Test API", "1.0.0", "http://swapi.test/", checks=checks, **kwargs
+    )
+
+
+async def _connected():
+    return {"status": "connected"}
+
+
+async def _failing():
+    return {"status": "error", "message": "down"}
+
+
+@pytest.fixture
+def use_monitor(monkeypatch):
+    """Replace the application's health monitor for a test."""
+
+    def install(monitor):
+        monkeypatch.setattr(main, "health_monitor", monitor)
+        return monitor
+
+    return install
+
+
+def test_livez(client):
+    """Test that the liveness probe does not depend on any service."""
+    response = client.get("/livez")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readyz_ready(use_monitor, client):
+    """Test that readiness reports the cached status of all services."""
+    use_monitor(_monitor({"postgresql": _connected, "star_wars_api": _connected}))
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert data["status"] == "healthy"
+    assert set(data["services"]) == {"postgresql", "star_wars_api"}
+
+
+def test_readyz_non_critical_failure_keeps_ready(use_monitor, client):
+    """Test that an external API outage is reported without failing readiness."""
+    use_monitor(_monitor({"postgresql": _connected, "star_wars_api": _failing}))
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json()["status"] == "unhealthy"
+    assert response.json()["ready"] is True
+
+
+def test_readyz_database_failure(use_monitor, client):
+    """Test that a database failure makes the instance not ready."""
+    use_monitor(_monitor({"postgresql": _failing}))
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+
+class TestHealthMonitor:
+    """Test cases for the cached health monitor."""
+
+    def test_checks_run_concurrently_with_timeout(self):
+        """Test that slow checks run in parallel and are cut off at the timeout."""
+
+        async def slow():
+            await asyncio.sleep(5)
+            return {"status": "connected"}
+
+        async def run():
+            monitor = _monitor({"a": slow, "b": slow, "c": _connected}, timeout=0.2)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            status = await monitor.refresh()
+            return status, loop.time() - start
+
+        status, elapsed = asyncio.run(run())
+        assert elapsed < 1
+        assert status["services"]["a"]["message"] == "Timed out after 0.2s"
+        assert status["services"]["c"]["status"] == "connected"
+
+    def test_status_is_cached_between_refreshes(self):
+        """Test that the status is served from the cache by the background task."""
+        calls = []
+
+        async def counted():
+            calls.append(1)
+            return {"status": "connected"}
+
+        async def run():
+            monitor = _monitor({"postgresql": counted}, interval=60)
+            await monitor.start()
+            await asyncio.sleep(0.05)
+            for _ in range(10):
+                await monitor.get_status()
+            await monitor.stop()
+
+        asyncio.run(run())
+        assert len(calls) == 1
+
+    def test_stale_status_is_not_ready(self):
+        """Test that a status older than max_age is reported as not ready."""
+
+        async def run():
+            monitor = _monitor({"postgresql": _connected}, interval=60)
+            await monitor.refresh()
+            monitor._task = object()  # pretend a refresh task is stuck
+            monitor._checked_at -= monitor.max_age + 1
+            return await monitor.get_status()
+
+        status = asyncio.run(run())
+        assert status["ready"] is False
+        assert status["message"] == "Health status is stale"
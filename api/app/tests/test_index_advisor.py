@@ -0,0 +1,100 @@
+"""
+Tests for the index advisor.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.core.metrics_store import InMemoryMetricsBackend
+from app.core.monitoring import MonitoringService, monitoring_service
+from app.db.index_advisor import IndexAdvisor
+from app.tests.conftest import engine
+
+USAGE = {
+    "sort": {
+        "people:mass": {"count": 40, "avg_ms": 120.0},
+        "people:gender,mass": {"count": 30, "avg_ms": 300.0},
+        # Already served by the name index
+        "people:name": {"count": 500, "avg_ms": 90.0},
+        # Too rare to matter
+        "planets:climate": {"count": 2, "avg_ms": 900.0},
+    },
+    "search": {"people:name": {"count": 100, "avg_ms": 80.0}},
+}
+
+
+def test_column_usage_combines_counts_and_latency():
+    """Test that sort and search usage is reported per column with latency."""
+    service = MonitoringService(InMemoryMetricsBackend())
+    service.record_sort("people", "mass", "asc", execution_time_ms=10.0)
+    service.record_sort("people", "mass", "desc", execution_time_ms=30.0)
+    service.record_search("planets", {"name": "tat"}, execution_time_ms=5.0)
+
+    service.shutdown()
+
+    usage = service.get_column_usage()
+    assert usage["sort"] == {"people:mass": {"count": 2, "avg_ms": 20.0}}
+    assert usage["search"] == {"planets:name": {"count": 1, "avg_ms": 5.0}}
+
+
+def test_recommendations_on_sqlite(db_session):
+    """Test B-tree advice for hot sorts and skipped contains-searches."""
+    advice = IndexAdvisor(engine).recommend(USAGE)
+
+    names = [r["name"] for r in advice["recommendations"]]
+    # Ordered by total time spent: 30 x 300ms before 40 x 120ms
+    assert names == ["ix_people_gender_mass", "ix_people_mass"]
+    assert advice["recommendations"][0]["statement"] == (
+        "CREATE INDEX IF NOT EXISTS ix_people_gender_mass ON people (gender, mass)"
+    )
+    assert advice["skipped"][0]["columns"] == ["name"]
+
+
+def test_apply_creates_index(db_session):
+    """Test that an applied recommendation is not suggested again."""
+    advisor = IndexAdvisor(engine)
+    recommendation = advisor.recommend(USAGE)["recommendations"][1]
+    advisor.apply(recommendation)
+    try:
+        indexes = {index["name"] for index in inspect(engine).get_indexes("people")}
+        assert "ix_people_mass" in indexes
+        names = [r["name"] for r in advisor.recommend(USAGE)["recommendations"]]
+        # The composite index is still advised: its leading column is gender
+        assert names == ["ix_people_gender_mass"]
+    finally:
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX ix_people_mass")
+
+
+@pytest.mark.parametrize("trigram", [True, False])
+def test_search_advice_on_postgresql(db_session, monkeypatch, trigram):
+    """Test that searches get a trigram index only when pg_trgm is installed."""
+    monkeypatch.setattr(IndexAdvisor, "dialect", property(lambda self: "postgresql"))
+    monkeypatch.setattr(IndexAdvisor, "_trigram_available", lambda self: trigram)
+    advice = IndexAdvisor(engine).recommend({"search": USAGE["search"]})
+
+    if trigram:
+        assert [r["kind"] for r in advice["recommendations"]] == ["trigram"]
+        assert advice["skipped"] == []
+    else:
+        assert advice["recommendations"] == []
+        assert "install pg_trgm" in advice["skipped"][0]["reason"]
+
+
+def test_index_advice_endpoint(client: TestClient, monkeypatch):
+    """Test the advice endpoint and that applying is disabled by default."""
+    monkeypatch.setattr(monitoring_service, "get_column_usage", lambda: USAGE)
+
+    response = client.get("/api/monitoring/index-advice")
+    assert response.status_code == 200
+    assert response.json()["apply_enabled"] is False
+    assert len(response.json()["recommendations"]) == 2
+
+    response = client.post("/api/monitoring/index-advice/apply?name=ix_people_mass")
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "INDEX_ADVISOR_ALLOW_APPLY", True)
+    response = client.post("/api/monitoring/index-advice/apply?name=ix_nope")
+    assert response.status_code == 404
@@ -0,0 +1,86 @@
+"""
+Tests for the load generator.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.main import app
+from app.tools.loadgen import (
+    DEFAULT_MIX,
+    LatencyHistogram,
+    TrafficMix,
+    build_client,
+    compare_reports,
+    run_load,
+)
+
+
+def test_histogram_percentiles_are_accurate():
+    """Test that histogram percentiles stay within the bucket precision"""
+    rng = random.Random(1)
+    values = sorted(int(rng.lognormvariate(9, 1)) for _ in range(20000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for pct in (50, 90, 99, 99.9):
+        exact = values[int(pct / 100 * len(values)) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.02)
+    assert histogram.percentile(100) == values[-1]
+
+    other = LatencyHistogram()
+    other.record(10**7)
+    histogram.merge(other)
+    assert histogram.total == 20001
+    assert histogram.max == 10**7
+
+
+def test_traffic_mix_builds_weighted_requests():
+    """Test that the mix follows its weights and builds valid requests"""
+    mix = TrafficMix({"people_list": 3, "insight": 1, "people_update": 0}, seed=2)
+    names = [mix.next()[0] for _ in range(4000)]
+    assert set(names) == {"people_list", "insight"}
+    assert 2.5 < names.count("people_list") / names.count("insight") < 3.5
+
+    method, path, body = mix.op_people_sort()
+    assert method == "GET" and "sort_by=" in path and body is None
+    with pytest.raises(ValueError):
+        TrafficMix({"nope": 1})
+    assert set(TrafficMix.parse("people_list=2,insight")) == {"people_list", "insight"}
+    assert set(DEFAULT_MIX) <= set(TrafficMix.operations())
+    # The default mix never changes the target's data
+    writes = {"people_update", "people_create"}
+    assert not writes & set(TrafficMix(DEFAULT_MIX).weights)
+
+
+@pytest.mark.parametrize("mode", ["closed", "open"])
+def test_run_load_in_process(client, mode):
+    """Test a short closed and open loop run against the app"""
+    client.post("/api/people/", json={"name": "Luke Skywalker", "gender": "male"})
+    client.post("/api/planets/", json={"name": "Tatooine", "climate": "arid"})
+
+    async def run():
+        async with build_client(None, app) as http:
+            return await run_load(
+                http,
+                TrafficMix(DEFAULT_MIX, seed=3),
+                mode=mode,
+                duration=0.5,
+                warmup=0.1,
+                users=4,
+                rate=100,
+            )
+
+    report = asyncio.run(run())
+    assert report["requests"] > 0
+    assert report["config"]["mode"] == mode
+    assert report["latency_ms"]["p50"] > 0
+    assert report["rps"] > 0
+    # Warmup requests are not recorded
+    assert report["requests"] == sum(
+        op["requests"] for op in report["operations"].values()
+    )
+    assert compare_reports(report, report)[1].startswith("overall")
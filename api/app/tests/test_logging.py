@@ -0,0 +1,102 @@
+"""
+Tests for the logging pipeline.
+"""
+
+import json
+import logging
+
+import pytest
+
+from app.core.events import RotatingFileWriter
+from app.core.logging import (
+    get_logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def async_logging(tmp_path):
+    """Configure async logging into a temporary file, restore defaults afterwards."""
+    log_file = tmp_path / "app.log"
+    setup_logging(log_file=str(log_file), mode="async", level="INFO")
+    yield log_file
+    shutdown_logging()
+    setup_logging()
+
+
+def _read_json_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestAsyncLogging:
+    """Test cases for the batched background logging mode."""
+
+    def test_records_keep_extra_fields_and_location(self, async_logging):
+        """Test that stdlib records keep event_data and their caller location."""
+        logging.getLogger("app.tests.sample").info(
+            "Search event",
+            extra={"event_type": "search", "event_data": {"term": "luke"}},
+        )
+        shutdown_logging()
+
+        (record,) = _read_json_lines(async_logging)
+        assert record["message"] == "Search event"
+        assert record["level"] == "INFO"
+        assert record["name"] == "app.tests.sample"
+        assert record["function"] == "test_records_keep_extra_fields_and_location"
+        assert record["event_type"] == "search"
+        assert record["event_data"] == {"term": "luke"}
+
+    def test_records_below_level_are_dropped_early(self, async_logging):
+        """Test that records below the threshold never reach the sink."""
+        logger = logging.getLogger("app.tests.sample")
+        assert not logger.isEnabledFor(logging.DEBUG)
+
+        logger.debug("Not logged")
+        logger.warning("Logged")
+        stats = get_logging_stats()
+        shutdown_logging()
+
+        assert stats[0]["emitted"] == 1
+        assert [r["message"] for r in _read_json_lines(async_logging)] == ["Logged"]
+
+    def test_exceptions_are_serialized(self, async_logging):
+        """Test that exception tracebacks are written with the record."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("app.tests.sample").exception("Failed")
+        shutdown_logging()
+
+        (record,) = _read_json_lines(async_logging)
+        assert "ValueError: boom" in record["exception"]
+
+
+class TestRotatingFileWriter:
+    """Test cases for the size-rotated batch writer."""
+
+    def test_rotates_when_file_would_exceed_limit(self, tmp_path):
+        """Test that batches rotate the file and keep a bounded number of backups."""
+        path = tmp_path / "events.log"
+        writer = RotatingFileWriter(str(path), max_bytes=20, backup_count=2)
+        for i in range(4):
+            writer.write_lines([f"batch-{i}-xxxxxxxx"])
+        writer.close()
+
+        assert path.read_text() == "batch-3-xxxxxxxx\n"
+        assert (tmp_path / "events.log.1").read_text() == "batch-2-xxxxxxxx\n"
+        assert (tmp_path / "events.log.2").read_text() == "batch-1-xxxxxxxx\n"
+        assert not (tmp_path / "events.log.3").exists()
+
+    def test_limit_counts_bytes(self, tmp_path):
+        """Test that the size limit counts encoded bytes, not characters."""
+        path = tmp_path / "events.log"
+        writer = RotatingFileWriter(str(path), max_bytes=20, backup_count=1)
+        writer.write_lines(["ééééé"])  # 6 characters, 11 bytes
+        writer.write_lines(["ééééé"])
+        writer.close()
+
+        assert path.read_text(encoding="utf-8") == "ééééé\n"
+        assert (tmp_path / "events.log.1").read_text(encoding="utf-8") == "ééééé\n"
@@ -0,0 +1,74 @@
+"""
+Tests for the ASGI monitoring middleware.
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.middleware import MonitoringMiddleware, RequestTimingMiddleware
+
+
+def _streaming_app() -> FastAPI:
+    """Build a small app with a streaming endpoint behind the middlewares."""
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+    app.add_middleware(MonitoringMiddleware)
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_monitoring_headers_are_added(client: TestClient):
+    """Test that timing and request ID headers are added to responses."""
+    response = client.get("/api/people/")
+    assert response.status_code == 200
+    assert response.headers["X-Execution-Time"].endswith("ms")
+    assert response.headers["X-Request-ID"]
+
+
+def test_request_ids_are_unique(client: TestClient):
+    """Test that generated request IDs differ between requests."""
+    first = client.get("/").headers["X-Request-ID"]
+    second = client.get("/").headers["X-Request-ID"]
+    assert first != second
+
+
+def test_inbound_request_id_is_propagated(client: TestClient):
+    """Test that a client supplied X-Request-ID is echoed back."""
+    response = client.get("/", headers={"X-Request-ID": "trace-abc-123"})
+    assert response.headers["X-Request-ID"] == "trace-abc-123"
+
+
+def test_oversized_request_id_is_replaced(client: TestClient):
+    """Test that malformed inbound request IDs are not propagated."""
+    response = client.get("/", headers={"X-Request-ID": "x" * 500})
+    assert response.headers["X-Request-ID"] != "x" * 500
+
+
+def test_streaming_response_passes_through():
+    """Test that streaming responses are not buffered or broken."""
+    with TestClient(_streaming_app()) as client:
+        response = client.get("/stream")
+    assert response.status_code == 200
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert "X-Request-ID" in response.headers
+    assert "X-Request-Time" in response.headers
+
+
+def test_errors_propagate_through_middleware():
+    """Test that endpoint exceptions still produce a 500 response."""
+    with TestClient(_streaming_app(), raise_server_exceptions=False) as client:
+        response = client.get("/boom")
+    assert response.status_code == 500
@@ -0,0 +1,244 @@
+"""
+Tests for monitoring metrics and their storage backends.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.events import EventSink
+from app.core.metrics_store import (
+    InMemoryMetricsBackend,
+    SharedMemoryMetricsBackend,
+    read_metrics_file,
+)
+from app.core.monitoring import MonitoringService, SearchEvent, SortEvent
+from app.core.sampling import LogSampler
+
+
+def _record_searches(directory: str, count: int):
+    """Simulate a worker process recording search events."""
+    service = MonitoringService(SharedMemoryMetricsBackend(directory))
+    for _ in range(count):
+        service.log_search_event(
+            SearchEvent(
+                resource_type="people",
+                search_params={"name": "Luke"},
+                execution_time_ms=12.0,
+            )
+        )
+
+
+class TestMetricsBackends:
+    """Test cases for the metrics storage backends."""
+
+    def test_in_memory_backend_counts_and_histograms(self):
+        """Test counters and histogram buckets of the in-memory backend."""
+        backend = InMemoryMetricsBackend()
+        backend.inc("a")
+        backend.inc("a", 2)
+        backend.observe("latency", 7)
+
+        values = backend.snapshot()
+        assert values["a"] == 3
+        assert values["latency|bucket|10"] == 1
+        assert values["latency|count"] == 1
+        assert values["latency|sum"] == 7
+
+    def test_shared_memory_backend_grows_file(self, tmp_path):
+        """Test that the mmap file grows past its initial size."""
+        backend = SharedMemoryMetricsBackend(str(tmp_path))
+        for i in range(5000):
+            backend.inc(f"search|term|name:term-{i}")
+
+        values = backend.snapshot()
+        assert len(values) == 5000
+        assert values["search|term|name:term-4999"] == 1
+
+    def test_shared_memory_backend_aggregates_workers(self, tmp_path):
+        """Test that counters from several worker processes are summed."""
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_record_searches, args=(str(tmp_path), 25))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        service = MonitoringService(SharedMemoryMetricsBackend(str(tmp_path)))
+        metrics = service.get_search_metrics()
+
+        assert metrics["total_searches"] == 75
+        assert metrics["searches_by_resource"]["people"] == 75
+        assert metrics["popular_search_terms"]["name:luke"] == 75
+        assert metrics["average_execution_time"] == pytest.approx(12.0)
+        assert metrics["latency_buckets_ms"]["25"] == 75
+
+    def test_dead_worker_files_are_archived(self, tmp_path):
+        """Test that files of exited workers are folded into the archive."""
+        context = multiprocessing.get_context("fork")
+        worker = context.Process(target=_record_searches, args=(str(tmp_path), 5))
+        worker.start()
+        worker.join()
+        assert os.path.exists(tmp_path / f"metrics_{worker.pid}.db")
+
+        backend = SharedMemoryMetricsBackend(str(tmp_path))
+        backend.inc("search|total")
+        assert backend.snapshot()["search|total"] == 6
+
+        assert not os.path.exists(tmp_path / f"metrics_{worker.pid}.db")
+        archive = read_metrics_file(str(tmp_path / "metrics_archive.db"))
+        assert archive["search|total"] == 5
+
+
+class TestMonitoringService:
+    """Test cases for MonitoringService metrics."""
+
+    def test_sort_metrics(self):
+        """Test sort metrics built from backend counters."""
+        service = MonitoringService(InMemoryMetricsBackend())
+        service.log_sort_event(
+            SortEvent(
+                resource_type="planets",
+                sort_field="population",
+                sort_order="desc",
+                execution_time_ms=3.0,
+            )
+        )
+        service.shutdown()
+
+        metrics = service.get_sort_metrics()
+        assert metrics["total_sorts"] == 1
+        assert metrics["sorts_by_resource"] == {"people": 0, "planets": 1}
+        assert metrics["popular_sort_fields"] == {"population": 1}
+        assert metrics["sort_order_distribution"] == {"asc": 0, "desc": 1}
+
+    def test_metrics_endpoint(self, client: TestClient):
+        """Test that the metrics endpoint exposes request metrics."""
+        client.get("/api/people/?name=luke")
+        response = client.get("/api/monitoring/metrics")
+        assert response.status_code == 200
+        data = response.json()
+        assert "search_metrics" in data
+        assert data["request_metrics"]["total_requests"] >= 1
+        assert data["backend"]["backend"] == "memory"
+
+
+class TestEventSink:
+    """Test cases for the batched event sink."""
+
+    def test_events_are_written_in_batches(self):
+        """Test that buffered events reach the writer on flush."""
+        batches = []
+        sink = EventSink("test", batches.append, capacity=100, batch_size=10)
+        for i in range(25):
+            sink.emit(("api_request", float(i)))
+        sink.stop()
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert sink.stats()["written"] == 25
+
+    def test_overflow_drops_new_events(self):
+        """Test the drop-on-overflow policy and dropped counters."""
+        release = threading.Event()
+        written = []
+
+        def slow_writer(batch):
+            release.wait()
+            written.extend(batch)
+
+        drops = []
+        sink = EventSink(
+            "test",
+            slow_writer,
+            capacity=5,
+            batch_size=5,
+            flush_interval=0.01,
+            on_drop=lambda: drops.append(1),
+        )
+        sink.emit(("first",))
+        # Wait until the worker holds the first event inside the writer
+        while sink.stats()["queued"]:
+            time.sleep(0.001)
+
+        results = [sink.emit((i,)) for i in range(8)]
+        assert results == [True] * 5 + [False] * 3
+        assert sink.stats()["dropped"] == 3
+        assert len(drops) == 3
+
+        release.set()
+        sink.stop()
+        assert written == [("first",)] + [(i,) for i in range(5)]
+
+    def test_events_serialized_to_file(self, tmp_path):
+        """Test that events are written as JSON lines on shutdown."""
+        log_file = tmp_path / "events.log"
+        service = MonitoringService(
+            InMemoryMetricsBackend(), event_log_file=str(log_file)
+        )
+        service.record_search(
+            resource_type="people",
+            search_params={"name": "Leia"},
+            results_count=1,
+            execution_time_ms=2.5,
+        )
+        service.log_api_request("GET", "/api/people/", 200, 4.0)
+        service.shutdown()
+
+        lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert [line["event_type"] for line in lines] == ["search", "api_request"]
+        assert lines[0]["search_params"] == {"name": "Leia"}
+        assert lines[1]["status_code"] == 200
+
+
+class TestLogSampler:
+    """Test cases for monitoring log sampling."""
+
+    def test_route_override_beats_event_and_global_rates(self):
+        """Test the precedence of sampling rate overrides."""
+        sampler = LogSampler(
+            default_rate=0.5,
+            event_rates={"search": 0.2},
+            route_rates={"/api/people": 0.1, "/api/people/facets": 1.0},
+        )
+        assert sampler.rate_for("sort") == 0.5
+        assert sampler.rate_for("search") == 0.2
+        assert sampler.rate_for("api_request", "/api/people/1") == 0.1
+        assert sampler.rate_for("api_request", "/api/people/facets") == 1.0
+
+    def test_errors_and_slow_requests_are_always_kept(self):
+        """Test that errors and slow events bypass sampling."""
+        sampler = LogSampler(default_rate=0.0, slow_threshold_ms=100)
+        assert sampler.should_log("api_request", "/", 200, 5.0) is False
+        assert sampler.should_log("api_request", "/", 503, 5.0) is True
+        assert sampler.should_log("api_request", "/", 200, 150.0) is True
+
+    def test_counters_stay_exact_when_lines_are_sampled(self):
+        """Test that sampled-out events still update the metrics."""
+        batches = []
+        service = MonitoringService(
+            InMemoryMetricsBackend(), sampler=LogSampler(default_rate=0.0)
+        )
+        service.event_sink.writer = batches.append
+        for _ in range(10):
+            service.log_api_request("GET", "/api/people/", 200, 1.0)
+        service.log_api_request("GET", "/api/people/", 500, 1.0)
+        service.shutdown()
+
+        assert service.get_request_metrics()["total_requests"] == 11
+        assert sum(len(batch) for batch in batches) == 1
+        assert service.get_sampling_stats()["skipped"] == {"api_request": 10}
+
+    def test_sampling_endpoint(self, client: TestClient):
+        """Test that the effective sampling rates are exposed."""
+        response = client.get("/api/monitoring/sampling")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["effective_rates"]["search"] == data["default_rate"]
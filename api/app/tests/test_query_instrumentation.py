@@ -0,0 +1,76 @@
+"""
+Tests for SQL query instrumentation.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.instrumentation import (
+    finish_request_stats,
+    n_plus_one_log,
+    normalize_statement,
+    slow_query_log,
+    start_request_stats,
+)
+
+
+def test_normalize_statement():
+    """Test that literals, parameters and IN lists are collapsed."""
+    assert normalize_statement(
+        "SELECT * FROM people WHERE id IN (1, 2, 3) AND name = 'Luke'"
+    ) == ("SELECT * FROM people WHERE id IN (?) AND name = ?")
+    assert normalize_statement(
+        "SELECT people.id FROM people\n WHERE people.id = %(id_1)s LIMIT %(param_1)s"
+    ) == ("SELECT people.id FROM people WHERE people.id = ? LIMIT ?")
+    assert normalize_statement("SELECT x::text FROM t") == "SELECT x::text FROM t"
+
+
+def test_debug_headers_report_query_count(client: TestClient, monkeypatch):
+    """Test per-request query count and DB time headers in debug mode."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    person = client.post("/api/people/", json={"name": "Luke Skywalker"}).json()
+
+    response = client.put(f"/api/people/{person['id']}", json={"height": "172"})
+    assert response.status_code == 200
+    # get, update, and the refresh after commit
+    assert int(response.headers["X-DB-Query-Count"]) >= 3
+    assert response.headers["X-DB-Time"].endswith("ms")
+    assert response.headers["X-DB-Slowest-Query"].endswith("ms")
+
+
+def test_debug_headers_hidden_outside_debug(client: TestClient, monkeypatch):
+    """Test that query headers are only sent in debug mode."""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    response = client.get("/api/people/")
+    assert "X-DB-Query-Count" not in response.headers
+
+
+def test_n_plus_one_detection(db_session, monkeypatch):
+    """Test that a repeated statement shape within one request is flagged."""
+    monkeypatch.setattr(settings, "N_PLUS_ONE_THRESHOLD", 3)
+    token = start_request_stats()
+    for i in range(4):
+        db_session.execute(text("SELECT :value"), {"value": i})
+    stats = finish_request_stats(token, "GET", "/api/people/")
+
+    assert stats.count == 4
+    assert stats.repeated_shapes(3) == {"SELECT ?": 4}
+    assert n_plus_one_log.recent()[0]["statement"] == "SELECT ?"
+
+
+def test_slow_query_log(db_session, monkeypatch):
+    """Test that statements over the threshold are recorded."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    db_session.execute(text("SELECT 42"))
+    assert slow_query_log.recent()[0]["statement"] == "SELECT ?"
+
+
+def test_db_metrics_endpoint(client: TestClient):
+    """Test that SQL metrics are served by the monitoring router."""
+    client.get("/api/people/")
+    response = client.get("/api/monitoring/metrics/db")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_queries"] >= 2
+    assert "recent_slow_queries" in data
@@ -0,0 +1,114 @@
+"""
+Tests for traffic capture and replay.
+"""
+
+import asyncio
+import json
+import os
+
+import httpx
+
+from app.core import capture
+from app.core.capture import TrafficCapture, worker_capture_file
+from app.main import app
+from app.tools.loadgen import build_client
+from app.tools.replay import (
+    CapturedRequest,
+    capture_files,
+    read_capture,
+    replay,
+    route_of,
+)
+
+
+def test_middleware_captures_requests(client, tmp_path, monkeypatch):
+    """Test that finished requests are written to the capture file"""
+    path = tmp_path / "capture.jsonl"
+    traffic_capture = TrafficCapture(str(path))
+    monkeypatch.setattr(capture, "traffic_capture", traffic_capture)
+
+    client.get("/api/people/?name=luke&page=1")
+    client.get("/api/people/999")
+    client.get("/livez")
+    traffic_capture.shutdown()
+
+    lines = [json.loads(line) for line in open(worker_capture_file(str(path)))]
+    assert [line[1:5] for line in lines] == [
+        ["GET", "/api/people/", "name=luke&page=1", 200],
+        ["GET", "/api/people/999", "", 404],
+    ]
+    assert all(isinstance(line[0], float) and line[5] > 0 for line in lines)
+
+
+def test_capture_rotates_and_reads_oldest_first(tmp_path):
+    """Test that rotated capture files of every worker are merged in arrival order"""
+    path = str(tmp_path / "capture.jsonl")
+    traffic_capture = TrafficCapture(path, max_bytes=200, backup_count=10)
+    for i in range(20):
+        traffic_capture.record("GET", f"/api/people/{i}", b"", 200, 1.0)
+        traffic_capture.sink.flush()
+    traffic_capture.shutdown()
+    # Another worker's file, with a request in the middle of the others
+    other = worker_capture_file(path, os.getpid() + 1)
+    written = read_capture(capture_files(path))
+    middle = (written[9].started + written[10].started) / 2
+    with open(other, "w") as f:
+        f.write(json.dumps([middle, "GET", "/api/planets/1", "", 200, 1.0]) + "\n")
+
+    files = capture_files(path)
+    assert len(files) > 3
+    assert files[-2] == worker_capture_file(path) and files[-1] == other
+    paths = [r.path for r in read_capture(files)]
+    assert paths[10] == "/api/planets/1"
+    assert [p for p in paths if "people" in p] == [
+        f"/api/people/{i}" for i in range(20)
+    ]
+    assert route_of("/api/people/12") == "/api/people/{id}"
+
+
+def test_replay_keeps_inter_arrival_times(client):
+    """Test replaying at 2x speed and comparing status codes"""
+    client.post("/api/people/", json={"name": "Luke Skywalker"})
+    requests = [
+        CapturedRequest(100.0, "GET", "/api/people/", "name=luke", 200, 3.0),
+        CapturedRequest(100.2, "GET", "/api/people/1", "", 200, 2.0),
+        CapturedRequest(100.4, "GET", "/api/people/2", "", 200, 2.0),
+    ]
+
+    async def run():
+        async with build_client(None, app) as http:
+            return await replay(http, requests, speed=2.0)
+
+    report = asyncio.run(run())
+    assert report["requests"] == 3
+    # 0.4s of captured traffic at 2x takes about 0.2s
+    assert 0.19 <= report["elapsed"] < 1.0
+    # /api/people/2 does not exist on the target
+    assert report["status_mismatches"] == 1
+    assert report["routes"]["GET /api/people/{id}"]["requests"] == 2
+    assert report["routes"]["GET /api/people/"]["captured_ms"]["p50"] == 3.0
+
+
+def test_replay_bounds_pending_tasks():
+    """Test that a fast replay never holds more than max_in_flight requests"""
+    peak = {"sending": 0, "tasks": 0}
+
+    class SlowClient:
+        sending = 0
+
+        async def request(self, method, url):
+            self.sending += 1
+            peak["sending"] = max(peak["sending"], self.sending)
+            peak["tasks"] = max(peak["tasks"], len(asyncio.all_tasks()))
+            await asyncio.sleep(0.001)
+            self.sending -= 1
+            return httpx.Response(200)
+
+    requests = [
+        CapturedRequest(100.0, "GET", f"/api/people/{i}", "", 200, 1.0)
+        for i in range(200)
+    ]
+    report = asyncio.run(replay(SlowClient(), requests, speed=0, max_in_flight=4))
+    assert report["requests"] == 200 and report["status_mismatches"] == 0
+    # The replay coroutine itself plus at most four senders
+    assert peak["sending"] == 4 and peak["tasks"] <= 5
@@ -0,0 +1,133 @@
+"""
+Tests for read-replica routing, using separate SQLite files as primary and replicas.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.main as main
+from app.db import session
+from app.db.base import Base
+from app.db.replicas import LEAST_BUSY, ReplicaRouter
+from app.main import app
+from app.tests.conftest import stub_health_monitor
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """A primary and two replica databases with the application schema."""
+    engines = {
+        name: create_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        for name in ("primary", "replica_a", "replica_b")
+    }
+    for engine in engines.values():
+        Base.metadata.create_all(bind=engine)
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+def _router(databases, **kwargs) -> ReplicaRouter:
+    return ReplicaRouter(
+        sessionmaker(bind=databases["primary"]),
+        [databases["replica_a"], databases["replica_b"]],
+        **kwargs,
+    )
+
+
+def _read_from(router: ReplicaRouter, client: str = None) -> str:
+    db = router.read_session(client)
+    replica = db.info.get("replica")
+    router.release(db)
+    return replica.name if replica else "primary"
+
+
+def test_round_robin(databases):
+    """Test that reads alternate between the replicas."""
+    router = _router(databases)
+    assert [_read_from(router) for _ in range(4)] == [
+        "replica-0",
+        "replica-1",
+        "replica-0",
+        "replica-1",
+    ]
+    assert [r["reads"] for r in router.status()["replicas"]] == [2, 2]
+
+
+def test_least_busy(databases):
+    """Test that a replica with a session in use is avoided."""
+    router = _router(databases, strategy=LEAST_BUSY)
+    held = router.read_session()
+    busy = held.info["replica"].name
+    assert {_read_from(router) for _ in range(3)} == (
+        {"replica-0", "replica-1"} - {busy}
+    )
+    router.release(held)
+    assert [r["in_use"] for r in router.status()["replicas"]] == [0, 0]
+
+
+def test_read_your_writes(databases):
+    """Test that a client reads from the primary for a while after writing."""
+    router = _router(databases, read_your_writes=0.1)
+    router.note_write("alice")
+    assert _read_from(router, "alice") == "primary"
+    assert _read_from(router, "bob").startswith("replica")
+
+    time.sleep(0.15)
+    assert _read_from(router, "alice").startswith("replica")
+
+
+def test_lagging_replicas_are_evicted(databases):
+    """Test eviction on lag or errors, readmission and the primary fallback."""
+    lag = {databases["replica_a"]: 30.0, databases["replica_b"]: 0.5}
+
+    def probe(engine):
+        if isinstance(lag[engine], Exception):
+            raise lag[engine]
+        return lag[engine]
+
+    router = _router(databases, max_lag=10.0, lag_probe=probe)
+    replicas = router.check_health()
+    assert [r["healthy"] for r in replicas] == [False, True]
+    assert {_read_from(router) for _ in range(4)} == {"replica-1"}
+
+    lag[databases["replica_b"]] = ConnectionError("connection refused")
+    router.check_health()
+    assert _read_from(router) == "primary"
+    assert router.status()["primary_reads"] == 1
+
+    lag[databases["replica_a"]] = 0.0
+    router.check_health()
+    assert _read_from(router) == "replica-0"
+
+
+def test_endpoints_route_reads_to_replicas(databases, monkeypatch):
+    """Test routing through the API: writes on the primary, reads on a replica."""
+    router = ReplicaRouter(
+        sessionmaker(bind=databases["primary"]), [databases["replica_a"]]
+    )
+    monkeypatch.setattr(session, "replica_router", router)
+    monkeypatch.setattr(
+        session, "SessionLocal", sessionmaker(bind=databases["primary"])
+    )
+    monkeypatch.setattr(main, "health_monitor", stub_health_monitor())
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/people/", json={"name": "Luke"}, headers={"X-Client-ID": "alice"}
+        )
+        assert response.status_code == 201
+
+        # The writer sees its write on the primary ...
+        response = client.get("/api/people/", headers={"X-Client-ID": "alice"})
+        assert response.json()["total"] == 1
+        # ... while other clients read from the (not replicating) replica file
+        response = client.get("/api/people/", headers={"X-Client-ID": "bob"})
+        assert response.json()["total"] == 0
+
+        status = client.get("/api/monitoring/replicas").json()
+        assert status["primary_reads"] == 1
+        assert status["replicas"][0]["reads"] == 1
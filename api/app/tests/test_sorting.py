@@ -6,6 +6,7 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.api.sorting import (
+    parse_sort,
     SortStrategy,
     PeopleSortStrategy,
     PlanetsSortStrategy,
@@ -93,3 +94,80 @@ class TestSortFieldEnum:
         """Test that SortOrder enum has correct values."""
         assert SortOrder.ASC == "asc"
         assert SortOrder.DESC == "desc"
+
+
+class TestSortPlans:
+    """Test cases for precompiled multi-key sort plans."""
+
+    def test_parse_sort(self):
+        """Test parsing multi-key sort specifications."""
+        assert parse_sort("gender,-mass") == (
+            (SortField.GENDER, SortOrder.ASC),
+            (SortField.MASS, SortOrder.DESC),
+        )
+        assert parse_sort(" name ,") == ((SortField.NAME, SortOrder.ASC),)
+        for spec in ("colour", "name,-name", "name,mass,height,gender"):
+            with pytest.raises(ValueError):
+                parse_sort(spec)
+
+    def test_plan_appends_id_tiebreak_and_caches(self):
+        """Test that plans end with the id tiebreak and reuse clause tuples."""
+        factory = SortStrategyFactory()
+        plan = factory.plans.get(People)
+        assert factory.plans.get(People) is plan
+
+        keys = parse_sort("gender,-mass")
+        clauses = plan.order_by(keys)
+        assert [str(clause) for clause in clauses] == [
+            "people.gender ASC",
+            "people.mass DESC",
+            "people.id ASC",
+        ]
+        assert plan.order_by(parse_sort("gender,-mass")) is clauses
+        assert [str(clause) for clause in plan.order_by(())] == ["people.id ASC"]
+
+        with pytest.raises(ValueError):
+            plan.order_by(parse_sort("diameter"))
+
+    def test_registering_strategy_resets_plans(self):
+        """Test that plans are rebuilt after a new strategy is registered."""
+        factory = SortStrategyFactory()
+        plan = factory.plans.get(People)
+        factory.register_strategy("custom", DefaultSortStrategy())
+        assert factory.plans.get(People) is not plan
+
+    def test_multi_key_sort_endpoint(self, client):
+        """Test that sort=gender,-mass orders pages with a stable tiebreak."""
+        for name, gender, mass in [
+            ("A", "male", "80"),
+            ("B", "female", "50"),
+            ("C", "male", "90"),
+            ("D", "female", "60"),
+            ("E", "male", "90"),
+        ]:
+            client.post(
+                "/api/people/", json={"name": name, "gender": gender, "mass": mass}
+            )
+
+        response = client.get("/api/people/?sort=gender,-mass")
+        assert response.status_code == 200
+        assert [p["name"] for p in response.json()["items"]] == [
+            "D",
+            "B",
+            "C",
+            "E",
+            "A",
+        ]
+
+        # Pages of a non-unique sort column neither repeat nor skip rows
+        names = []
+        for page in (1, 2, 3):
+            response = client.get(f"/api/people/?sort_by=gender&size=2&page={page}")
+            names += [p["name"] for p in response.json()["items"]]
+        assert names == ["B", "D", "A", "C", "E"]
+
+    def test_invalid_sort_is_rejected(self, client):
+        """Test that unknown or inapplicable sort fields return 400."""
+        assert client.get("/api/people/?sort=colour").status_code == 400
+        assert client.get("/api/people/?sort=diameter").status_code == 400
+        assert client.get("/api/planets/?sort=-population,name").status_code == 200
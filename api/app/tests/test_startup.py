@@ -0,0 +1,89 @@
+"""
+Tests for cold start: schema version check, warm-up and startup timings.
+"""
+
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.startup import StartupStats, warm_up
+from app.db.init_db import init_db, stored_schema_version
+from app.tests.conftest import TestingSessionLocal
+from app.tools.startup_profile import parse_importtime, summarize
+
+
+def test_init_db_skips_known_schema(tmp_path, monkeypatch):
+    """Test that tables are only created while the schema version is unknown."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    assert stored_schema_version(engine) is None
+    assert init_db(engine) is True
+    assert stored_schema_version(engine) is not None
+    assert init_db(engine) is False
+
+    monkeypatch.setattr(settings, "DB_INIT_SKIP_KNOWN_SCHEMA", False)
+    assert init_db(engine) is True
+    engine.dispose()
+
+
+def test_startup_stats():
+    """Test phase marks and that only the first request is recorded."""
+    stats = StartupStats()
+    stats.mark("import")
+    stats.record_ready()
+    stats.record_first_request("GET", "/api/people/")
+    stats.record_first_request("GET", "/api/planets/")
+
+    report = stats.report()
+    assert set(report["phases_ms"]) == {"import"}
+    assert report["first_request"] == "GET /api/people/"
+    assert report["time_to_first_request_ms"] >= report["ready_ms"]
+
+
+def test_warm_up(db_session):
+    """Test that warm-up opens pool connections and runs the list queries."""
+    assert warm_up(TestingSessionLocal, connections=2) == {"connections": 2}
+
+
+def test_startup_endpoint(client: TestClient):
+    """Test that startup timings and time to first request are served."""
+    client.get("/api/people/")
+    data = client.get("/api/monitoring/startup").json()
+    assert data["time_to_first_request_ms"] > 0
+    assert "import" in data["phases_ms"]
+
+
+def test_hot_path_does_not_import_optional_modules():
+    """Test that httpx, jose and passlib are not imported with the application."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.main; "
+            "print(sorted(m for m in ('httpx', 'jose', 'passlib') if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_import_profile_summary():
+    """Test parsing of ``-X importtime`` output."""
+    modules = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     app.core.config\n"
+        "import time:      2000 |       5000 |   fastapi\n"
+        "import time:       500 |       5600 | app.main\n"
+    )
+    assert modules["fastapi"] == (2000, 5000)
+    report = summarize(modules, top=2)
+    assert [row["module"] for row in report["slowest_self"]] == ["fastapi", "app.main"]
+    assert report["packages_ms"] == {"fastapi": 2.0, "app": 0.6}
+    assert [row["module"] for row in report["application"]] == [
+        "app.main",
+        "app.core.config",
+    ]
@@ -0,0 +1,99 @@
+"""
+Tests for the distribution statistics endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import stats
+from app.api.stats import grouped_summary, histogram_edges, parse_numeric
+from app.db.models import People
+
+
+def test_parse_numeric():
+    """Test parsing of SWAPI number strings."""
+    np = pytest.importorskip("numpy")
+    parsed = parse_numeric(["1,358", "78.2", "unknown", None, " 5 ", "1,358"])
+    assert np.array_equal(
+        parsed, [1358.0, 78.2, np.nan, np.nan, 5.0, 1358.0], equal_nan=True
+    )
+
+
+def test_grouped_summary_matches_numpy():
+    """Test the batched group statistics against per-group NumPy functions."""
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    values = rng.normal(170, 20, 500)
+    values[rng.random(500) < 0.1] = np.nan
+    codes = rng.integers(0, 3, 500)
+    edges = histogram_edges(values, 8)
+
+    summary = grouped_summary(values, codes, 4, edges)
+    for group in range(3):
+        known = values[(codes == group) & ~np.isnan(values)]
+        assert summary["count"][group] == known.size
+        assert np.isclose(summary["median"][group], np.median(known))
+        assert np.allclose(
+            summary["percentiles"][group], np.percentile(known, stats.PERCENTILES)
+        )
+        assert np.array_equal(
+            summary["histogram"][group], np.histogram(known, edges)[0]
+        )
+    assert summary["count"][3] == 0 and np.isnan(summary["mean"][3])
+
+
+def test_people_stats(client: TestClient):
+    """Test height and mass per gender, and caching until the next write."""
+    pytest.importorskip("numpy")
+    for height, mass, gender in (
+        ("172", "77", "male"),
+        ("180", "1,358", "male"),
+        ("150", "unknown", "female"),
+    ):
+        client.post(
+            "/api/people/",
+            json={"name": "Someone", "height": height, "mass": mass, "gender": gender},
+        )
+
+    data = client.get("/api/people/stats?bins=4").json()
+    assert data["total"] == 3 and data["group_by"] == "gender"
+    height = data["columns"]["height"]
+    assert height["all"]["median"] == 172.0
+    assert height["groups"]["male"]["mean"] == 176.0
+    assert len(height["edges"]) == 5 and sum(height["all"]["histogram"]) == 3
+    mass = data["columns"]["mass"]["groups"]
+    assert mass["male"]["max"] == 1358.0
+    assert mass["female"]["count"] == 0 and mass["female"]["missing"] == 1
+
+    loads = stats.stats_registry.get(People).loads
+    assert client.get("/api/people/stats?bins=4").json() == data
+    assert stats.stats_registry.get(People).loads == loads
+
+    client.post("/api/people/", json={"name": "Droid", "height": "96"})
+    data = client.get("/api/people/stats?bins=4").json()
+    assert data["columns"]["height"]["groups"]["unknown"]["count"] == 1
+    assert stats.stats_registry.get(People).loads == loads + 1
+
+
+def test_planet_stats_split_climates(client: TestClient):
+    """Test that a planet counts for each of its climates."""
+    pytest.importorskip("numpy")
+    client.post(
+        "/api/planets/",
+        json={"name": "Naboo", "climate": "temperate, tropical", "diameter": "12120"},
+    )
+    client.post(
+        "/api/planets/",
+        json={"name": "Hoth", "climate": "frozen", "diameter": "7200"},
+    )
+
+    groups = client.get("/api/planets/stats").json()["columns"]["diameter"]["groups"]
+    assert set(groups) == {"frozen", "temperate", "tropical"}
+    assert groups["tropical"]["mean"] == 12120.0
+
+
+def test_stats_without_numpy(client: TestClient, monkeypatch):
+    """Test that the stats endpoints answer 503 when NumPy is not installed."""
+    monkeypatch.setattr("app.api.routers.people.get_numpy", lambda: None)
+    response = client.get("/api/people/stats")
+    assert response.status_code == 503
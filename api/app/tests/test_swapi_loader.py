@@ -0,0 +1,323 @@
+"""
+Tests for the standalone SWAPI data loader, run against a local SWAPI stand-in.
+"""
+
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "docker" / "scripts"
+
+
+def _load_script(name: str):
+    """Import a standalone script from docker/scripts."""
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+loader_module = _load_script("load_swapi_data")
+standin_module = _load_script("swapi_standin")
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory for an empty SQLite database with the loader's tables."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'swapi.db'}")
+    loader_module.Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def standin():
+    """A running SWAPI stand-in server."""
+    with standin_module.StandInSWAPI(people=45, planets=23) as server:
+        yield server
+
+
+def _loader(standin, session_factory, **kwargs):
+    return loader_module.SWAPIDataLoader(
+        base_url=standin.base_url, session_factory=session_factory, **kwargs
+    )
+
+
+def _names(session_factory, model):
+    with session_factory() as session:
+        return sorted(row.name for row in session.query(model))
+
+
+def test_load_all_data(standin, session_factory):
+    """Test that every page of both endpoints is loaded exactly once."""
+    with _loader(standin, session_factory) as loader:
+        loader.load_all_data()
+
+    people = _names(session_factory, loader_module.People)
+    planets = _names(session_factory, loader_module.Planets)
+    assert len(people) == 45 and len(set(people)) == 45
+    assert len(planets) == 23 and len(set(planets)) == 23
+    # One request per page, pages 2..n fetched by number after the first
+    assert standin.requests["/api/people/?page=5"] == 1
+    assert sum(standin.requests.values()) == 5 + 3
+
+
+def test_fetch_all_pages_respects_rate_limit(session_factory):
+    """Test that 429 responses slow the loader down instead of failing it."""
+    with standin_module.StandInSWAPI(people=50, planets=0, rate_limit=50) as server:
+        with _loader(server, session_factory, concurrency=4) as loader:
+            records = loader.fetch_all_pages("people")
+            throttled = loader.limiter.throttled
+
+    assert len(records) == 50
+    assert server.throttled > 0
+    assert throttled == server.throttled
+
+
+def test_page_failure_is_retried(standin, session_factory):
+    """Test that a flaky page costs a retry instead of the load."""
+    standin.failures["/api/planets/?page=2"] = 2
+    with _loader(standin, session_factory, backoff_base=0.01) as loader:
+        records = loader.fetch_all_pages("planets")
+
+    assert len(records) == 23
+    assert loader.retries == 2
+    assert standin.requests["/api/planets/?page=2"] == 3
+
+
+def test_failed_load_resumes_from_checkpoint(standin, session_factory):
+    """Test that a restart only fetches the pages a failed load did not commit."""
+    standin.failures["/api/people/?page=4"] = 100
+    options = dict(mode="load", chunk_size=10, backoff_base=0.001, max_retries=2)
+    with _loader(standin, session_factory, concurrency=1, **options) as loader:
+        with pytest.raises(Exception):
+            asyncio.run(_load_people(loader))
+
+    checkpoint = loader.checkpoints.load("people")
+    assert checkpoint["page_count"] == 5
+    assert checkpoint["pages"] == {1, 2, 3}
+
+    standin.failures.clear()
+    standin.requests.clear()
+    with _loader(standin, session_factory, **options) as loader:
+        asyncio.run(_load_people(loader))
+
+    people = _names(session_factory, loader_module.People)
+    assert len(people) == 45 and len(set(people)) == 45
+    # The first page is refetched for the page count, 2 and 3 are skipped
+    assert "/api/people/?page=2" not in standin.requests
+    assert standin.requests["/api/people/?page=4"] == 1
+    assert loader.checkpoints.load("people") is None
+
+
+def test_small_pages_are_checkpointed_before_a_chunk_fills(standin, session_factory):
+    """Test that pages are checkpointed even when the dataset is below a chunk."""
+    standin.failures["/api/people/?page=4"] = 100
+    options = dict(mode="load", chunk_size=1000, backoff_base=0.05, max_retries=2)
+    with _loader(standin, session_factory, concurrency=1, **options) as loader:
+        with pytest.raises(Exception):
+            asyncio.run(_load_people(loader))
+
+    # Fetched pages still queued when the fetch fails are not written; exactly
+    # the written pages are checkpointed
+    pages = loader.checkpoints.load("people")["pages"]
+    assert 1 in pages and pages <= {1, 2, 3}
+    assert len(_names(session_factory, loader_module.People)) == 10 * len(pages)
+
+
+async def _load_people(loader):
+    async with loader.create_client() as client:
+        return await loader.load_people(client)
+
+
+def test_bulk_load_isolates_failing_rows(standin, session_factory):
+    """Test that a bad row only costs itself, not its whole chunk."""
+    standin.records("people")[3]["name"] = None  # violates NOT NULL
+    with _loader(standin, session_factory, chunk_size=20, mode="load") as loader:
+        loader.load_all_data()
+
+    people = _names(session_factory, loader_module.People)
+    assert len(people) == 44
+    assert "Person 4" not in people
+
+
+def test_copy_value_escaping():
+    """Test rendering of values in the PostgreSQL COPY text format."""
+    assert loader_module._copy_value(None) == "\\N"
+    assert loader_module._copy_value("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+
+
+class TestIncrementalSync:
+    """Test cases for the upsert-based sync mode."""
+
+    def test_rerun_is_idempotent(self, standin, session_factory):
+        """Test that a second sync changes nothing and duplicates nothing."""
+        with _loader(standin, session_factory, mode="sync") as loader:
+            first = loader.load_all_data()
+            second = loader.load_all_data()
+
+        assert first["people"].inserted == 45
+        assert first["planets"].inserted == 23
+        assert second["people"].inserted == 0
+        assert second["people"].updated == 0
+        assert second["people"].unchanged == 45
+        assert len(_names(session_factory, loader_module.Planets)) == 23
+
+    def test_only_edited_records_are_updated(self, standin, session_factory):
+        """Test that records are rewritten only when their edited timestamp moved."""
+        with _loader(standin, session_factory, mode="sync") as loader:
+            loader.load_all_data()
+
+            record = standin.records("people")[0]
+            record["name"] = "Luke Skywalker"
+            record["edited"] = "2015-01-01T00:00:00.000000Z"
+            # Changed without touching edited: not picked up
+            standin.records("people")[1]["name"] = "Ignored"
+            result = loader.load_all_data()
+
+        assert result["people"].updated == 1
+        assert result["people"].unchanged == 44
+        names = _names(session_factory, loader_module.People)
+        assert "Luke Skywalker" in names
+        assert "Ignored" not in names
+
+    def test_load_mode_skips_non_empty_tables(self, standin, session_factory):
+        """Test that the bulk load mode never duplicates rows on a re-run."""
+        with _loader(standin, session_factory, mode="load") as loader:
+            loader.load_all_data()
+            result = loader.load_all_data()
+
+        assert result == {"people": None, "planets": None}
+        assert len(_names(session_factory, loader_module.Planets)) == 23
+
+    def test_ensure_sync_columns_upgrades_old_tables(self, tmp_path):
+        """Test that tables created before url/edited existed gain the columns."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as connection:
+            connection.execute(
+                text("CREATE TABLE people (id INTEGER PRIMARY KEY, name VARCHAR)")
+            )
+        loader_module.ensure_sync_columns(engine)
+
+        columns = {c["name"] for c in inspect(engine).get_columns("people")}
+        assert {"url", "edited"} <= columns
+        engine.dispose()
+
+    def test_sync_backfills_url_of_legacy_rows(self, standin, tmp_path):
+        """Test that rows stored before url existed are updated, not duplicated."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE people (id INTEGER PRIMARY KEY, name VARCHAR, "
+                    "height VARCHAR, mass VARCHAR, hair_color VARCHAR, "
+                    "skin_color VARCHAR, eye_color VARCHAR, birth_year VARCHAR, "
+                    "gender VARCHAR, created_at DATETIME, updated_at DATETIME)"
+                )
+            )
+            for record in standin.records("people")[:10]:
+                connection.execute(
+                    text("INSERT INTO people (name, height) VALUES (:name, 'old')"),
+                    {"name": record["name"]},
+                )
+        loader_module.ensure_sync_columns(engine)
+        loader_module.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        with _loader(standin, session_factory, mode="sync") as loader:
+            result = loader.load_all_data()
+
+        assert result["people"].updated == 10
+        assert result["people"].inserted == 35
+        people = _names(session_factory, loader_module.People)
+        assert len(people) == 45 and len(set(people)) == 45
+        with engine.connect() as connection:
+            assert (
+                connection.execute(
+                    text(
+                        "SELECT count(*) FROM people WHERE url IS NULL OR height = 'old'"
+                    )
+                ).scalar()
+                == 0
+            )
+        engine.dispose()
+
+
+class TestShadowReload:
+    """Test cases for the shadow-table reload mode."""
+
+    def test_reload_replaces_tables_atomically(self, standin, session_factory):
+        """Test that a reload swaps in complete tables with their indexes."""
+        with _loader(standin, session_factory, mode="sync") as loader:
+            loader.load_all_data()
+
+        standin.records("people").pop()
+        standin.records("people")[0]["name"] = "Luke Skywalker"
+        with _loader(standin, session_factory, mode="reload") as loader:
+            result = loader.load_all_data()
+
+        assert result["people"].inserted == 44
+        people = _names(session_factory, loader_module.People)
+        assert len(people) == 44 and "Luke Skywalker" in people
+
+        engine = session_factory.kw["bind"]
+        inspector = inspect(engine)
+        assert not inspector.has_table("people_shadow")
+        indexes = {index["name"] for index in inspector.get_indexes("people")}
+        assert {"ix_people_name", "ix_people_url"} <= indexes
+
+    def test_reload_can_run_repeatedly(self, standin, session_factory):
+        """Test that index names are restored so the next reload works too."""
+        for _ in range(2):
+            with _loader(standin, session_factory, mode="reload") as loader:
+                loader.load_all_data()
+
+        assert len(_names(session_factory, loader_module.Planets)) == 23
+
+    def test_readers_never_see_a_partial_table(
+        self, standin, session_factory, monkeypatch
+    ):
+        """Test that the live table keeps its old rows until the swap."""
+        with _loader(standin, session_factory, mode="sync") as loader:
+            loader.load_all_data()
+
+        counts = []
+        original_swap = loader_module.ShadowTable.swap
+
+        def swap(shadow, bind, *args, **kwargs):
+            counts.append(len(_names(session_factory, loader_module.People)))
+            original_swap(shadow, bind, *args, **kwargs)
+
+        monkeypatch.setattr(loader_module.ShadowTable, "swap", swap)
+        with _loader(standin, session_factory, mode="reload") as loader:
+            asyncio.run(_load_people(loader))
+
+        assert counts == [45]
+
+    def test_failed_sqlite_swap_rolls_back(self, standin, session_factory, monkeypatch):
+        """Test that the SQLite swap is one transaction: a failure keeps the live table."""
+        with _loader(standin, session_factory, mode="sync") as loader:
+            loader.load_all_data()
+
+        def broken_index_pairs(shadow):
+            raise RuntimeError("swap interrupted")
+            yield
+
+        monkeypatch.setattr(
+            loader_module.ShadowTable, "_index_pairs", broken_index_pairs
+        )
+        standin.records("people")[0]["name"] = "Luke Skywalker"
+        with _loader(standin, session_factory, mode="reload") as loader:
+            with pytest.raises(RuntimeError):
+                asyncio.run(_load_people(loader))
+
+        people = _names(session_factory, loader_module.People)
+        assert len(people) == 45 and "Luke Skywalker" not in people
+        assert inspect(session_factory.kw["bind"]).has_table("people_shadow")
@@ -0,0 +1,112 @@
+"""
+Tests for the synthetic dataset generator.
+"""
+
+import re
+from collections import Counter
+
+import pytest
+
+from app.db.models import People, Planets
+from app.tools.synthetic_data import (
+    PEOPLE_COLUMNS,
+    PLANET_COLUMNS,
+    SyntheticDataGenerator,
+    bulk_write,
+)
+from app.tests.conftest import engine
+
+
+def test_generator_is_reproducible():
+    """Test that the same seed produces the same rows"""
+    assert SyntheticDataGenerator(7).people(200) == SyntheticDataGenerator(7).people(
+        200
+    )
+    assert SyntheticDataGenerator(7).planets(50) != SyntheticDataGenerator(8).planets(
+        50
+    )
+
+
+def test_rows_use_swapi_formats():
+    """Test that generated values look like SWAPI values"""
+    people = SyntheticDataGenerator(1).people(5000)
+    assert all(len(row) == len(PEOPLE_COLUMNS) for row in people)
+    columns = dict(zip(PEOPLE_COLUMNS, zip(*people)))
+
+    assert "unknown" in columns["mass"]
+    assert any("," in mass for mass in columns["mass"])
+    assert all(
+        m == "unknown" or re.fullmatch(r"[\d,]+(\.\d)?", m) for m in columns["mass"]
+    )
+    assert all(
+        b == "unknown" or re.fullmatch(r"\d+(\.\d)?[AB]BY", b)
+        for b in columns["birth_year"]
+    )
+    assert any(", " in color for color in columns["hair_color"])
+    assert len(set(columns["url"])) == len(people)
+
+    planets = SyntheticDataGenerator(1).planets(2000)
+    columns = dict(zip(PLANET_COLUMNS, zip(*planets)))
+    assert all(p == "unknown" or p.isdigit() for p in columns["population"])
+    assert "1 standard" in columns["gravity"]
+
+
+def test_categorical_values_are_skewed():
+    """Test that frequent categories dominate rare ones"""
+    people = SyntheticDataGenerator(3).people(10000)
+    genders = Counter(row[PEOPLE_COLUMNS.index("gender")] for row in people)
+    assert genders["male"] > genders["female"] > genders["hermaphrodite"]
+
+    colors = Counter(row[PEOPLE_COLUMNS.index("hair_color")] for row in people)
+    assert colors.most_common(1)[0][1] > 10 * min(colors.values())
+
+
+def test_populate_bulk_loads_rows(synthetic_data, db_session):
+    """Test that populate writes the requested counts and keeps indexes"""
+    stats = synthetic_data(people=1200, planets=300, seed=5)
+    assert stats["people"]["rows"] == 1200
+    assert stats["planets"]["rows"] == 300
+    assert db_session.query(People).count() == 1200
+    assert db_session.query(Planets).count() == 300
+
+    person = db_session.query(People).filter(People.id == 1).one()
+    assert person.url.endswith("/people/1/")
+    assert person.edited is not None
+
+    # Appending continues the id and url sequences
+    synthetic_data(people=10, seed=6)
+    assert db_session.query(People).count() == 1210
+    indexes = {
+        row[1]
+        for row in db_session.connection().exec_driver_sql(
+            "PRAGMA index_list('people')"
+        )
+    }
+    assert {index.name for index in People.__table__.indexes} <= indexes
+
+
+def test_failed_bulk_write_restores_indexes(db_session):
+    """Test that indexes dropped for a bulk load come back when it fails"""
+
+    def chunks():
+        yield SyntheticDataGenerator(1).people(5)
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        bulk_write(engine, People, PEOPLE_COLUMNS, chunks())
+
+    indexes = {
+        row[1]
+        for row in db_session.connection().exec_driver_sql(
+            "PRAGMA index_list('people')"
+        )
+    }
+    assert {index.name for index in People.__table__.indexes} <= indexes
+
+
+def test_people_endpoint_serves_synthetic_rows(synthetic_data, client):
+    """Test that the API reads generated rows"""
+    synthetic_data(people=50, seed=2)
+    response = client.get("/api/people/?page=1&size=10&sort=name")
+    assert response.status_code == 200
+    assert response.json()["total"] == 50
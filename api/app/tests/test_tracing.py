@@ -0,0 +1,71 @@
+"""
+Tests for request tracing and the Server-Timing header.
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.tracing import FileSpanExporter, Tracer, current_trace, span
+
+
+def _server_timing(response) -> dict:
+    """Parse a Server-Timing header into a name -> duration mapping."""
+    metrics = {}
+    for metric in response.headers["Server-Timing"].split(", "):
+        name, duration = metric.split(";dur=")
+        metrics[name] = float(duration)
+    return metrics
+
+
+def test_list_request_reports_phases(client: TestClient):
+    """Test that a list call reports query, count, sort and serialize phases."""
+    client.post("/api/people/", json={"name": "Luke Skywalker"})
+
+    response = client.get("/api/people/?sort_by=name")
+    assert response.status_code == 200
+
+    metrics = _server_timing(response)
+    for phase in ("total", "endpoint", "sort", "db.count", "db.query", "serialize"):
+        assert phase in metrics
+    assert metrics["total"] >= metrics["endpoint"]
+
+
+def test_spans_are_noops_without_a_trace():
+    """Test that span() can be used outside of a request."""
+    assert current_trace() is None
+    with span("db.query"):
+        pass
+
+
+def test_file_exporter_writes_otlp_json(tmp_path):
+    """Test that finished traces are exported as OTLP/JSON lines."""
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(exporter=FileSpanExporter(str(path), "test-service"))
+
+    token = tracer.start_trace(
+        "GET /api/people/",
+        "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+    )
+    with span("endpoint"):
+        with span("db.query"):
+            pass
+    current_trace().attributes["http.status_code"] = 200
+    tracer.end_trace(token)
+    tracer.shutdown()
+
+    payload = json.loads(path.read_text().splitlines()[0])
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {
+        "stringValue": "test-service"
+    }
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    root, endpoint, query = spans
+    assert {s["traceId"] for s in spans} == {"0af7651916cd43dd8448eb211c80319c"}
+    assert root["parentSpanId"] == "b7ad6b7169203331"
+    assert endpoint["parentSpanId"] == root["spanId"]
+    assert query["parentSpanId"] == endpoint["spanId"]
+    assert int(root["endTimeUnixNano"]) >= int(query["endTimeUnixNano"])
+    assert root["attributes"] == [
+        {"key": "http.status_code", "value": {"intValue": "200"}}
+    ]
@@ -0,0 +1,3 @@
+"""
+Command line tools for data generation and performance testing.
+"""
@@ -0,0 +1,551 @@
+"""
+Asyncio load generator for the API.
+
+Two ways to drive load:
+
+- ``closed``: ``--users`` virtual users each send a request, wait for the
+  response (plus an optional think time) and repeat. Measures the throughput
+  the service sustains at a given concurrency.
+- ``open``: requests arrive at ``--rate`` per second (Poisson arrivals)
+  regardless of how fast responses come back. Latency is measured from the
+  scheduled arrival time, so queueing delay is included instead of hidden
+  (no coordinated omission).
+
+Each request is drawn from a weighted mix of operations with realistic
+parameters: early pages far more often than deep ones, Zipf-distributed
+search terms and sort fields. The default mix only reads; the write
+operations modify the target's data and must be enabled with ``--mix``.
+A warmup phase runs first and is not recorded.
+Results (HDR-style latency percentiles, error rates, achieved requests per
+second) are written as JSON; ``--compare`` prints the change against a
+previous result file.
+
+Usage (from the api directory):
+    python -m app.tools.loadgen --url http://localhost:8000 --mode closed --users 32 --duration 60
+    python -m app.tools.loadgen --url http://localhost:8000 --mode open --rate 200 --output run.json
+    python -m app.tools.loadgen --in-process --mode closed --users 8 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+DEFAULT_MIX = {
+    "people_list": 25,
+    "people_search": 20,
+    "people_sort": 10,
+    "people_detail": 15,
+    "planets_list": 10,
+    "planets_search": 8,
+    "planets_sort": 5,
+    "insight": 5,
+    # Writes change the target's data: opt in with --mix
+    "people_update": 0,
+    "people_create": 0,
+}
+PEOPLE_SORTS = ["name", "height", "mass", "birth_year", "gender", "created_at"]
+PLANET_SORTS = ["name", "population", "diameter", "climate", "terrain"]
+# Used until the target's own names are known
+FALLBACK_TERMS = ["sky", "luke", "dar", "leia", "obi", "han", "yoda", "tat", "hoth"]
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram in the style of HdrHistogram.
+
+    Values (microseconds) are kept in buckets whose width is at most
+    ``1 / 2**precision_bits`` of the value, so every percentile is accurate to
+    within that relative error (under 1% with the default 7 bits) in constant
+    memory, however many values are recorded. Histograms can be merged.
+    """
+
+    def __init__(self, precision_bits: int = 7):
+        self.precision_bits = precision_bits
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.max = 0
+        self.sum = 0
+
+    def record(self, value_us: int) -> None:
+        value_us = max(0, int(value_us))
+        shift = max(0, value_us.bit_length() - self.precision_bits)
+        self.counts[(shift, value_us >> shift)] += 1
+        self.total += 1
+        self.sum += value_us
+        if value_us > self.max:
+            self.max = value_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Value (microseconds) at or below which ``pct`` percent of the values fall."""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(pct / 100 * self.total))
+        if target >= self.total:
+            return float(self.max)
+        seen = 0
+        for shift, sub in sorted(self.counts, key=lambda key: key[1] << key[0]):
+            seen += self.counts[(shift, sub)]
+            if seen >= target:
+                # Midpoint of the bucket, capped at the largest value seen
+                return min(self.max, (sub << shift) + ((1 << shift) - 1) / 2)
+        return float(self.max)
+
+    def summary(self) -> Dict[str, float]:
+        """Percentiles in milliseconds."""
+        stats = {
+            name: round(self.percentile(pct) / 1000, 3)
+            for name, pct in (
+                ("p50", 50),
+                ("p90", 90),
+                ("p99", 99),
+                ("p99_9", 99.9),
+            )
+        }
+        stats["mean"] = round(self.sum / self.total / 1000, 3) if self.total else 0.0
+        stats["max"] = round(self.max / 1000, 3)
+        return stats
+
+
+def _zipf_choice(rng: random.Random, values: Sequence[Any], exponent: float = 1.1):
+    weights = [1 / rank**exponent for rank in range(1, len(values) + 1)]
+    return rng.choices(values, weights=weights)[0]
+
+
+class TrafficMix:
+    """
+    Builds requests for a weighted mix of operations.
+
+    ``people``/``planets`` are the table sizes and ``people_names``/
+    ``planet_names`` sample names to derive search terms from; ``discover``
+    fills them in from the target.
+    """
+
+    def __init__(self, weights: Dict[str, float], seed: int = 0):
+        unknown = set(weights) - set(self.operations())
+        if unknown:
+            raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+        self.weights = {name: weight for name, weight in weights.items() if weight > 0}
+        self.rng = random.Random(seed)
+        self.people = 1000
+        self.planets = 100
+        self.people_names: List[str] = []
+        self.planet_names: List[str] = []
+
+    @classmethod
+    def operations(cls) -> List[str]:
+        return [name[3:] for name in dir(cls) if name.startswith("op_")]
+
+    @staticmethod
+    def parse(spec: str) -> Dict[str, float]:
+        """Parse ``"people_list=30,people_search=20"`` into weights."""
+        weights = {}
+        for part in filter(None, spec.split(",")):
+            name, _, weight = part.partition("=")
+            weights[name.strip()] = float(weight or 1)
+        return weights
+
+    async def discover(self, client: httpx.AsyncClient) -> None:
+        """Read table sizes and a sample of names from the target."""
+        for resource in ("people", "planets"):
+            response = await client.get(f"/api/{resource}/", params={"size": 100})
+            if response.status_code != 200:
+                continue
+            body = response.json()
+            setattr(self, resource, max(1, body["total"]))
+            setattr(
+                self,
+                f"{'people' if resource == 'people' else 'planet'}_names",
+                [item["name"] for item in body["items"]],
+            )
+
+    def next(self) -> Tuple[str, Request]:
+        """Pick an operation by weight and build its request."""
+        name = self.rng.choices(list(self.weights), list(self.weights.values()))[0]
+        return name, getattr(self, f"op_{name}")()
+
+    # Parameter distributions
+
+    def _page(self, total: int, size: int = 10) -> int:
+        pages = max(1, math.ceil(total / size))
+        # Geometric: page 1 about half the time, rarely deep
+        page = 1 + int(self.rng.expovariate(0.7))
+        return (
+            min(page, pages) if self.rng.random() < 0.98 else self.rng.randint(1, pages)
+        )
+
+    def _term(self, names: List[str]) -> str:
+        words = [w.lower() for name in names for w in name.split()] or FALLBACK_TERMS
+        word = _zipf_choice(self.rng, words)
+        return word[: self.rng.randint(min(3, len(word)), len(word))]
+
+    # Operations
+
+    def op_people_list(self) -> Request:
+        return "GET", f"/api/people/?page={self._page(self.people)}&size=10", None
+
+    def op_planets_list(self) -> Request:
+        return "GET", f"/api/planets/?page={self._page(self.planets)}&size=10", None
+
+    def op_people_search(self) -> Request:
+        return "GET", f"/api/people/?name={self._term(self.people_names)}", None
+
+    def op_planets_search(self) -> Request:
+        return "GET", f"/api/planets/?name={self._term(self.planet_names)}", None
+
+    def op_people_sort(self) -> Request:
+        field = _zipf_choice(self.rng, PEOPLE_SORTS)
+        order = "asc" if self.rng.random() < 0.7 else "desc"
+        page = self._page(self.people)
+        return (
+            "GET",
+            f"/api/people/?sort_by={field}&sort_order={order}&page={page}",
+            None,
+        )
+
+    def op_planets_sort(self) -> Request:
+        field = _zipf_choice(self.rng, PLANET_SORTS)
+        order = "asc" if self.rng.random() < 0.7 else "desc"
+        page = self._page(self.planets)
+        return (
+            "GET",
+            f"/api/planets/?sort_by={field}&sort_order={order}&page={page}",
+            None,
+        )
+
+    def op_people_detail(self) -> Request:
+        return "GET", f"/api/people/{self.rng.randint(1, self.people)}", None
+
+    def op_insight(self) -> Request:
+        if self.rng.random() < 0.7 and self.people_names:
+            name, entity_type = self.rng.choice(self.people_names), "people"
+        elif self.planet_names:
+            name, entity_type = self.rng.choice(self.planet_names), "planets"
+        else:
+            name, entity_type = "Luke Skywalker", "people"
+        return (
+            "POST",
+            "/api/simulate-ai-insight/",
+            {
+                "name": name,
+                "entity_type": entity_type,
+            },
+        )
+
+    def op_people_update(self) -> Request:
+        body = {"mass": str(self.rng.randint(40, 140))}
+        return "PUT", f"/api/people/{self.rng.randint(1, self.people)}", body
+
+    def op_people_create(self) -> Request:
+        body = {
+            "name": f"Load {self.rng.getrandbits(48):x}",
+            "height": str(self.rng.randint(150, 200)),
+            "gender": self.rng.choice(("male", "female", "n/a")),
+        }
+        return "POST", "/api/people/", body
+
+
+class Recorder:
+    """Per-operation latency histograms, status codes and error counts."""
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.statuses: Dict[str, Counter] = {}
+        self.errors: Counter = Counter()
+        self.enabled = False
+
+    def record(self, operation: str, latency_s: float, status: Optional[int]) -> None:
+        if not self.enabled:
+            return
+        self.histograms.setdefault(operation, LatencyHistogram()).record(
+            latency_s * 1_000_000
+        )
+        self.statuses.setdefault(operation, Counter())[status or "exception"] += 1
+        if status is None or status >= 400:
+            self.errors[operation] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        overall = LatencyHistogram()
+        operations = {}
+        for name, histogram in sorted(self.histograms.items()):
+            overall.merge(histogram)
+            operations[name] = {
+                "requests": histogram.total,
+                "errors": self.errors[name],
+                "error_rate": round(self.errors[name] / histogram.total, 4),
+                "rps": round(histogram.total / elapsed, 2),
+                "latency_ms": histogram.summary(),
+                "status_codes": {str(k): v for k, v in self.statuses[name].items()},
+            }
+        errors = sum(self.errors.values())
+        return {
+            "requests": overall.total,
+            "errors": errors,
+            "error_rate": round(errors / overall.total, 4) if overall.total else 0.0,
+            "rps": round(overall.total / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": overall.summary(),
+            "operations": operations,
+        }
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    operation: str,
+    request: Request,
+    started: float,
+) -> None:
+    method, path, body = request
+    status = None
+    try:
+        response = await client.request(method, path, json=body)
+        status = response.status_code
+    except Exception as e:
+        logger.debug(f"{operation} failed: {e}")
+    recorder.record(operation, time.perf_counter() - started, status)
+
+
+async def run_closed(
+    client, mix: TrafficMix, recorder: Recorder, users: int, until: float, think: float
+) -> None:
+    """``users`` concurrent users, each sending requests back to back."""
+
+    async def user():
+        while time.perf_counter() < until:
+            operation, request = mix.next()
+            await _send(client, recorder, operation, request, time.perf_counter())
+            if think:
+                await asyncio.sleep(mix.rng.expovariate(1 / think))
+
+    await asyncio.gather(*(user() for _ in range(users)))
+
+
+async def run_open(
+    client,
+    mix: TrafficMix,
+    recorder: Recorder,
+    rate: float,
+    until: float,
+    max_in_flight: int,
+) -> None:
+    """Poisson arrivals at ``rate`` per second, timed from their scheduled start."""
+    in_flight = set()
+    dropped = 0
+    scheduled = time.perf_counter()
+    while True:
+        scheduled += mix.rng.expovariate(rate)
+        if scheduled >= until:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            # The target cannot keep up; count the arrival as a failed request
+            dropped += 1
+            operation, _ = mix.next()
+            recorder.record(operation, time.perf_counter() - scheduled, None)
+            continue
+        operation, request = mix.next()
+        task = asyncio.create_task(
+            _send(client, recorder, operation, request, scheduled)
+        )
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    if dropped:
+        logger.warning(
+            f"{dropped} arrivals dropped at {max_in_flight} requests in flight"
+        )
+
+
+def build_client(
+    url: Optional[str], app=None, connections: int = 100
+) -> httpx.AsyncClient:
+    """HTTP client for ``url``, or an in-process ASGI client for ``app``."""
+    if app is not None:
+        return httpx.AsyncClient(app=app, base_url="http://loadgen", timeout=30.0)
+    return httpx.AsyncClient(
+        base_url=url,
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=connections, max_keepalive_connections=connections
+        ),
+    )
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: TrafficMix,
+    mode: str = "closed",
+    duration: float = 30.0,
+    warmup: float = 5.0,
+    users: int = 10,
+    rate: float = 50.0,
+    think: float = 0.0,
+    max_in_flight: int = 1000,
+) -> Dict[str, Any]:
+    """Run a warmup phase and a measured phase, return the report."""
+    await mix.discover(client)
+    recorder = Recorder()
+
+    async def phase(seconds: float):
+        until = time.perf_counter() + seconds
+        if mode == "closed":
+            await run_closed(client, mix, recorder, users, until, think)
+        else:
+            await run_open(client, mix, recorder, rate, until, max_in_flight)
+
+    if warmup > 0:
+        await phase(warmup)
+    recorder.enabled = True
+    start = time.perf_counter()
+    await phase(duration)
+    elapsed = time.perf_counter() - start
+
+    report = recorder.report(elapsed)
+    report["config"] = {
+        "mode": mode,
+        "duration": duration,
+        "warmup": warmup,
+        "users": users if mode == "closed" else None,
+        "target_rps": rate if mode == "open" else None,
+        "think_time": think if mode == "closed" else None,
+        "mix": mix.weights,
+    }
+    report["elapsed"] = round(elapsed, 3)
+    return report
+
+
+def compare_reports(current: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    """Human readable per-operation changes between two reports."""
+
+    def change(new, old):
+        return f"{(new / old - 1):+.0%}" if old else "n/a"
+
+    lines = [
+        f"{'operation':<16} {'p50 ms':>16} {'p99 ms':>16} {'rps':>14} {'errors':>8}"
+    ]
+    rows = [("overall", current, previous)] + [
+        (name, stats, previous.get("operations", {}).get(name, {}))
+        for name, stats in current["operations"].items()
+    ]
+    for name, new, old in rows:
+        if not old:
+            continue
+        p50, p99 = new["latency_ms"]["p50"], new["latency_ms"]["p99"]
+        lines.append(
+            f"{name:<16} {p50:>9.2f} {change(p50, old['latency_ms']['p50']):>6} "
+            f"{p99:>9.2f} {change(p99, old['latency_ms']['p99']):>6} "
+            f"{new['rps']:>8.1f} {change(new['rps'], old['rps']):>5} "
+            f"{new['error_rate']:>8.2%}"
+        )
+    return lines
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    latency = report["latency_ms"]
+    print(
+        f"{report['requests']} requests in {report['elapsed']}s: "
+        f"{report['rps']} req/s, {report['error_rate']:.2%} errors"
+    )
+    print(
+        f"latency ms: p50 {latency['p50']}  p90 {latency['p90']}  "
+        f"p99 {latency['p99']}  p99.9 {latency['p99_9']}  max {latency['max']}"
+    )
+    print(
+        f"{'operation':<16} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for name, stats in report["operations"].items():
+        print(
+            f"{name:<16} {stats['requests']:>9} {stats['latency_ms']['p50']:>8.2f} "
+            f"{stats['latency_ms']['p99']:>8.2f} {stats['error_rate']:>7.2%}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000")
+    target.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Drive the app through ASGI in this process, using the configured database",
+    )
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--users", type=int, default=10, help="Closed-loop concurrency")
+    parser.add_argument("--rate", type=float, default=50.0, help="Open-loop arrivals/s")
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="Mean think time (s), closed loop"
+    )
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+        help=f"Operation weights; operations: {', '.join(TrafficMix.operations())}",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Previous JSON report")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        mix = TrafficMix(TrafficMix.parse(args.mix), seed=args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    app = None
+    if args.in_process:
+        from app.main import app
+
+    async def run():
+        connections = args.users if args.mode == "closed" else args.max_in_flight
+        async with build_client(args.url, app, connections) as client:
+            return await run_load(
+                client,
+                mix,
+                mode=args.mode,
+                duration=args.duration,
+                warmup=args.warmup,
+                users=args.users,
+                rate=args.rate,
+                think=args.think_time,
+                max_in_flight=args.max_in_flight,
+            )
+
+    report = asyncio.run(run())
+    report["target"] = "in-process" if args.in_process else args.url
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print()
+        print("\n".join(compare_reports(report, previous)))
+
+
+if __name__ == "__main__":
+    main()
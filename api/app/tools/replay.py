@@ -0,0 +1,271 @@
+"""
+Replay captured traffic against a test instance.
+
+Reads the capture files written under ``TRAFFIC_CAPTURE_FILE`` (one per
+worker process, rotated backups included), merges them by arrival time and
+sends the requests again with their original inter-arrival times, at 1x or ``--speed`` times faster. Latency is measured
+from each request's scheduled send time, so a target that falls behind shows
+it in the percentiles.
+
+The report compares the captured (server-side) latency distribution with the
+replayed one per route, with dynamic path segments folded (``/api/people/{id}``),
+and counts responses whose status differs from the captured one. Only GET and
+HEAD requests are replayed by default; request bodies are not captured, so
+writes can only be replayed empty with ``--methods``.
+
+Usage (from the api directory):
+    python -m app.tools.replay capture.jsonl --url http://localhost:8001 --speed 2
+    python -m app.tools.replay capture.jsonl --in-process --speed 0 --output replay.json
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import httpx
+
+from app.tools.loadgen import LatencyHistogram, build_client
+
+logger = logging.getLogger(__name__)
+
+_DYNAMIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class CapturedRequest(NamedTuple):
+    started: float
+    method: str
+    path: str
+    query: str
+    status_code: int
+    execution_time_ms: float
+
+
+def capture_files(path: str) -> List[str]:
+    """
+    The capture files under ``path``, each file's rotated backups first.
+
+    Workers write ``path.<pid>`` and rotate it to ``path.<pid>.<n>``; a
+    ``path`` written by a single process is read too.
+    """
+    keys = {}
+    for name in glob.glob(f"{glob.escape(path)}.*"):
+        parts = name[len(path) + 1 :].split(".")
+        if len(parts) <= 2 and all(part.isdigit() for part in parts):
+            # Per file (pid), higher backup numbers are older; the live file last
+            keys[name] = (int(parts[0]), -int(parts[1]) if len(parts) == 2 else 0)
+    files = sorted(keys, key=keys.get)
+    return ([path] if os.path.exists(path) else []) + files
+
+
+def read_capture(paths: Iterable[str]) -> List[CapturedRequest]:
+    """Parse capture lines, skipping malformed ones, sorted by arrival time."""
+    requests, skipped = [], 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    requests.append(CapturedRequest(*json.loads(line)))
+                except (TypeError, ValueError):
+                    skipped += 1
+    if skipped:
+        logger.warning(f"Skipped {skipped} malformed capture lines")
+    requests.sort(key=lambda request: request.started)
+    return requests
+
+
+def route_of(path: str) -> str:
+    """Fold numeric path segments so requests group by route."""
+    return _DYNAMIC_SEGMENT.sub("/{id}", path)
+
+
+class ReplayResult:
+    """Captured and replayed latency histograms per route."""
+
+    def __init__(self):
+        self.captured: Dict[str, LatencyHistogram] = {}
+        self.replayed: Dict[str, LatencyHistogram] = {}
+        self.mismatches: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.lag = LatencyHistogram()
+
+    def record(
+        self, request: CapturedRequest, latency_s: float, status: Optional[int]
+    ) -> None:
+        route = f"{request.method} {route_of(request.path)}"
+        self.captured.setdefault(route, LatencyHistogram()).record(
+            request.execution_time_ms * 1000
+        )
+        self.replayed.setdefault(route, LatencyHistogram()).record(
+            latency_s * 1_000_000
+        )
+        if status is None:
+            self.failures[route] += 1
+        elif status != request.status_code:
+            self.mismatches[route] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        routes = {}
+        captured_all, replayed_all = LatencyHistogram(), LatencyHistogram()
+        for route in sorted(self.replayed):
+            captured, replayed = self.captured[route], self.replayed[route]
+            captured_all.merge(captured)
+            replayed_all.merge(replayed)
+            routes[route] = {
+                "requests": replayed.total,
+                "status_mismatches": self.mismatches[route],
+                "failures": self.failures[route],
+                "captured_ms": captured.summary(),
+                "replayed_ms": replayed.summary(),
+                "p50_ratio": _ratio(replayed.percentile(50), captured.percentile(50)),
+                "p99_ratio": _ratio(replayed.percentile(99), captured.percentile(99)),
+            }
+        return {
+            "requests": replayed_all.total,
+            "elapsed": round(elapsed, 3),
+            "rps": round(replayed_all.total / elapsed, 2) if elapsed else 0.0,
+            "status_mismatches": sum(self.mismatches.values()),
+            "failures": sum(self.failures.values()),
+            "captured_ms": captured_all.summary(),
+            "replayed_ms": replayed_all.summary(),
+            # How late requests were sent relative to their schedule
+            "send_lag_ms": self.lag.summary(),
+            "routes": routes,
+        }
+
+
+def _ratio(new: float, old: float) -> Optional[float]:
+    return round(new / old, 3) if old else None
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    requests: List[CapturedRequest],
+    speed: float = 1.0,
+    max_in_flight: int = 1000,
+) -> Dict[str, Any]:
+    """
+    Send ``requests`` keeping their inter-arrival times divided by ``speed``.
+
+    ``speed`` 0 sends them as fast as ``max_in_flight`` allows. A request is
+    only scheduled once a slot is free, so at most ``max_in_flight`` tasks
+    exist however long the capture is; waiting for a slot shows as send lag.
+    """
+    result = ReplayResult()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    in_flight = set()
+
+    async def send(request: CapturedRequest, scheduled: float) -> None:
+        try:
+            result.lag.record((time.perf_counter() - scheduled) * 1_000_000)
+            status = None
+            try:
+                url = request.path + (f"?{request.query}" if request.query else "")
+                response = await client.request(request.method, url)
+                status = response.status_code
+            except Exception as e:
+                logger.debug(f"{request.method} {request.path} failed: {e}")
+            result.record(request, time.perf_counter() - scheduled, status)
+        finally:
+            semaphore.release()
+
+    start = time.perf_counter()
+    if requests:
+        origin = requests[0].started
+        for request in requests:
+            scheduled = start
+            if speed > 0:
+                scheduled += (request.started - origin) / speed
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await semaphore.acquire()
+            if speed <= 0:
+                scheduled = time.perf_counter()
+            task = asyncio.create_task(send(request, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    return result.report(time.perf_counter() - start)
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['requests']} requests in {report['elapsed']}s ({report['rps']} req/s), "
+        f"{report['status_mismatches']} status mismatches, {report['failures']} failures"
+    )
+    print(
+        f"{'route':<36} {'count':>6} {'cap p50':>8} {'rep p50':>8} "
+        f"{'cap p99':>8} {'rep p99':>8} {'p99 x':>6}"
+    )
+    rows = [("overall", report)] + list(report["routes"].items())
+    for route, stats in rows:
+        print(
+            f"{route[:36]:<36} {stats['requests']:>6} "
+            f"{stats['captured_ms']['p50']:>8.2f} {stats['replayed_ms']['p50']:>8.2f} "
+            f"{stats['captured_ms']['p99']:>8.2f} {stats['replayed_ms']['p99']:>8.2f} "
+            f"{stats.get('p99_ratio') or 0:>6.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("capture", help="Capture file (rotated backups are included)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000")
+    target.add_argument("--in-process", action="store_true")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed multiplier; 0 replays as fast as possible",
+    )
+    parser.add_argument("--methods", default="GET,HEAD")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    methods = {method.strip().upper() for method in args.methods.split(",")}
+    requests = [
+        request
+        for request in read_capture(capture_files(args.capture))
+        if request.method in methods
+    ][: args.limit]
+    if not requests:
+        parser.error(f"No {'/'.join(sorted(methods))} requests in {args.capture}")
+    span = requests[-1].started - requests[0].started
+    logger.info(
+        f"Replaying {len(requests)} requests spanning {span:.1f}s at "
+        f"{'max' if args.speed <= 0 else f'{args.speed:g}x'} speed"
+    )
+
+    app = None
+    if args.in_process:
+        from app.main import app
+
+    async def run():
+        async with build_client(args.url, app, args.max_in_flight) as client:
+            return await replay(client, requests, args.speed, args.max_in_flight)
+
+    report = asyncio.run(run())
+    report["speed"] = args.speed
+    report["target"] = "in-process" if args.in_process else args.url
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Startup profile: import time per module.
+
+Imports ``app.main`` in a fresh interpreter with ``python -X importtime`` and
+reports the slowest modules by self and cumulative time, the import time per
+top-level package, and the application's own modules. Use ``--runs`` to take
+the median over several cold imports.
+
+Runtime phases (database initialization, warm-up) and the time to first
+request of a running worker are served at ``/api/monitoring/startup``.
+
+Usage (from the api directory):
+    python -m app.tools.startup_profile
+    python -m app.tools.startup_profile --runs 5 --top 30 --output startup.json
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def parse_importtime(output: str) -> Dict[str, Tuple[int, int]]:
+    """``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def profile_imports(module: str = "app.main") -> Dict[str, Tuple[int, int]]:
+    """Import ``module`` in a fresh interpreter and parse its import times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def median_profile(
+    runs: List[Dict[str, Tuple[int, int]]],
+) -> Dict[str, Tuple[int, int]]:
+    """Per-module median over several runs."""
+    modules = set().union(*runs)
+    return {
+        name: (
+            int(statistics.median(run.get(name, (0, 0))[0] for run in runs)),
+            int(statistics.median(run.get(name, (0, 0))[1] for run in runs)),
+        )
+        for name in modules
+    }
+
+
+def summarize(
+    modules: Dict[str, Tuple[int, int]], top: int = 20, app_package: str = "app"
+) -> Dict[str, Any]:
+    """Slowest modules, per-package totals and application modules, in ms."""
+    packages = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        packages[name.split(".")[0]] += self_us
+
+    def rows(items):
+        return [
+            {
+                "module": name,
+                "self_ms": self_us / 1000,
+                "cumulative_ms": cumulative_us / 1000,
+            }
+            for name, (self_us, cumulative_us) in items
+        ]
+
+    by_self = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)
+    by_cumulative = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    own = [
+        item
+        for item in by_cumulative
+        if item[0] == app_package or item[0].startswith(f"{app_package}.")
+    ]
+    return {
+        "modules": len(modules),
+        "total_ms": sum(self_us for self_us, _ in modules.values()) / 1000,
+        "slowest_self": rows(by_self[:top]),
+        "slowest_cumulative": rows(by_cumulative[:top]),
+        "packages_ms": {
+            name: total / 1000
+            for name, total in sorted(
+                packages.items(), key=lambda i: i[1], reverse=True
+            )[:top]
+        },
+        "application": rows(own),
+    }
+
+
+def _print_table(title: str, rows: List[Dict[str, Any]]) -> None:
+    print(f"\n{title}")
+    print(f"{'module':<56} {'self ms':>9} {'cum ms':>9}")
+    for row in rows:
+        print(
+            f"{row['module'][:56]:<56} {row['self_ms']:>9.1f} {row['cumulative_ms']:>9.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    runs = [profile_imports(args.module) for _ in range(max(1, args.runs))]
+    report = summarize(median_profile(runs), top=args.top)
+    report["runs"] = len(runs)
+
+    print(
+        f"Importing {args.module}: {report['total_ms']:.1f}ms over "
+        f"{report['modules']} modules (median of {len(runs)} run(s))"
+    )
+    print("\nPackages (self time)")
+    for name, total in report["packages_ms"].items():
+        print(f"{name:<56} {total:>9.1f}")
+    _print_table("Slowest modules (cumulative)", report["slowest_cumulative"])
+    _print_table("Slowest modules (self)", report["slowest_self"])
+    _print_table("Application modules", report["application"])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""
+Synthetic people/planets dataset generator.
+
+Produces rows in the same string formats as SWAPI (``"1,358"`` masses,
+``"19BBY"`` birth years, comma separated colors and climates, ``"unknown"``
+and ``"n/a"`` values) with skewed, Zipf-like categorical distributions and
+long-tailed numeric ones, reproducibly from a seed. Rows are written through
+the fastest bulk path of the target database: ``COPY`` on PostgreSQL and
+executemany in large transactions (with relaxed syncing) on SQLite. Secondary
+indexes are dropped during the load and rebuilt afterwards.
+
+Usage (from the api directory):
+    python -m app.tools.synthetic_data --people 1000000 --planets 100000 --seed 42
+"""
+
+import argparse
+import io
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+from app.db.generations import generations
+from app.db.models import People, Planets
+
+logger = logging.getLogger(__name__)
+
+PEOPLE_COLUMNS = (
+    "name",
+    "height",
+    "mass",
+    "hair_color",
+    "skin_color",
+    "eye_color",
+    "birth_year",
+    "gender",
+    "url",
+    "edited",
+)
+PLANET_COLUMNS = (
+    "name",
+    "diameter",
+    "rotation_period",
+    "orbital_period",
+    "gravity",
+    "population",
+    "climate",
+    "terrain",
+    "surface_water",
+    "url",
+    "edited",
+)
+
+# Categorical vocabularies, most frequent first (frequencies follow a Zipf law)
+HAIR_COLORS = [
+    "none", "brown", "black", "n/a", "white", "blond", "auburn", "grey",
+    "brown, grey", "auburn, white", "unknown", "auburn, grey", "blonde",
+]  # fmt: skip
+SKIN_COLORS = [
+    "fair", "light", "dark", "green", "grey", "pale", "white", "brown",
+    "unknown", "metal", "yellow", "blue", "white, blue", "green, grey",
+    "tan", "orange", "red", "fair, green, yellow", "gold", "mottled green",
+]  # fmt: skip
+EYE_COLORS = [
+    "brown", "blue", "yellow", "black", "orange", "red", "unknown", "hazel",
+    "blue-gray", "pink", "gold", "green, yellow", "white", "red, blue",
+]  # fmt: skip
+GENDERS = ["male", "female", "n/a", "none", "hermaphrodite"]
+CLIMATES = [
+    "temperate", "arid", "unknown", "tropical", "frozen", "murky",
+    "temperate, tropical", "hot", "arid, temperate, tropical", "frigid",
+    "humid", "polluted", "windy", "artificial temperate", "superheated",
+]  # fmt: skip
+TERRAINS = [
+    "grasslands, mountains", "desert", "unknown", "jungle, rainforests",
+    "forests, mountains, lakes", "tundra, ice caves, mountain ranges",
+    "swamp, jungles", "gas giant", "cityscape, mountains", "ocean",
+    "rocky islands, oceans", "plains, forests, hills", "mountains, volcanoes",
+    "grassy hills, swamps, forests", "lava rivers", "barren", "toxic cloudbanks",
+]  # fmt: skip
+GRAVITIES = [
+    "1 standard", "unknown", "N/A", "0.9 standard", "1.1 standard",
+    "0.75 standard", "1.5 (surface), 1 standard (Cloud City)", "2 standard",
+    "0.56 standard", "1.85 standard", "0.98",
+]  # fmt: skip
+NAME_SYLLABLES = [
+    "an", "ar", "ba", "da", "el", "ga", "ja", "ka", "ke", "la", "lu", "ma",
+    "na", "ob", "pa", "qui", "ra", "sa", "ske", "ta", "tho", "va", "wa", "yo",
+    "za", "dor", "kin", "sol", "vek", "ith",
+]  # fmt: skip
+PLANET_SUFFIXES = ["", "", "", " Prime", " Minor", " II", " IV", " Major"]
+
+DEFAULT_CHUNK_SIZE = 50000
+POOL_SIZE = 8192
+SWAPI_EPOCH = datetime(2014, 12, 9, 13, 50, 51)
+
+
+def _zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    """Cumulative Zipf weights for ``count`` values."""
+    weights, total = [], 0.0
+    for rank in range(1, count + 1):
+        total += 1 / rank**exponent
+        weights.append(total)
+    return weights
+
+
+def _format_thousands(value: float) -> str:
+    """SWAPI writes numbers from a thousand up with comma separators."""
+    return f"{value:,.0f}" if value >= 1000 else f"{value:g}"
+
+
+class SyntheticDataGenerator:
+    """
+    Reproducible generator of SWAPI-shaped people and planet rows.
+
+    Numeric columns are sampled once into pools of rendered strings following
+    their distribution, so generating a row costs a few ``random.choices``
+    lookups rather than per-value arithmetic and formatting.
+    """
+
+    def __init__(self, seed: int = 0, base_url: str = "https://swapi.synthetic/api"):
+        self.random = random.Random(seed)
+        self.base_url = base_url
+        self._pools: Dict[str, List[str]] = {}
+        self._build_pools()
+
+    def _pool(self, sample, unknown_rate: float = 0.0) -> List[str]:
+        rng = self.random
+        return [
+            "unknown" if rng.random() < unknown_rate else sample(rng)
+            for _ in range(POOL_SIZE)
+        ]
+
+    def _build_pools(self) -> None:
+        pools = self._pools
+        pools["height"] = self._pool(
+            lambda r: str(max(60, round(r.gauss(172, 28)))), 0.08
+        )
+
+        def mass(r: random.Random) -> str:
+            # Mostly humanoid masses plus a thin tail of Hutt-sized ones ("1,358")
+            sigma, mu = (0.45, 4.3) if r.random() < 0.97 else (0.5, 6.8)
+            return _format_thousands(round(r.lognormvariate(mu, sigma), 1))
+
+        pools["mass"] = self._pool(mass, 0.3)
+        pools["birth_year"] = self._pool(
+            lambda r: (
+                f"{round(r.lognormvariate(3.3, 0.9), r.choice((0, 0, 0, 1)))}BBY"
+                if r.random() < 0.95
+                else f"{r.randint(1, 30)}ABY"
+            ),
+            0.4,
+        )
+        pools["diameter"] = self._pool(
+            lambda r: "0" if r.random() < 0.05 else str(round(r.gauss(11000, 4000))),
+            0.15,
+        )
+        pools["rotation_period"] = self._pool(
+            lambda r: str(max(6, round(r.gauss(24, 5)))), 0.2
+        )
+        pools["orbital_period"] = self._pool(
+            lambda r: str(round(r.lognormvariate(5.9, 0.5))), 0.2
+        )
+        pools["population"] = self._pool(
+            lambda r: str(int(round(10 ** r.uniform(3, 12), -2))), 0.3
+        )
+        pools["surface_water"] = self._pool(
+            lambda r: str(min(100, round(r.expovariate(1 / 20)))), 0.25
+        )
+        pools["edited"] = self._pool(
+            lambda r: (
+                SWAPI_EPOCH + timedelta(seconds=r.uniform(0, 40 * 86400))
+            ).strftime("%Y-%m-%d %H:%M:%S.%f")
+        )
+        # Names: Zipf-distributed syllable combinations, so some names repeat
+        first = [(a + b).capitalize() for a in NAME_SYLLABLES for b in NAME_SYLLABLES]
+        self.random.shuffle(first)
+        pools["first_name"] = first
+        pools["last_name"] = [
+            (a + b + c).capitalize()
+            for a in NAME_SYLLABLES[:12]
+            for b in NAME_SYLLABLES
+            for c in NAME_SYLLABLES[:8]
+        ]
+        self.random.shuffle(pools["last_name"])
+
+    def _categorical(self, values: Sequence[str], count: int) -> List[str]:
+        return self.random.choices(
+            values, cum_weights=_zipf_weights(len(values)), k=count
+        )
+
+    def _names(self, count: int) -> List[str]:
+        pools = self._pools
+        firsts = self.random.choices(
+            pools["first_name"],
+            cum_weights=_zipf_weights(len(pools["first_name"]), 0.8),
+            k=count,
+        )
+        lasts = self.random.choices(pools["last_name"], k=count)
+        return [f"{f} {l}" for f, l in zip(firsts, lasts)]
+
+    def people(self, count: int, start: int = 1) -> List[Tuple[str, ...]]:
+        """Generate ``count`` people rows in ``PEOPLE_COLUMNS`` order."""
+        pools, choices = self._pools, self.random.choices
+        base = f"{self.base_url}/people/"
+        return list(
+            zip(
+                self._names(count),
+                choices(pools["height"], k=count),
+                choices(pools["mass"], k=count),
+                self._categorical(HAIR_COLORS, count),
+                self._categorical(SKIN_COLORS, count),
+                self._categorical(EYE_COLORS, count),
+                choices(pools["birth_year"], k=count),
+                choices(GENDERS, weights=(60, 25, 10, 4, 1), k=count),
+                [f"{base}{i}/" for i in range(start, start + count)],
+                choices(pools["edited"], k=count),
+            )
+        )
+
+    def planets(self, count: int, start: int = 1) -> List[Tuple[str, ...]]:
+        """Generate ``count`` planet rows in ``PLANET_COLUMNS`` order."""
+        pools, choices = self._pools, self.random.choices
+        base = f"{self.base_url}/planets/"
+        names = choices(
+            pools["last_name"],
+            cum_weights=_zipf_weights(len(pools["last_name"]), 0.6),
+            k=count,
+        )
+        suffixes = choices(PLANET_SUFFIXES, k=count)
+        return list(
+            zip(
+                [n + s for n, s in zip(names, suffixes)],
+                choices(pools["diameter"], k=count),
+                choices(pools["rotation_period"], k=count),
+                choices(pools["orbital_period"], k=count),
+                self._categorical(GRAVITIES, count),
+                choices(pools["population"], k=count),
+                self._categorical(CLIMATES, count),
+                self._categorical(TERRAINS, count),
+                choices(pools["surface_water"], k=count),
+                [f"{base}{i}/" for i in range(start, start + count)],
+                choices(pools["edited"], k=count),
+            )
+        )
+
+    def chunks(
+        self,
+        kind: str,
+        count: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 1,
+    ) -> Iterator[List[Tuple[str, ...]]]:
+        """Generate ``count`` rows of ``kind`` ("people" or "planets") in chunks."""
+        make = self.people if kind == "people" else self.planets
+        for offset in range(0, count, chunk_size):
+            yield make(min(chunk_size, count - offset), start + offset)
+
+
+def _copy_line(row: Sequence[Any]) -> str:
+    return "\t".join(
+        (
+            "\\N"
+            if value is None
+            else str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+        )
+        for value in row
+    )
+
+
+def _write_postgresql(raw, table: str, columns, chunks) -> int:
+    cursor = raw.cursor()
+    written = 0
+    try:
+        for chunk in chunks:
+            data = io.StringIO("\n".join(map(_copy_line, chunk)) + "\n")
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", data)
+            raw.commit()
+            written += len(chunk)
+    finally:
+        cursor.close()
+    return written
+
+
+def _write_sqlite(raw, table: str, columns, chunks) -> int:
+    cursor = raw.cursor()
+    statement = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+    written = 0
+    try:
+        # Durability does not matter for a generated dataset: skip the fsyncs
+        cursor.execute("PRAGMA synchronous = OFF")
+        for chunk in chunks:
+            cursor.executemany(statement, chunk)
+            raw.commit()
+            written += len(chunk)
+    finally:
+        cursor.execute(f"PRAGMA synchronous = {synchronous}")
+        cursor.close()
+    return written
+
+
+def bulk_write(
+    bind: Engine, model, columns: Sequence[str], chunks, defer_indexes: bool = True
+) -> int:
+    """
+    Write row chunks into the table of ``model`` through the fastest bulk path.
+
+    With ``defer_indexes`` the table's secondary indexes are dropped first and
+    rebuilt once all rows are in, which is much cheaper than maintaining
+    them row by row. Finishes with ``ANALYZE`` and bumps the table generation,
+    so caches built from the table are rebuilt.
+    """
+    table = model.__table__
+    indexes = [index for index in table.indexes] if defer_indexes else []
+    for index in indexes:
+        index.drop(bind, checkfirst=True)
+
+    try:
+        raw = bind.raw_connection()
+        try:
+            if bind.dialect.name == "postgresql":
+                written = _write_postgresql(raw, table.name, columns, chunks)
+            else:
+                written = _write_sqlite(raw, table.name, columns, chunks)
+        finally:
+            raw.close()
+    finally:
+        # Restore the indexes even when the load fails part-way
+        for index in indexes:
+            index.create(bind, checkfirst=True)
+        with bind.begin() as connection:
+            # Chunks committed before a failure changed the table too
+            generations.bump(connection, table.name)
+
+    with bind.begin() as connection:
+        connection.execute(text(f"ANALYZE {table.name}"))
+    return written
+
+
+def populate(
+    bind: Engine,
+    people: int = 0,
+    planets: int = 0,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    truncate: bool = False,
+    defer_indexes: bool = True,
+) -> Dict[str, Any]:
+    """
+    Generate and write a synthetic dataset. Returns row counts and rates.
+
+    Meant to be called from scripts and pytest fixtures alike.
+    """
+    Base.metadata.create_all(bind=bind)
+    if truncate:
+        with bind.begin() as connection:
+            connection.execute(People.__table__.delete())
+            connection.execute(Planets.__table__.delete())
+            generations.bump(connection, People.__tablename__)
+            generations.bump(connection, Planets.__tablename__)
+
+    generator = SyntheticDataGenerator(seed)
+    stats: Dict[str, Any] = {"seed": seed}
+    for kind, model, columns, count in (
+        ("people", People, PEOPLE_COLUMNS, people),
+        ("planets", Planets, PLANET_COLUMNS, planets),
+    ):
+        if not count:
+            continue
+        with bind.connect() as connection:
+            start_id = (
+                connection.execute(
+                    text(f"SELECT COALESCE(MAX(id), 0) FROM {model.__tablename__}")
+                ).scalar()
+                + 1
+            )
+        start = time.perf_counter()
+        written = bulk_write(
+            bind,
+            model,
+            columns,
+            generator.chunks(kind, count, chunk_size, start_id),
+            defer_indexes,
+        )
+        elapsed = time.perf_counter() - start
+        stats[kind] = {
+            "rows": written,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(written / elapsed) if elapsed else None,
+        }
+        logger.info(
+            f"Generated {written} {kind} rows in {elapsed:.2f}s "
+            f"({written / elapsed if elapsed else math.inf:.0f} rows/s)"
+        )
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--people", type=int, default=100000)
+    parser.add_argument("--planets", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--truncate", action="store_true", help="Delete existing rows first"
+    )
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="Maintain indexes during the load instead of rebuilding them after",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    engine = create_engine(args.database_url)
+    stats = populate(
+        engine,
+        people=args.people,
+        planets=args.planets,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        truncate=args.truncate,
+        defer_indexes=not args.keep_indexes,
+    )
+    for kind in ("people", "planets"):
+        if kind in stats:
+            print(
+                f"{kind}: {stats[kind]['rows']} rows in {stats[kind]['seconds']}s "
+                f"({stats[kind]['rows_per_second']} rows/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite with regression thresholds.
+
+Runs the API in-process (requests go through the ASGI interface with httpx,
+no sockets) against a synthetic dataset at several sizes, on SQLite by
+default or on Postgres with ``--database-url``. Each scenario sends
+``--requests`` sequential requests with seeded, realistic parameters and
+reports latency percentiles and throughput.
+
+Results can be saved as a JSON baseline. When a baseline exists, every
+scenario is compared against it and the script exits with status 1 if a
+scenario's ``--metric`` latency regressed by more than ``--threshold``.
+
+Usage (from the api directory):
+    python benchmarks/bench_endpoints.py --sizes 1000,10000,100000 --save-baseline
+    python benchmarks/bench_endpoints.py --sizes 1000,10000,100000 --threshold 0.25
+    python benchmarks/bench_endpoints.py --database-url postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Keep request and slow query logging out of the measurements
+os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db, get_read_db  # noqa: E402
+from app.core.monitoring import monitoring_service  # noqa: E402
+from app.main import app  # noqa: E402
+from app.tools.synthetic_data import populate  # noqa: E402
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+PERCENTILES = (50, 90, 95, 99)
+PEOPLE_SORTS = ["name", "height", "mass", "birth_year", "gender", "created_at"]
+PLANET_SORTS = ["name", "diameter", "population", "climate", "terrain"]
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class Context:
+    """Dataset facts the scenarios draw their parameters from."""
+
+    def __init__(self, engine, rng: random.Random):
+        self.rng = rng
+        with engine.connect() as connection:
+            self.people = connection.execute(
+                text("SELECT COUNT(*) FROM people")
+            ).scalar()
+            self.planets = connection.execute(
+                text("SELECT COUNT(*) FROM planets")
+            ).scalar()
+            step = max(1, self.people // 200)
+            self.people_names = [
+                row[0]
+                for row in connection.execute(
+                    text(f"SELECT name FROM people WHERE id % {step} = 0 LIMIT 200")
+                )
+            ]
+            step = max(1, self.planets // 200)
+            self.planet_names = [
+                row[0]
+                for row in connection.execute(
+                    text(f"SELECT name FROM planets WHERE id % {step} = 0 LIMIT 200")
+                )
+            ]
+
+    def page(self, total: int, size: int = 10) -> int:
+        """Mostly early pages, occasionally a deep one."""
+        pages = max(1, (total + size - 1) // size)
+        if self.rng.random() < 0.9:
+            return self.rng.randint(1, min(pages, 5))
+        return self.rng.randint(1, pages)
+
+    def fragment(self, names: List[str]) -> str:
+        """A partial, lower-cased name as users type it."""
+        name = self.rng.choice(names).split()[-1].lower()
+        return name[: self.rng.randint(3, max(3, len(name)))]
+
+
+def _list(resource: str, total: Callable[[Context], int]):
+    def build(ctx: Context) -> Request:
+        return "GET", f"/api/{resource}/?page={ctx.page(total(ctx))}&size=10", None
+
+    return build
+
+
+def _search(resource: str, names: Callable[[Context], List[str]]):
+    def build(ctx: Context) -> Request:
+        return "GET", f"/api/{resource}/?name={ctx.fragment(names(ctx))}", None
+
+    return build
+
+
+def _sort(resource: str, fields: List[str], total: Callable[[Context], int]):
+    def build(ctx: Context) -> Request:
+        field = ctx.rng.choice(fields)
+        order = ctx.rng.choice(("asc", "desc"))
+        page = ctx.page(total(ctx))
+        return (
+            "GET",
+            f"/api/{resource}/?sort_by={field}&sort_order={order}&page={page}",
+            None,
+        )
+
+    return build
+
+
+def _detail(ctx: Context) -> Request:
+    return "GET", f"/api/people/{ctx.rng.randint(1, ctx.people)}", None
+
+
+def _update(ctx: Context) -> Request:
+    body = {"mass": str(ctx.rng.randint(40, 140)), "hair_color": "grey"}
+    return "PUT", f"/api/people/{ctx.rng.randint(1, ctx.people)}", body
+
+
+def _create(ctx: Context) -> Request:
+    body = {
+        "name": f"Bench {ctx.rng.getrandbits(48):x}",
+        "height": str(ctx.rng.randint(150, 200)),
+        "mass": str(ctx.rng.randint(40, 140)),
+        "gender": ctx.rng.choice(("male", "female", "n/a")),
+    }
+    return "POST", "/api/people/", body
+
+
+def _insight_get(ctx: Context) -> Request:
+    name = ctx.rng.choice(ctx.people_names)
+    return "GET", f"/api/simulate-ai-insight/?name={name}&entity_type=people", None
+
+
+def _insight_post(ctx: Context) -> Request:
+    body = {"name": ctx.rng.choice(ctx.planet_names), "entity_type": "planets"}
+    return "POST", "/api/simulate-ai-insight/", body
+
+
+SCENARIOS: Dict[str, Callable[[Context], Request]] = {
+    "people_list": _list("people", lambda ctx: ctx.people),
+    "people_search": _search("people", lambda ctx: ctx.people_names),
+    "people_sort": _sort("people", PEOPLE_SORTS, lambda ctx: ctx.people),
+    "planets_list": _list("planets", lambda ctx: ctx.planets),
+    "planets_search": _search("planets", lambda ctx: ctx.planet_names),
+    "planets_sort": _sort("planets", PLANET_SORTS, lambda ctx: ctx.planets),
+    "people_detail": _detail,
+    "people_update": _update,
+    "people_create": _create,
+    "insight_get": _insight_get,
+    "insight_post": _insight_post,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def summarize(latencies_ms: List[float], elapsed: float, errors: int) -> Dict[str, Any]:
+    values = sorted(latencies_ms)
+    summary = {f"p{p}": round(percentile(values, p), 3) for p in PERCENTILES}
+    summary.update(
+        {
+            "mean": round(sum(values) / len(values), 3),
+            "max": round(values[-1], 3),
+            "requests": len(values),
+            "errors": errors,
+            "rps": round(len(values) / elapsed, 1),
+        }
+    )
+    return summary
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, build, ctx: Context, requests: int, warmup: int
+) -> Dict[str, Any]:
+    """Send ``warmup`` then ``requests`` sequential requests built by ``build``."""
+    for _ in range(warmup):
+        method, path, body = build(ctx)
+        await client.request(method, path, json=body)
+
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        method, path, body = build(ctx)
+        sent = time.perf_counter()
+        response = await client.request(method, path, json=body)
+        latencies.append((time.perf_counter() - sent) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def run_size(
+    database_url: str,
+    size: int,
+    scenarios: List[str],
+    requests: int,
+    warmup: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Populate ``size`` people (and a tenth as many planets) and run every scenario."""
+    engine = create_engine(database_url)
+    populate(engine, people=size, planets=max(10, size // 10), seed=seed, truncate=True)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    ctx = Context(engine, random.Random(seed))
+    results = {}
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            for name in scenarios:
+                results[name] = await run_scenario(
+                    client, SCENARIOS[name], ctx, requests, warmup
+                )
+                print(_format_row(size, name, results[name]), flush=True)
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+    return results
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    metric: str,
+    threshold: float,
+    min_delta_ms: float = 0.0,
+) -> List[str]:
+    """
+    Return a description of every scenario slower than baseline * (1 + threshold).
+
+    Slowdowns of less than ``min_delta_ms`` are ignored, so timer noise on
+    sub-millisecond scenarios does not fail the run.
+    """
+    regressions = []
+    for size, scenarios in current["results"].items():
+        for name, stats in scenarios.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if not previous or not previous.get(metric):
+                continue
+            ratio = stats[metric] / previous[metric]
+            if (
+                ratio > 1 + threshold
+                and stats[metric] - previous[metric] >= min_delta_ms
+            ):
+                regressions.append(
+                    f"{name} @ {size}: {metric} {stats[metric]:.2f}ms vs "
+                    f"{previous[metric]:.2f}ms baseline (+{ratio - 1:.0%})"
+                )
+    return regressions
+
+
+def _format_row(size, name: str, stats: Dict[str, Any]) -> str:
+    return (
+        f"{size:>8} {name:<15} {stats['p50']:>8.2f} {stats['p95']:>8.2f} "
+        f"{stats['p99']:>8.2f} {stats['rps']:>8.0f} {stats['errors']:>6}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Database to benchmark (default: a temporary SQLite file). "
+        "Its people and planets tables are truncated.",
+    )
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=None, help="Baseline JSON file")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument("--output", default=None, help="Also write results here")
+    parser.add_argument(
+        "--metric", default="p50", choices=[f"p{p}" for p in PERCENTILES] + ["mean"]
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown as a fraction of the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="Ignore slowdowns smaller than this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    scenarios = [name for name in args.scenarios.split(",") if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{directory}/bench.db"
+        dialect = database_url.split(":", 1)[0].split("+", 1)[0]
+        print(
+            f"{'size':>8} {'scenario':<15} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'req/s':>8} {'errors':>6}"
+        )
+        results = {}
+        for size in sizes:
+            results[str(size)] = asyncio.run(
+                run_size(
+                    database_url, size, scenarios, args.requests, args.warmup, args.seed
+                )
+            )
+    monitoring_service.shutdown()
+
+    report = {
+        "database": dialect,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "requests": args.requests,
+        "seed": args.seed,
+        "results": results,
+    }
+    baseline_path = args.baseline or os.path.join(
+        BASELINE_DIR, f"endpoints_{dialect}.json"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = compare(
+        report, baseline, args.metric, args.threshold, args.min_delta_ms
+    )
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed past {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo scenario regressed past {args.threshold:.0%} ({args.metric})")
+
+
+if __name__ == "__main__":
+    main()
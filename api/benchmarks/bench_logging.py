@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the throughput of the logging pipeline.
+
+Logs ``--lines`` structured records through a standard library logger (the
+way application modules log) in the "sync" and "async" modes of
+``setup_logging``, plus the same number of DEBUG calls that fall below the
+level threshold. Reports lines/sec as seen by the caller and including the
+time to drain the background queues. Stdout is redirected to /dev/null.
+
+Usage (from the api directory):
+    python benchmarks/bench_logging.py --lines 50000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.logging import (  # noqa: E402
+    get_logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def run(mode: str, lines: int, directory: str) -> dict:
+    """Log ``lines`` records in ``mode`` and return the measured rates."""
+    setup_logging(
+        log_file=os.path.join(directory, f"{mode}.log"),
+        mode=mode,
+        queue_size=lines,
+    )
+    log = logging.getLogger("bench")
+
+    start = time.perf_counter()
+    for i in range(lines):
+        log.debug("filtered out %d", i)
+    filtered = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(lines):
+        log.info(
+            "search event",
+            extra={"event_type": "search", "event_data": {"term": "luke", "n": i}},
+        )
+    logged = time.perf_counter() - start
+    dropped = sum(sink["dropped"] for sink in get_logging_stats())
+    shutdown_logging()
+    drained = time.perf_counter() - start
+
+    return {
+        "filtered": lines / filtered,
+        "caller": lines / logged,
+        "drained": lines / drained,
+        "dropped": dropped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50000)
+    args = parser.parse_args()
+
+    stdout = sys.stdout
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            for mode in ("sync", "async"):
+                results[mode] = run(mode, args.lines, directory)
+        finally:
+            sys.stdout = stdout
+            from loguru import logger
+
+            logger.remove()
+
+    print(
+        f"{'mode':<8} {'below level/s':>14} {'caller lines/s':>15} "
+        f"{'drained lines/s':>16} {'dropped':>8}"
+    )
+    for mode, result in results.items():
+        print(
+            f"{mode:<8} {result['filtered']:>14.0f} {result['caller']:>15.0f} "
+            f"{result['drained']:>16.0f} {result['dropped']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request overhead of the monitoring middleware.
+
+Requests are driven straight through the ASGI interface (no sockets, no HTTP
+client), so the numbers isolate the cost of the middleware itself. Compares
+no middleware, the ASGI MonitoringMiddleware and the previous
+BaseHTTPMiddleware implementation.
+
+Usage (from the api directory):
+    python benchmarks/bench_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import FastAPI  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.core.middleware import MonitoringMiddleware  # noqa: E402
+from app.core.monitoring import monitoring_service  # noqa: E402
+
+
+class LegacyMonitoringMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation, kept for comparison only."""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        execution_time = (time.time() - start_time) * 1000
+        monitoring_service.log_api_request(
+            method=request.method,
+            path=str(request.url.path),
+            status_code=response.status_code,
+            execution_time_ms=execution_time,
+            user_agent=request.headers.get("user-agent", ""),
+            client_ip=request.client.host if request.client else "unknown",
+        )
+        response.headers["X-Execution-Time"] = f"{execution_time:.2f}ms"
+        response.headers["X-Request-ID"] = str(uuid.uuid4())
+        return response
+
+
+def build_app(middleware=None) -> FastAPI:
+    """Build a minimal app with an async JSON endpoint."""
+    app = FastAPI()
+    if middleware:
+        app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+async def run(app, requests: int) -> float:
+    """Send ``requests`` GET /ping calls through the app, return requests/sec."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"user-agent", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def send(message):
+        pass
+
+    async def call():
+        body_sent = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Like a real server, block until the client goes away
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        await app(dict(scope), receive, send)
+        disconnected.set()
+
+    # Warm up routing and middleware stack construction
+    for _ in range(200):
+        await call()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    variants = [
+        ("no middleware", None),
+        ("ASGI MonitoringMiddleware", MonitoringMiddleware),
+        ("BaseHTTPMiddleware (legacy)", LegacyMonitoringMiddleware),
+    ]
+
+    print(f"{'variant':<30} {'req/s':>10} {'us/req':>10}")
+    baseline = None
+    for name, middleware in variants:
+        rps = asyncio.run(run(build_app(middleware), args.requests))
+        baseline = baseline or rps
+        print(f"{name:<30} {rps:>10.0f} {1e6 / rps:>10.1f}  ({rps / baseline:.0%})")
+
+    monitoring_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,8 @@ class People(Base):
     eye_color = Column(String, nullable=True)
     birth_year = Column(String, nullable=True)
     gender = Column(String, nullable=True)
+    url = Column(String, nullable=True, unique=True, index=True)
+    edited = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -49,6 +51,8 @@ class Planets(Base):
     climate = Column(String, nullable=True)
     terrain = Column(String, nullable=True)
     surface_water = Column(String, nullable=True)
+    url = Column(String, nullable=True, unique=True, index=True)
+    edited = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,7 +1,9 @@
 #!/bin/bash
 
-# Health check script that exits the container if health fails
-if ! curl -f http://localhost:8000/health; then
+# Health check script that exits the container if health fails.
+# Probes liveness only: a database outage makes /readyz answer 503, which should
+# take the instance out of traffic rotation, not get the container restarted.
+if ! curl -f http://localhost:8000/livez; then
     echo "Health check failed - exiting container"
     exit 1
 fi
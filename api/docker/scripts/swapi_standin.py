@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Star Wars API (SWAPI).
+
+Serves paginated ``people`` and ``planets`` endpoints shaped like SWAPI's, so
+the data loader can be exercised without the network. It can also simulate
+an upstream that rate limits (HTTP 429 with ``Retry-After``) or fails.
+
+Usage:
+    python docker/scripts/swapi_standin.py --port 8765 --people 82 --planets 60
+    SWAPI_BASE_URL=http://localhost:8765/api python docker/scripts/load_swapi_data.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 10
+
+EDITED = "2014-12-20T21:17:56.891000Z"
+CREATED = "2014-12-09T13:50:51.644000Z"
+
+
+def make_person(index: int, base_url: str) -> Dict[str, Any]:
+    """Build a SWAPI-like person record."""
+    return {
+        "name": f"Person {index}",
+        "height": str(150 + index % 60),
+        "mass": "unknown" if index % 7 == 0 else str(50 + index % 50),
+        "hair_color": ["blond", "brown", "black", "none"][index % 4],
+        "skin_color": ["fair", "light", "dark"][index % 3],
+        "eye_color": ["blue", "brown", "yellow"][index % 3],
+        "birth_year": f"{index % 100}BBY",
+        "gender": ["male", "female", "n/a"][index % 3],
+        "created": CREATED,
+        "edited": EDITED,
+        "url": f"{base_url}/people/{index}/",
+    }
+
+
+def make_planet(index: int, base_url: str) -> Dict[str, Any]:
+    """Build a SWAPI-like planet record."""
+    return {
+        "name": f"Planet {index}",
+        "diameter": str(5000 + index * 100),
+        "rotation_period": str(20 + index % 10),
+        "orbital_period": str(300 + index),
+        "gravity": "1 standard",
+        "population": "unknown" if index % 5 == 0 else str(index * 1000),
+        "climate": ["arid", "temperate", "frozen"][index % 3],
+        "terrain": ["desert", "grasslands", "tundra"][index % 3],
+        "surface_water": str(index % 100),
+        "created": CREATED,
+        "edited": EDITED,
+        "url": f"{base_url}/planets/{index}/",
+    }
+
+
+class StandInSWAPI:
+    """
+    In-process SWAPI stand-in server.
+
+    ``rate_limit`` (requests per second) makes the server answer 429 with a
+    ``Retry-After`` header when clients go faster. ``failures`` maps a request
+    path such as ``"/api/people/?page=2"`` to the number of times it should
+    answer 500 before succeeding.
+    """
+
+    def __init__(
+        self,
+        people: int = 82,
+        planets: int = 60,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limit: Optional[float] = None,
+        latency: float = 0.0,
+    ):
+        self.host = host
+        self.port = port
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.failures: Counter = Counter()
+        self.requests: Counter = Counter()
+        self.throttled = 0
+        self._counts = {"people": people, "planets": planets}
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._last_request = 0.0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api"
+
+    def records(self, endpoint: str) -> List[Dict[str, Any]]:
+        """The full record list served for ``endpoint``."""
+        if endpoint not in self._records:
+            make = make_person if endpoint == "people" else make_planet
+            self._records[endpoint] = [
+                make(i, self.base_url) for i in range(1, self._counts[endpoint] + 1)
+            ]
+        return self._records[endpoint]
+
+    def page(self, endpoint: str, number: int) -> Optional[Dict[str, Any]]:
+        """Render one page of ``endpoint`` like SWAPI does, or ``None`` if out of range."""
+        records = self.records(endpoint)
+        start = (number - 1) * PAGE_SIZE
+        if number < 1 or (start >= len(records) and number != 1):
+            return None
+        url = f"{self.base_url}/{endpoint}/?page="
+        has_next = start + PAGE_SIZE < len(records)
+        return {
+            "count": len(records),
+            "next": f"{url}{number + 1}" if has_next else None,
+            "previous": f"{url}{number - 1}" if number > 1 else None,
+            "results": records[start : start + PAGE_SIZE],
+        }
+
+    def start(self) -> str:
+        """Start serving in a background thread. Returns the API base URL."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                standin._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests[handler.path] += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                wait = self._last_request + 1 / self.rate_limit - now
+                if wait > 0:
+                    self.throttled += 1
+                    self._respond(handler, 429, {"detail": "Throttled"}, wait)
+                    return
+                self._last_request = now
+            if self.failures[handler.path] > 0:
+                self.failures[handler.path] -= 1
+                self._respond(handler, 500, {"detail": "Server error"})
+                return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        parsed = urlparse(handler.path)
+        parts = [part for part in parsed.path.split("/") if part]
+        page = None
+        if len(parts) == 2 and parts[0] == "api" and parts[1] in self._counts:
+            number = parse_qs(parsed.query).get("page", ["1"])[0]
+            if number.isdigit():
+                page = self.page(parts[1], int(number))
+        if page is None:
+            self._respond(handler, 404, {"detail": "Not found"})
+        else:
+            self._respond(handler, 200, page)
+
+    @staticmethod
+    def _respond(handler, status: int, body: Dict[str, Any], retry_after=None):
+        payload = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        if retry_after is not None:
+            handler.send_header("Retry-After", f"{retry_after:.3f}")
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--people", type=int, default=82)
+    parser.add_argument("--planets", type=int, default=60)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    standin = StandInSWAPI(
+        args.people, args.planets, args.host, args.port, args.rate_limit, args.latency
+    )
+    print(f"Serving SWAPI stand-in at {standin.start()}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()